@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+方块滑动动画基准测试
+按主循环的方式（clock.tick(FPS)限速）连续播放若干次滑动，统计动画帧间隔、每帧绘制耗时与超出帧预算的帧数；
+并与每帧整屏重绘对比绘制耗时
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+# 添加游戏模块目录到Python路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'huarongdao_game'))
+
+import pygame
+from config import FPS, TILE_SLIDE_MS
+from controllers import GameController, GameScreen
+from models import Leaderboard
+from renderer import GameRenderer
+
+
+def random_move(controller: GameController, rng: random.Random):
+    """点击空格旁的随机方块"""
+    game_state = controller.game_state
+    row, col = game_state.empty_pos
+    neighbours = [(r, c) for r, c in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1))
+                  if 0 <= r < game_state.size and 0 <= c < game_state.size]
+    target = rng.choice(neighbours)
+    return controller.layout.tile_rect(game_state.size, *target).center
+
+
+def main():
+    parser = argparse.ArgumentParser(description="方块滑动动画帧耗时")
+    parser.add_argument('--difficulty', default='MEDIUM')
+    parser.add_argument('--moves', type=int, default=30)
+    parser.add_argument('--burst', type=int, default=3, help="每轮连续点击次数（动画期间排队）")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    renderer = GameRenderer()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        controller = GameController(leaderboard=Leaderboard(os.path.join(temp_dir, 'leaderboard.json')),
+                                    layout=renderer.layout)
+        controller.start_new_game(args.difficulty, renderer)
+        controller.current_screen = GameScreen.GAME_PLAY
+        controller.render_current_screen(renderer)
+
+        clicks = 0
+        while clicks < args.moves and controller.current_screen == GameScreen.GAME_PLAY:
+            for _ in range(args.burst):
+                controller.click(random_move(controller, rng), renderer)
+                clicks += 1
+            while controller.is_animating():
+                renderer.clock.tick(FPS)
+                controller.render_current_screen(renderer)
+
+        # 对比：每帧整屏重绘并flip
+        game_state = controller.game_state
+        start = time.perf_counter()
+        for _ in range(200):
+            renderer.draw_game_screen(game_state)
+            pygame.display.flip()
+        full_ms = (time.perf_counter() - start) / 200 * 1000
+        controller.leaderboard.close()
+
+    stats = controller.animator.frame_stats()
+    print(f"{args.difficulty} 点击{clicks}次 滑动时长{TILE_SLIDE_MS}ms 帧预算{stats['budget_ms']:.1f}ms")
+    print(f"  动画帧: {stats['frames']}帧  平均间隔 {stats['avg_frame_ms']:.2f}ms  最大 {stats['max_frame_ms']:.2f}ms  "
+          f"超出预算 {stats['over_budget']}帧")
+    print(f"  每帧绘制（扫过矩形）: 平均 {stats['avg_draw_ms']:.3f}ms  最大 {stats['max_draw_ms']:.3f}ms")
+    print(f"  每帧整屏重绘: {full_ms:.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""
+批量求解扩展性基准测试
+按1, 2, 4, ...直到CPU核数的工作进程数求解同一批棋盘，输出吞吐量与相对单进程的加速比
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+# 添加游戏模块目录到Python路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'huarongdao_game'))
+
+from batch_solver import iter_solutions
+from puzzle_pool import _random_walk
+
+
+def main():
+    parser = argparse.ArgumentParser(description="批量求解扩展性")
+    parser.add_argument('--size', type=int, default=4)
+    parser.add_argument('--count', type=int, default=2000)
+    parser.add_argument('--walk', type=int, default=60, help="生成棋盘的反向随机游走步数")
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    rng = random.Random(2024)
+    boards = [_random_walk(args.size, args.walk, rng) for _ in range(args.count)]
+
+    worker_counts = []
+    workers = 1
+    while workers < args.max_workers:
+        worker_counts.append(workers)
+        workers *= 2
+    worker_counts.append(args.max_workers)
+
+    print(f"{args.size}x{args.size} x {args.count}")
+    baseline = None
+    for workers in worker_counts:
+        start = time.perf_counter()
+        for _ in iter_solutions(boards, args.size, workers):
+            pass
+        rate = args.count / (time.perf_counter() - start)
+        baseline = baseline or rate
+        speedup = rate / baseline
+        print(f"  {workers:3d}进程: {rate:10.1f} 盘/秒  加速比 {speedup:5.2f}  效率 {speedup / workers:5.0%}")
+
+
+if __name__ == "__main__":
+    main()
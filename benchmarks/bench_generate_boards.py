@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""
+批量棋盘生成基准测试
+对比循环调用GameState.initialize_board与generator.generate_boards的吞吐量
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# 添加游戏模块目录到Python路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'huarongdao_game'))
+
+from generator import generate_boards
+from models import GameState
+
+
+def main():
+    parser = argparse.ArgumentParser(description="批量生成吞吐量")
+    parser.add_argument('--size', type=int, default=4)
+    parser.add_argument('--count', type=int, default=1_000_000)
+    parser.add_argument('--loop-count', type=int, default=20_000, help="initialize_board循环次数")
+    parser.add_argument('--path', default=None, help="可选：流式写入的.npy文件")
+    args = parser.parse_args()
+
+    game_state = GameState()
+    start = time.perf_counter()
+    for _ in range(args.loop_count):
+        game_state.initialize_board(args.size)
+    loop_rate = args.loop_count / (time.perf_counter() - start) * 60
+
+    start = time.perf_counter()
+    boards = generate_boards(args.size, args.count, seed=2024, path=args.path)
+    batch_rate = len(boards) / (time.perf_counter() - start) * 60
+
+    print(f"{args.size}x{args.size}")
+    print(f"  initialize_board循环: {loop_rate / 1e6:8.2f} 百万/分钟")
+    print(f"  generate_boards:     {batch_rate / 1e6:8.2f} 百万/分钟 ({batch_rate / loop_rate:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+无界面模拟基准测试
+不创建窗口，通过GameController.click脚本化完成整局游戏（选择模式、难度、按提示点击方块、确认成绩），
+统计每秒可完成的对局数；默认不提交成绩，加--record时包含排行榜写入
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# 添加游戏模块目录到Python路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'huarongdao_game'))
+
+from controllers import GameController, GameScreen
+from distance_table import get_distance_table
+from models import Leaderboard
+
+
+def play_session(controller: GameController, table, record: bool) -> int:
+    """脚本化完成一局3x3游戏，返回点击次数（record为False时不提交成绩，直接回到主菜单）"""
+    layout = controller.layout
+    clicks = 0
+    controller.click(layout.main_menu()[0].center)
+    controller.click(layout.difficulty_menu('NUMBERS')[0][0].center)
+    game_state = controller.game_state
+    while controller.current_screen == GameScreen.GAME_PLAY:
+        row, col = table.best_move(game_state.board)
+        controller.click(layout.tile_rect(game_state.size, row, col).center)
+        clicks += 1
+    if not record:
+        controller.pending_completion_entry = None
+        controller.current_screen = GameScreen.MAIN_MENU
+        return clicks + 2
+    controller.click(layout.completion_ok_button().center)
+    controller.click(layout.leaderboard()[0].center)
+    return clicks + 4
+
+
+def main():
+    parser = argparse.ArgumentParser(description="无界面模拟吞吐量")
+    parser.add_argument('--sessions', type=int, default=2000)
+    parser.add_argument('--record', action='store_true', help="每局提交成绩到排行榜（包含文件写入）")
+    args = parser.parse_args()
+
+    table = get_distance_table()
+    if table is None:
+        sys.exit("缺少3x3距离表，请先运行 python huarongdao_game/distance_table.py")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        controller = GameController(leaderboard=Leaderboard(os.path.join(temp_dir, 'leaderboard.json')))
+        clicks = 0
+        start = time.perf_counter()
+        for _ in range(args.sessions):
+            clicks += play_session(controller, table, args.record)
+        controller.leaderboard.close()
+        elapsed = time.perf_counter() - start
+
+    print(f"{args.sessions}局 / {clicks}次点击: {elapsed:.2f}s")
+    print(f"  {args.sessions / elapsed:10.1f} 局/秒")
+    print(f"  {clicks / elapsed:10.1f} 次点击/秒")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+SQLite排行榜基准测试
+批量写入大量历史成绩，统计批量插入吞吐量与get_entries_by_difficulty_and_mode的查询延迟
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+# 添加游戏模块目录到Python路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'huarongdao_game'))
+
+from leaderboard_sqlite import SQLiteLeaderboard
+from models import LeaderboardEntry
+
+
+def make_entries(count, rng):
+    """随机成绩（两种难度 × 两种模式）"""
+    for i in range(count):
+        yield LeaderboardEntry(f"玩家{i % 1000}", rng.uniform(10, 600), rng.randint(20, 300),
+                               rng.choice(['EASY', 'MEDIUM']), rng.choice(['NUMBERS', 'IMAGES']), 1000.0 + i)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite排行榜插入与查询")
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--batch', type=int, default=50_000, help="每个事务插入的条数")
+    parser.add_argument('--queries', type=int, default=10_000)
+    parser.add_argument('--seed', type=int, default=2024)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        leaderboard = SQLiteLeaderboard(os.path.join(temp_dir, 'leaderboard.db'))
+        entries = make_entries(args.rows, rng)
+        start = time.perf_counter()
+        for offset in range(0, args.rows, args.batch):
+            leaderboard.add_entries(next(entries) for _ in range(min(args.batch, args.rows - offset)))
+        insert_elapsed = time.perf_counter() - start
+
+        filters = [(difficulty, mode) for difficulty in ('EASY', 'MEDIUM') for mode in ('NUMBERS', 'IMAGES')]
+        start = time.perf_counter()
+        for i in range(args.queries):
+            leaderboard.get_entries_by_difficulty_and_mode(*filters[i % len(filters)], limit=10)
+        query_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        leaderboard.add_entry(next(make_entries(1, rng)))
+        single_elapsed = time.perf_counter() - start
+        leaderboard.close()
+
+    print(f"批量插入{args.rows}条: {insert_elapsed:.2f}s ({args.rows / insert_elapsed:.0f} 条/秒)")
+    print(f"前10名查询: {query_elapsed / args.queries * 1e6:.1f} us/次")
+    print(f"单条插入: {single_elapsed * 1e6:.0f} us")
+
+
+if __name__ == "__main__":
+    main()
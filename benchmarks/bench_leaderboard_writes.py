@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+排行榜写入吞吐量基准测试
+对比原有路径（每次完成都以indent=2整体重写leaderboard.json）与快照 + 追加日志存储，
+统计大量对局连续提交成绩时每秒可写入的条数
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+# 添加游戏模块目录到Python路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'huarongdao_game'))
+
+import config
+from leaderboard_store import JournalStore
+from models import Leaderboard, LeaderboardEntry
+
+
+def make_entries(count, seed):
+    """随机成绩（两种难度 × 两种模式）"""
+    rng = random.Random(seed)
+    return [LeaderboardEntry(f"玩家{i}", rng.uniform(10, 600), rng.randint(20, 300),
+                             rng.choice(['EASY', 'MEDIUM']), rng.choice(['NUMBERS', 'IMAGES']), 1000.0 + i)
+            for i in range(count)]
+
+
+def legacy_writes(path, entries):
+    """原有实现：追加、整体排序、截断并整体重写JSON"""
+    kept = []
+    for entry in entries:
+        kept.append(entry)
+        kept.sort(key=lambda x: (x.time_seconds, x.moves))
+        kept = kept[:config.MAX_LEADERBOARD_ENTRIES]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump([item.to_dict() for item in kept], f, ensure_ascii=False, indent=2)
+
+
+def journal_writes(path, entries, fsync_every):
+    """快照 + 追加日志：每条追加一行，按批fsync，日志过长时后台压缩"""
+    leaderboard = Leaderboard(path, store=JournalStore(path, fsync_every=fsync_every))
+    for entry in entries:
+        leaderboard.add_entry(entry)
+    leaderboard.close()
+    return leaderboard
+
+
+def main():
+    parser = argparse.ArgumentParser(description="排行榜写入吞吐量")
+    parser.add_argument('--completions', type=int, default=5000, help="连续提交的成绩条数")
+    parser.add_argument('--fsync-every', type=int, default=config.LEADERBOARD_FSYNC_BATCH)
+    parser.add_argument('--seed', type=int, default=2024)
+    args = parser.parse_args()
+
+    # 上榜的成绩才会写入，为比较写入开销临时放宽每桶上限
+    config.MAX_LEADERBOARD_ENTRIES = args.completions
+    entries = make_entries(args.completions, args.seed)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        legacy_count = min(args.completions, 1000)  # 原有路径为O(n²)，只测前1000条
+        start = time.perf_counter()
+        legacy_writes(os.path.join(temp_dir, 'legacy.json'), entries[:legacy_count])
+        legacy_elapsed = time.perf_counter() - start
+
+        path = os.path.join(temp_dir, 'leaderboard.json')
+        start = time.perf_counter()
+        journal_writes(path, entries, args.fsync_every)
+        journal_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        reloaded = Leaderboard(path)
+        load_elapsed = time.perf_counter() - start
+        assert len(reloaded.entries) == args.completions
+
+    print(f"{'storage':>10} {'records':>8} {'writes/s':>10} {'us/write':>10}")
+    print(f"{'legacy':>10} {legacy_count:8d} {legacy_count / legacy_elapsed:10.0f} "
+          f"{legacy_elapsed / legacy_count * 1e6:10.1f}")
+    print(f"{'journal':>10} {args.completions:8d} {args.completions / journal_elapsed:10.0f} "
+          f"{journal_elapsed / args.completions * 1e6:10.1f}")
+    print(f"重新加载{args.completions}条（快照 + 日志重放）: {load_elapsed * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
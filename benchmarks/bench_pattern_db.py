@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+模式数据库基准测试
+对比曼哈顿距离、曼哈顿距离 + 线性冲突与加性模式数据库在IDA*中展开的节点数和耗时
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+# 添加游戏模块目录到Python路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'huarongdao_game'))
+
+from pattern_db import get_pattern_database
+from solver import ManhattanDistance, ManhattanLinearConflict, Solver
+
+
+def scrambled_board(size, steps, rng):
+    """从目标状态出发随机走若干步（不立即回退）生成棋盘"""
+    tiles = list(range(1, size * size)) + [0]
+    blank, prev = size * size - 1, -1
+    for _ in range(steps):
+        row, col = divmod(blank, size)
+        options = [pos for pos, ok in ((blank - size, row > 0), (blank + size, row < size - 1),
+                                       (blank - 1, col > 0), (blank + 1, col < size - 1))
+                   if ok and pos != prev]
+        pos = rng.choice(options)
+        tiles[blank], tiles[pos] = tiles[pos], 0
+        prev, blank = blank, pos
+    return [tiles[row * size:(row + 1) * size] for row in range(size)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="模式数据库节点数对比")
+    parser.add_argument('--size', type=int, default=4)
+    parser.add_argument('--boards', type=int, default=5)
+    parser.add_argument('--steps', type=int, default=60, help="打乱步数")
+    parser.add_argument('--seed', type=int, default=2024)
+    args = parser.parse_args()
+
+    database = get_pattern_database(args.size)
+    if database is None:
+        print(f"缺少{args.size}x{args.size}模式数据库，请先运行: python huarongdao_game/pattern_db.py {args.size}")
+        return 1
+
+    heuristics = [
+        ('manhattan', ManhattanDistance(args.size)),
+        ('linear_conflict', ManhattanLinearConflict(args.size)),
+        ('pattern_db', database),
+    ]
+    rng = random.Random(args.seed)
+    boards = [scrambled_board(args.size, args.steps, rng) for _ in range(args.boards)]
+
+    totals = {name: [0, 0.0] for name, _ in heuristics}
+    print(f"{'board':>5} {'length':>6} " + " ".join(f"{name:>24}" for name, _ in heuristics))
+    for index, board in enumerate(boards):
+        cells = []
+        length = None
+        for name, heuristic in heuristics:
+            solver = Solver(args.size, heuristic)
+            start = time.perf_counter()
+            moves = solver.solve(board)
+            elapsed = time.perf_counter() - start
+            length = len(moves)
+            totals[name][0] += solver.nodes
+            totals[name][1] += elapsed
+            cells.append(f"{solver.nodes:>12} / {elapsed:7.2f}s")
+        print(f"{index:>5} {length:>6} " + " ".join(f"{cell:>24}" for cell in cells))
+
+    base_nodes = totals['manhattan'][0]
+    print("\n汇总（节点数 / 耗时 / 相对曼哈顿节省的节点比例）")
+    for name, (nodes, elapsed) in totals.items():
+        saved = 1 - nodes / base_nodes if base_nodes else 0
+        print(f"  {name:<16} {nodes:>12} {elapsed:8.2f}s  {saved:7.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+可解性判断与可解排列生成基准测试
+对比原有路径（O(n²)逆序数 + 拒绝采样）与置换环奇偶性 + 一次对换修正
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+# 添加游戏模块目录到Python路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'huarongdao_game'))
+
+from solvability import is_solvable, random_solvable_permutation
+
+
+def inversion_solvable(numbers, size):
+    """原有实现：O(n²)逆序数"""
+    inversions = 0
+    for i in range(len(numbers)):
+        for j in range(i + 1, len(numbers)):
+            if numbers[i] != 0 and numbers[j] != 0 and numbers[i] > numbers[j]:
+                inversions += 1
+    if size % 2 == 1:
+        return inversions % 2 == 0
+    empty_row_from_bottom = size - 1 - numbers.index(0) // size
+    return (inversions + empty_row_from_bottom) % 2 == 0
+
+
+def rejection_sampling(size, rng):
+    """原有路径：反复洗牌直到可解"""
+    numbers = list(range(1, size * size))
+    numbers.append(0)
+    rng.shuffle(numbers)
+    while not inversion_solvable(numbers, size):
+        rng.shuffle(numbers)
+    return numbers
+
+
+def measure(function, count):
+    """返回每次调用的平均微秒数"""
+    start = time.perf_counter()
+    for _ in range(count):
+        function()
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="可解性与生成器基准")
+    parser.add_argument('--count', type=int, default=2000, help="每个尺寸生成的棋盘数")
+    parser.add_argument('--seed', type=int, default=2024)
+    args = parser.parse_args()
+
+    print(f"{'size':>4} {'check_old':>11} {'check_new':>11} {'gen_old':>11} {'gen_new':>11} {'speedup':>8}  (us/board)")
+    for size in range(3, 11):
+        rng = random.Random(args.seed)
+        samples = []
+        for _ in range(200):
+            numbers = list(range(size * size))
+            rng.shuffle(numbers)
+            samples.append(numbers)
+        it = iter(samples * (args.count // len(samples) + 1))
+        check_old = measure(lambda: inversion_solvable(next(it), size), args.count)
+        it = iter(samples * (args.count // len(samples) + 1))
+        check_new = measure(lambda: is_solvable(next(it), size), args.count)
+
+        rng = random.Random(args.seed)
+        gen_old = measure(lambda: rejection_sampling(size, rng), args.count)
+        rng = random.Random(args.seed)
+        gen_new = measure(lambda: random_solvable_permutation(size, rng), args.count)
+        print(f"{size:>4} {check_old:>11.1f} {check_new:>11.1f} {gen_old:>11.1f} {gen_new:>11.1f} {gen_old / gen_new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+启动耗时基准测试
+在子进程中（dummy视频驱动）测量导入模块、创建GameRenderer与绘制第一帧的耗时；
+冷启动时字体索引不存在，需要探测字体，热启动时直接读取索引
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+game_dir = os.path.join(project_root, 'huarongdao_game')
+
+# 子进程中执行：导入、创建渲染器、绘制并提交第一帧，输出各阶段耗时（毫秒）
+CHILD = r'''
+import json, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {game_dir!r})
+import pygame
+import config
+from renderer import GameRenderer
+from controllers import GameController
+from models import Leaderboard
+imported = time.perf_counter()
+config.FONT_INDEX_FILE = {index_file!r}
+renderer = GameRenderer()
+created = time.perf_counter()
+controller = GameController(leaderboard=Leaderboard({leaderboard_file!r}), layout=renderer.layout)
+controller.render_current_screen(renderer)
+first_frame = time.perf_counter()
+print(json.dumps({{'import': (imported - start) * 1000, 'renderer': (created - imported) * 1000,
+                  'first_frame': (first_frame - created) * 1000}}))
+'''
+
+
+def run_child(index_file, leaderboard_file):
+    """启动一次游戏进程，返回各阶段耗时"""
+    env = dict(os.environ, SDL_VIDEODRIVER='dummy', SDL_AUDIODRIVER='dummy', PYGAME_HIDE_SUPPORT_PROMPT='1')
+    code = CHILD.format(game_dir=game_dir, index_file=index_file, leaderboard_file=leaderboard_file)
+    output = subprocess.run([sys.executable, '-c', code], env=env, capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="启动到第一帧的耗时")
+    parser.add_argument('--runs', type=int, default=5, help="热启动次数")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        index_file = os.path.join(temp_dir, 'font_index.json')
+        leaderboard_file = os.path.join(temp_dir, 'leaderboard.json')
+        results = [('cold', run_child(index_file, leaderboard_file))]
+        results += [('warm', run_child(index_file, leaderboard_file)) for _ in range(args.runs)]
+
+    print(f"{'run':>5} {'import':>9} {'renderer':>9} {'1st frame':>10} {'to frame':>9}  (ms，to frame不含导入)")
+    for name, timing in results:
+        print(f"{name:>5} {timing['import']:9.1f} {timing['renderer']:9.1f} {timing['first_frame']:10.1f} "
+              f"{timing['renderer'] + timing['first_frame']:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
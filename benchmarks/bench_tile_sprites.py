@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+数字方块绘制基准测试
+对比原有逐帧绘制（每块新建高光Surface、两次圆角矩形、渲染数字）与预渲染精灵批量blit：
+每帧耗时、新建Surface数、Python堆峰值与垃圾回收次数
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+# 添加游戏模块目录到Python路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'huarongdao_game'))
+
+import pygame
+from config import COLORS
+from models import GameState
+from renderer import GameRenderer
+
+
+def legacy_draw_board(renderer: GameRenderer, game_state: GameState):
+    """原有实现：每个方块每帧重新绘制"""
+    size = game_state.size
+    tile_size = renderer.tile_size
+    start_x, start_y = renderer.layout.board_origin(size)
+    for row in range(size):
+        for col in range(size):
+            number = game_state.board[row][col]
+            x = start_x + col * tile_size
+            y = start_y + row * tile_size
+            if number == 0:
+                pygame.draw.rect(renderer.screen, COLORS['GAME_BG'], (x, y, tile_size, tile_size), border_radius=10)
+                pygame.draw.rect(renderer.screen, COLORS['GRAY'], (x, y, tile_size, tile_size), 2, border_radius=10)
+                continue
+            pygame.draw.rect(renderer.screen, COLORS['BLUE'], (x, y, tile_size, tile_size), border_radius=10)
+            pygame.draw.rect(renderer.screen, COLORS['BLACK'], (x, y, tile_size, tile_size), 2, border_radius=10)
+            highlight = pygame.Surface((tile_size - 6, tile_size // 4), pygame.SRCALPHA)
+            highlight.fill((255, 255, 255, 80))
+            renderer.screen.blit(highlight, (x + 3, y + 3))
+            font = renderer.fonts['large'] if tile_size >= 80 else renderer.fonts['medium']
+            text = font.render(str(number), True, COLORS['WHITE'])
+            renderer.screen.blit(text, text.get_rect(center=(x + tile_size // 2, y + tile_size // 2)))
+
+
+class SurfaceCounter:
+    """统计新建的Surface数量（pygame.Surface构造与字体渲染）"""
+
+    def __init__(self, renderer: GameRenderer):
+        self.renderer = renderer
+        self.count = 0
+
+    def __enter__(self):
+        surface_type = self._surface_type = pygame.Surface
+
+        def counting_surface(*args, **kwargs):
+            self.count += 1
+            return surface_type(*args, **kwargs)
+
+        pygame.Surface = counting_surface
+        self._fonts = dict(self.renderer.fonts)
+        self.renderer.fonts = {name: _CountingFont(font, self) for name, font in self._fonts.items()}
+        return self
+
+    def __exit__(self, *exc_info):
+        pygame.Surface = self._surface_type
+        self.renderer.fonts = self._fonts
+
+
+class _CountingFont:
+    def __init__(self, font, counter: SurfaceCounter):
+        self._font = font
+        self._counter = counter
+
+    def render(self, *args, **kwargs):
+        self._counter.count += 1
+        return self._font.render(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._font, name)
+
+
+def measure(renderer: GameRenderer, draw, frames: int):
+    """返回(每帧微秒, 每帧新建Surface数, 每帧Python堆峰值增量字节, 0代垃圾回收次数)"""
+    with SurfaceCounter(renderer) as counter:
+        draw()  # 预热（精灵与文字缓存在首帧生成）
+        counter.count = 0
+        for _ in range(100):
+            draw()
+        surfaces = counter.count / 100
+
+        gc.collect()
+        collections = gc.get_stats()[0]['collections']
+        start = time.perf_counter()
+        for _ in range(frames):
+            draw()
+        elapsed = (time.perf_counter() - start) / frames * 1e6
+        collections = gc.get_stats()[0]['collections'] - collections
+
+        tracemalloc.start()
+        peak = 0
+        for _ in range(100):
+            current = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            draw()
+            peak += tracemalloc.get_traced_memory()[1] - current
+        tracemalloc.stop()
+    return elapsed, surfaces, peak / 100, collections
+
+
+def main():
+    parser = argparse.ArgumentParser(description="数字方块绘制开销")
+    parser.add_argument('--size', type=int, default=4)
+    parser.add_argument('--frames', type=int, default=2000)
+    args = parser.parse_args()
+
+    renderer = GameRenderer()
+    game_state = GameState()
+    game_state.initialize_board(args.size, 'NUMBERS')
+    renderer.prepare_tile_sprites(args.size)
+
+    print(f"{args.size}x{args.size} x {args.frames}帧")
+    for name, draw in (("逐帧绘制", lambda: legacy_draw_board(renderer, game_state)),
+                       ("预渲染精灵", lambda: renderer.draw_game_board(game_state))):
+        elapsed, surfaces, peak, collections = measure(renderer, draw, args.frames)
+        print(f"  {name}: {elapsed:8.1f} us/帧  新建Surface {surfaces:5.1f} 个/帧  "
+              f"Python堆峰值 +{peak:7.0f} B/帧  0代GC {collections}次")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+华容道方块滑动动画
+动画以固定步长（ANIMATION_STEP_MS）推进，绘制时在相邻两步之间按剩余时间插值，
+滑动轨迹与帧率无关；动画期间的点击进入队列，动画结束后依次执行，不会丢失；
+同时记录动画帧的间隔与绘制耗时，用于检查能否保持FPS
+"""
+
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Optional, Tuple
+import config
+
+Cell = Tuple[int, int]
+
+
+def ease_out(t: float) -> float:
+    """减速曲线（0到1）"""
+    return 1 - (1 - t) * (1 - t)
+
+
+class TileSlide:
+    """一次方块滑动：number从from_cell滑到to_cell（to_cell为原空格）"""
+
+    __slots__ = ('number', 'from_cell', 'to_cell', 'progress')
+
+    def __init__(self, number: int, from_cell: Cell, to_cell: Cell):
+        self.number = number
+        self.from_cell = from_cell
+        self.to_cell = to_cell
+        self.progress = 0.0  # 本帧绘制使用的插值进度（0到1）
+
+    def position(self, from_xy: Tuple[int, int], to_xy: Tuple[int, int]) -> Tuple[int, int]:
+        """按当前进度在两个格子坐标之间插值"""
+        return (round(from_xy[0] + (to_xy[0] - from_xy[0]) * self.progress),
+                round(from_xy[1] + (to_xy[1] - from_xy[1]) * self.progress))
+
+
+class SlideAnimator:
+    """方块滑动动画状态（不依赖pygame，时间来源可注入以便测试）"""
+
+    def __init__(self, duration_ms: Optional[float] = None, step_ms: Optional[float] = None,
+                 max_queued: Optional[int] = None, clock: Callable[[], float] = time.perf_counter):
+        self.duration_ms = config.TILE_SLIDE_MS if duration_ms is None else duration_ms
+        self.step_ms = step_ms or config.ANIMATION_STEP_MS
+        self.clock = clock
+        self.slide: Optional[TileSlide] = None
+        self.max_queued = max_queued or config.MAX_QUEUED_MOVES
+        self.queued_moves: Deque[Cell] = deque()
+        self._steps = 0  # 已推进的固定步数
+        self._accumulator = 0.0  # 不足一步的剩余时间（毫秒）
+        self._last_time = 0.0
+        # 动画帧统计：相邻两帧的间隔与每帧绘制耗时（毫秒）
+        self.frame_intervals: Deque[float] = deque(maxlen=config.ANIMATION_FRAME_SAMPLES)
+        self.draw_times: Deque[float] = deque(maxlen=config.ANIMATION_FRAME_SAMPLES)
+
+    @property
+    def enabled(self) -> bool:
+        return self.duration_ms > 0
+
+    def is_active(self) -> bool:
+        """是否有正在进行的滑动"""
+        return self.slide is not None
+
+    def start(self, number: int, from_cell: Cell, to_cell: Cell):
+        """开始一次滑动（替换尚未结束的滑动）"""
+        self.slide = TileSlide(number, from_cell, to_cell)
+        self._steps = 0
+        self._accumulator = 0.0
+        self._last_time = self.clock()
+
+    def queue_move(self, cell: Cell) -> bool:
+        """动画期间记录点击的格子；队列已满时返回False（忽略这次点击）"""
+        if len(self.queued_moves) >= self.max_queued:
+            return False
+        self.queued_moves.append(cell)
+        return True
+
+    def next_move(self) -> Optional[Cell]:
+        """取出最早排队的点击"""
+        return self.queued_moves.popleft() if self.queued_moves else None
+
+    def _eased(self, steps: int) -> float:
+        return ease_out(min(1.0, steps * self.step_ms / self.duration_ms))
+
+    def advance(self) -> Optional[TileSlide]:
+        """
+        按经过的时间推进固定步数，更新slide.progress为前后两步之间的插值；
+        滑动结束时返回None
+        """
+        slide = self.slide
+        if slide is None:
+            return None
+        now = self.clock()
+        elapsed_ms = (now - self._last_time) * 1000
+        self._last_time = now
+        self.frame_intervals.append(elapsed_ms)
+        self._accumulator += min(elapsed_ms, config.MAX_FRAME_STEP_MS)
+        while self._accumulator >= self.step_ms:
+            self._steps += 1
+            self._accumulator -= self.step_ms
+        if self._steps * self.step_ms >= self.duration_ms:
+            self.slide = None
+            return None
+        previous, current = self._eased(self._steps), self._eased(self._steps + 1)
+        slide.progress = previous + (current - previous) * (self._accumulator / self.step_ms)
+        return slide
+
+    def record_draw(self, elapsed_ms: float):
+        """记录一帧动画的绘制耗时"""
+        self.draw_times.append(elapsed_ms)
+
+    def reset(self):
+        """结束动画并清空排队的点击（换局、返回菜单时调用）"""
+        self.slide = None
+        self.queued_moves.clear()
+
+    def frame_stats(self) -> Dict[str, float]:
+        """最近动画帧的统计（毫秒）：帧间隔、绘制耗时，以及超出1/FPS预算的帧数"""
+        budget_ms = 1000 / config.FPS
+        intervals, draws = list(self.frame_intervals), list(self.draw_times)
+        return {
+            'frames': len(intervals),
+            'avg_frame_ms': sum(intervals) / len(intervals) if intervals else 0.0,
+            'max_frame_ms': max(intervals, default=0.0),
+            'over_budget': sum(1 for interval in intervals if interval > budget_ms * 1.5),
+            'avg_draw_ms': sum(draws) / len(draws) if draws else 0.0,
+            'max_draw_ms': max(draws, default=0.0),
+            'budget_ms': budget_ms,
+        }
@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+"""
+华容道批量求解
+用进程池并行求解大量棋盘（离线分析对局记录），模式数据库通过共享内存只读共享给各工作进程，
+结果按输入顺序流式输出为JSONL或NPY
+"""
+
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
+from math import isqrt
+from multiprocessing import shared_memory, util
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+from pattern_db import PatternDatabase, get_pattern_database, table_entries
+from solver import ManhattanLinearConflict, Solver
+
+# 每个任务包含的棋盘数（摊薄进程间通信开销），以及每个工作进程的预提交任务数
+DEFAULT_BATCH_SIZE = 16
+PENDING_PER_WORKER = 4
+# 不可解或格式错误的棋盘记为-1
+UNSOLVABLE = -1
+
+# 工作进程内的求解器与共享内存（由_init_worker设置）
+_worker_solver: Optional[Solver] = None
+_worker_shared: Optional[shared_memory.SharedMemory] = None
+
+
+def _flatten(board) -> List[int]:
+    """将一维或二维棋盘统一为一维整数列表"""
+    if len(board) and hasattr(board[0], '__len__'):
+        return [int(num) for row in board for num in row]
+    return [int(num) for num in board]
+
+
+def _share_database(database: PatternDatabase) -> shared_memory.SharedMemory:
+    """将模式数据库的各组距离表依次拷贝到一块共享内存"""
+    total = sum(len(table) for table in database.tables)
+    shared = shared_memory.SharedMemory(create=True, size=total)
+    offset = 0
+    for table in database.tables:
+        shared.buf[offset:offset + len(table)] = table
+        offset += len(table)
+    return shared
+
+
+def _release_worker():
+    """工作进程退出前释放共享内存视图"""
+    global _worker_solver, _worker_shared
+    if _worker_solver is not None and isinstance(_worker_solver.heuristic, PatternDatabase):
+        for table in _worker_solver.heuristic.tables:
+            table.release()
+        _worker_solver.heuristic.tables = []
+    _worker_solver = None
+    if _worker_shared is not None:
+        _worker_shared.close()
+        _worker_shared = None
+
+
+def _init_worker(size: int, shared_name: Optional[str], patterns: Sequence[Sequence[int]]):
+    """工作进程初始化：挂载共享的距离表（不复制），没有数据库时使用线性冲突启发函数"""
+    global _worker_solver, _worker_shared
+    if shared_name is None:
+        heuristic = ManhattanLinearConflict(size)
+    else:
+        _worker_shared = shared_memory.SharedMemory(name=shared_name)
+        tables = []
+        offset = 0
+        for pattern in patterns:
+            entries = table_entries(size * size, len(pattern))
+            tables.append(_worker_shared.buf[offset:offset + entries])
+            offset += entries
+        heuristic = PatternDatabase(size, patterns, tables)
+    _worker_solver = Solver(size, heuristic)
+    util.Finalize(None, _release_worker, exitpriority=10)
+
+
+def _solve_batch(batch: List[List[int]]) -> List[Tuple[int, int]]:
+    """在工作进程中求解一批棋盘，返回[(最优步数, 展开节点数), ...]"""
+    solver = _worker_solver
+    size = solver.size
+    results = []
+    for tiles in batch:
+        try:
+            # 尺寸不符、数字重复或越界、不可解的棋盘都由solve报ValueError
+            path = solver.solve([tiles[row * size:(row + 1) * size] for row in range(size)])
+        except ValueError:
+            path = None
+        if path is None:
+            results.append((UNSOLVABLE, 0))
+        else:
+            results.append((len(path), solver.nodes))
+    return results
+
+
+def iter_solutions(boards: Iterable, size: int = None, workers: int = None,
+                   batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[Tuple[int, int]]:
+    """
+    并行求解并按输入顺序逐个产出(最优步数, 展开节点数)
+    boards可以是一维或二维棋盘的任意可迭代对象（如generator.generate_boards的结果），
+    同时在途的任务数有上限，输入可以远大于内存
+    """
+    iterator = iter(boards)
+    first = next(iterator, None)
+    if first is None:
+        return
+    first = _flatten(first)
+    size = size or isqrt(len(first))
+    workers = workers or os.cpu_count() or 1
+    boards = chain([first], (_flatten(board) for board in iterator))
+
+    database = get_pattern_database(size)
+    shared = _share_database(database) if database is not None else None
+    initargs = (size, shared.name if shared else None, database.patterns if database else ())
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=initargs) as executor:
+            pending = deque()
+            while True:
+                while len(pending) < workers * PENDING_PER_WORKER:
+                    batch = list(islice(boards, batch_size))
+                    if not batch:
+                        break
+                    pending.append(executor.submit(_solve_batch, batch))
+                if not pending:
+                    break
+                yield from pending.popleft().result()
+    finally:
+        if shared is not None:
+            shared.close()
+            shared.unlink()
+
+
+def solve_many(boards: Iterable, output: str, size: int = None, workers: int = None,
+               player_moves: Iterable[int] = None, batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """
+    批量求解并写入结果文件，返回棋盘数
+    .npy输出为int32的最优步数数组（文件头需要棋盘总数，不支持len()的输入会先读入列表）；
+    其他扩展名按JSONL输出，每行包含下标、最优步数、展开节点数，
+    提供player_moves时额外记录玩家步数及超出最优解的步数；
+    写入同目录临时文件，完成后rename，中途出错时删除临时文件
+    """
+    npy = output.endswith('.npy')
+    if npy and not hasattr(boards, '__len__'):
+        boards = list(boards)
+    results = iter_solutions(boards, size, workers, batch_size)
+    temp_path = output + '.tmp'
+    count = 0
+    try:
+        if npy:
+            import numpy as np
+
+            with open(temp_path, 'wb') as f:
+                header = {'descr': np.lib.format.dtype_to_descr(np.dtype(np.int32)),
+                          'fortran_order': False, 'shape': (len(boards),)}
+                np.lib.format.write_array_header_1_0(f, header)
+                chunk = []
+                for moves, _ in results:
+                    chunk.append(moves)
+                    if len(chunk) >= 1 << 16:
+                        f.write(np.array(chunk, dtype=np.int32).tobytes())
+                        count += len(chunk)
+                        chunk = []
+                f.write(np.array(chunk, dtype=np.int32).tobytes())
+                count += len(chunk)
+        else:
+            player_moves = iter(player_moves) if player_moves is not None else None
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                for index, (moves, nodes) in enumerate(results):
+                    record = {'index': index, 'moves': moves, 'nodes': nodes}
+                    if player_moves is not None:
+                        played = next(player_moves)
+                        record['player_moves'] = played
+                        solved = played is not None and moves != UNSOLVABLE
+                        record['excess'] = played - moves if solved else None
+                    f.write(json.dumps(record) + '\n')
+                    count += 1
+        os.replace(temp_path, output)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+    return count
+
+
+def _read_boards(path: str):
+    """读取输入棋盘：.npy为批量生成的棋盘数组，否则按JSONL读取（每行为棋盘，或含board与moves的对象）"""
+    if path.endswith('.npy'):
+        import numpy as np
+
+        return np.load(path, mmap_mode='r'), None
+    boards, moves = [], []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if isinstance(record, dict):
+                boards.append(record['board'])
+                moves.append(record.get('moves'))
+            else:
+                boards.append(record)
+                moves.append(None)
+    return boards, (moves if any(move is not None for move in moves) else None)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="华容道批量求解")
+    parser.add_argument('input', help="输入棋盘文件（.npy或.jsonl）")
+    parser.add_argument('output', help="输出文件（.npy或.jsonl）")
+    parser.add_argument('--workers', type=int, default=None, help="工作进程数（默认为CPU核数）")
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+    input_boards, input_moves = _read_boards(args.input)
+    total = solve_many(input_boards, args.output, workers=args.workers,
+                       player_moves=input_moves, batch_size=args.batch_size)
+    print(f"已求解{total}个棋盘: {args.output}")
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+华容道紧凑棋盘表示
+4x4及以下使用64位整数按4位一格打包，更大尺寸使用array数组；
+增量维护空格位置和错位数字个数，移动、完成判断、哈希与比较均为O(1)
+"""
+
+import random
+from array import array
+from typing import Dict, List, Sequence
+
+# 打包表示每格占用的位数，以及可打包的最大尺寸
+NIBBLE_BITS = 4
+MAX_PACKED_SIZE = 4
+
+# 数组表示使用的Zobrist哈希键（按尺寸缓存，固定种子保证进程间一致）
+_zobrist_keys: Dict[int, List[List[int]]] = {}
+
+
+def _count_misplaced(tiles: Sequence[int]) -> int:
+    """统计不在目标位置的数字个数（不含空格）"""
+    return sum(1 for pos, tile in enumerate(tiles) if tile and tile != pos + 1)
+
+
+def _is_adjacent(size: int, pos: int, other: int) -> bool:
+    """检查两个位置是否相邻"""
+    row, col = divmod(pos, size)
+    other_row, other_col = divmod(other, size)
+    return abs(row - other_row) + abs(col - other_col) == 1
+
+
+class PackedBoard:
+    """64位整数打包的棋盘（尺寸不超过4x4）"""
+
+    __slots__ = ('size', 'value', 'empty', 'misplaced')
+
+    def __init__(self, size: int, tiles: Sequence[int]):
+        if size > MAX_PACKED_SIZE:
+            raise ValueError(f"打包棋盘最大支持{MAX_PACKED_SIZE}x{MAX_PACKED_SIZE}")
+        self.size = size
+        self.value = 0
+        for pos, tile in enumerate(tiles):
+            self.value |= tile << (pos * NIBBLE_BITS)
+        self.empty = list(tiles).index(0)
+        self.misplaced = _count_misplaced(tiles)
+
+    def __getitem__(self, pos: int) -> int:
+        return (self.value >> (pos * NIBBLE_BITS)) & 0xF
+
+    def __hash__(self) -> int:
+        return hash((self.size, self.value))
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, PackedBoard) and self.size == other.size and self.value == other.value
+
+    def move(self, pos: int) -> bool:
+        """将pos处的数字移入相邻空格"""
+        empty = self.empty
+        if not _is_adjacent(self.size, pos, empty):
+            return False
+        shift = pos * NIBBLE_BITS
+        tile = (self.value >> shift) & 0xF
+        # 空格处原为0，直接写入数字；再清空原位置
+        self.value = (self.value & ~(0xF << shift)) | (tile << (empty * NIBBLE_BITS))
+        self.misplaced += (tile != empty + 1) - (tile != pos + 1)
+        self.empty = pos
+        return True
+
+    def is_solved(self) -> bool:
+        """所有数字都在目标位置即为完成"""
+        return self.misplaced == 0
+
+    def copy(self) -> 'PackedBoard':
+        """复制棋盘（O(1)）"""
+        board = PackedBoard.__new__(PackedBoard)
+        board.size = self.size
+        board.value = self.value
+        board.empty = self.empty
+        board.misplaced = self.misplaced
+        return board
+
+    def to_list(self) -> List[int]:
+        """一维数字列表"""
+        return [self[pos] for pos in range(self.size * self.size)]
+
+    def to_rows(self) -> List[List[int]]:
+        """二维列表视图（供渲染器使用）"""
+        tiles = self.to_list()
+        return [tiles[row * self.size:(row + 1) * self.size] for row in range(self.size)]
+
+
+class ArrayBoard:
+    """数组存储的棋盘（任意尺寸），哈希使用增量Zobrist"""
+
+    __slots__ = ('size', 'tiles', 'empty', 'misplaced', 'hash_value')
+
+    def __init__(self, size: int, tiles: Sequence[int]):
+        self.size = size
+        self.tiles = array('H', tiles)
+        self.empty = self.tiles.index(0)
+        self.misplaced = _count_misplaced(tiles)
+        keys = self._keys(size)
+        self.hash_value = 0
+        for pos, tile in enumerate(self.tiles):
+            self.hash_value ^= keys[tile][pos]
+
+    @staticmethod
+    def _keys(size: int) -> List[List[int]]:
+        """获取指定尺寸的Zobrist键表"""
+        keys = _zobrist_keys.get(size)
+        if keys is None:
+            rng = random.Random(size)
+            cells = size * size
+            keys = [[rng.getrandbits(64) for _ in range(cells)] for _ in range(cells)]
+            _zobrist_keys[size] = keys
+        return keys
+
+    def __getitem__(self, pos: int) -> int:
+        return self.tiles[pos]
+
+    def __hash__(self) -> int:
+        return self.hash_value
+
+    def __eq__(self, other) -> bool:
+        return (isinstance(other, ArrayBoard) and self.size == other.size
+                and self.hash_value == other.hash_value and self.tiles == other.tiles)
+
+    def move(self, pos: int) -> bool:
+        """将pos处的数字移入相邻空格"""
+        empty = self.empty
+        if not _is_adjacent(self.size, pos, empty):
+            return False
+        tiles = self.tiles
+        tile = tiles[pos]
+        tiles[empty] = tile
+        tiles[pos] = 0
+        keys = self._keys(self.size)
+        self.hash_value ^= (keys[tile][pos] ^ keys[tile][empty] ^ keys[0][empty] ^ keys[0][pos])
+        self.misplaced += (tile != empty + 1) - (tile != pos + 1)
+        self.empty = pos
+        return True
+
+    def is_solved(self) -> bool:
+        """所有数字都在目标位置即为完成"""
+        return self.misplaced == 0
+
+    def copy(self) -> 'ArrayBoard':
+        """复制棋盘"""
+        board = ArrayBoard.__new__(ArrayBoard)
+        board.size = self.size
+        board.tiles = array(self.tiles.typecode, self.tiles)
+        board.empty = self.empty
+        board.misplaced = self.misplaced
+        board.hash_value = self.hash_value
+        return board
+
+    def to_list(self) -> List[int]:
+        """一维数字列表"""
+        return self.tiles.tolist()
+
+    def to_rows(self) -> List[List[int]]:
+        """二维列表视图（供渲染器使用）"""
+        tiles = self.tiles.tolist()
+        return [tiles[row * self.size:(row + 1) * self.size] for row in range(self.size)]
+
+
+def make_board(size: int, tiles: Sequence[int]):
+    """根据尺寸选择合适的棋盘表示"""
+    if size <= MAX_PACKED_SIZE:
+        return PackedBoard(size, tiles)
+    return ArrayBoard(size, tiles)
@@ -20,6 +20,14 @@ LANGUAGE = "ZH"  # ZH: 中文, EN: 英文
 WINDOW_WIDTH = 480   # 手机宽度
 WINDOW_HEIGHT = 800  # 手机高度
 FPS = 60
+IDLE_TIMEOUT_MS = 1000  # 静态画面时主循环阻塞等待事件的最长时间（毫秒）
+
+# 方块滑动动画
+TILE_SLIDE_MS = 120  # 一次滑动的时长（毫秒），0表示不播放动画
+ANIMATION_STEP_MS = 4  # 动画推进的固定步长（毫秒），绘制时在相邻两步之间插值
+MAX_FRAME_STEP_MS = 100  # 单帧最多推进的时间（窗口拖动等长时间卡顿后不一次跳过整段动画）
+MAX_QUEUED_MOVES = 16  # 动画期间最多排队的点击数
+ANIMATION_FRAME_SAMPLES = 240  # 动画帧耗时统计保留的最近帧数
 
 # 颜色定义 (R, G, B) - 更美观的配色方案
 COLORS = {
@@ -121,10 +129,10 @@ TEXTS = {
     }
 }
 
-# 游戏难度设置 - 删除HARD难度
+# 游戏难度设置 - 删除HARD难度（moves为分级题库的最优步数区间）
 DIFFICULTY_LEVELS = {
-    'EASY': {'size': 3, 'name': 'EASY'},
-    'MEDIUM': {'size': 4, 'name': 'MEDIUM'}
+    'EASY': {'size': 3, 'name': 'EASY', 'moves': (14, 20)},
+    'MEDIUM': {'size': 4, 'name': 'MEDIUM', 'moves': (40, 45)}
 }
 
 # 游戏模式
@@ -141,8 +149,15 @@ DATA_DIR = os.path.join(ASSETS_DIR, "data")
 FONTS_DIR = os.path.join(ASSETS_DIR, "fonts")
 
 # 排行榜设置
+LEADERBOARD_BACKEND = "journal"  # journal: JSON快照 + 追加日志；sqlite: SQLite数据库（保留全部历史）
 LEADERBOARD_FILE = os.path.join(DATA_DIR, "leaderboard.json")
-MAX_LEADERBOARD_ENTRIES = 30  # 限制存储30条记录
+LEADERBOARD_DB_FILE = os.path.join(DATA_DIR, "leaderboard.db")
+MAX_LEADERBOARD_ENTRIES = 30  # 每种难度和模式限制存储30条记录
+LEADERBOARD_FSYNC_BATCH = 8  # 排行榜日志每追加多少条fsync一次
+LEADERBOARD_COMPACT_RECORDS = 200  # 日志超过多少条时在后台压缩为快照
+LEADERBOARD_ASYNC = True  # 成绩提交由后台线程写入，不阻塞界面
+LEADERBOARD_QUEUE_SIZE = 256  # 后台写入队列容量（满时提交等待）
+LEADERBOARD_WRITE_BATCH = 64  # 后台线程一次合并写入的最多条数
 
 # 字体设置 - 适配手机屏幕
 FONT_SIZES = {
@@ -152,6 +167,28 @@ FONT_SIZES = {
     'TITLE': 32
 }
 
+# 字体路径索引（首次启动时探测中文字体并保存，之后直接读取）
+FONT_INDEX_FILE = os.path.join(DATA_DIR, "font_index.json")
+FONT_SELF_TEST = False  # 启动时运行中文渲染自检（逐像素采样，会拖慢启动）
+
+# 图片注册表：已解码图片的缓存容量与解码线程数
+IMAGE_CACHE_SIZE = 8
+IMAGE_LOAD_WORKERS = 4
+IMAGE_POLL_MS = 50  # 图片选择界面有图片正在解码时，每隔多久重绘一次以替换占位框（毫秒）
+
+# 文字渲染缓存容量（已渲染的文字Surface条数）
+TEXT_CACHE_SIZE = 256
+
+# 日志设置
+LOG_LEVEL = "WARNING"  # 日志级别：DEBUG / INFO / WARNING / ERROR
+DEBUG_LOG = False  # 开启逐步移动、计时器等热路径调试日志（关闭时这些日志语句整体跳过）
+
+# 帧耗时分析（默认关闭；关闭时不包装任何方法，没有额外开销）
+FRAME_PROFILER = False  # 记录每帧各阶段（事件处理、各draw_*方法、显示提交）的耗时
+PROFILER_OVERLAY = False  # 在画面左下角显示帧耗时p50/p95/p99
+PROFILER_SAMPLES = 600  # 每个阶段保留的最近帧数（环形缓冲）
+PROFILER_DUMP_FILE = os.path.join(DATA_DIR, "frame_profile.json")  # 退出时写入的统计文件
+
 # 按键映射
 KEY_MAPPINGS = {
     'UP': [ord('W'), ord('w'), 273],  # W, w, 上箭头
@@ -4,12 +4,19 @@
 处理用户输入和游戏逻辑控制
 """
 
-import pygame
 import time
 from enum import Enum
 from typing import Optional
 from config import *
-from models import GameState, Leaderboard, LeaderboardEntry
+from animation import SlideAnimator
+from layout import Layout
+from models import GameState, Leaderboard, LeaderboardEntry, open_leaderboard
+from puzzle_pool import draw_graded_board
+
+try:
+    import pygame
+except ImportError:
+    pygame = None  # 无界面模拟：不安装pygame时仍可通过GameController.click驱动游戏
 
 
 class GameScreen(Enum):
@@ -24,11 +31,12 @@ class GameScreen(Enum):
 
 
 class GameController:
-    """游戏控制器"""
+    """游戏控制器（点击检测使用layout.Layout，不依赖渲染器，可无界面运行）"""
     
-    def __init__(self):
+    def __init__(self, leaderboard: Optional[Leaderboard] = None, layout: Optional[Layout] = None):
         self.game_state = GameState()
-        self.leaderboard = Leaderboard()
+        self.leaderboard = leaderboard or open_leaderboard()
+        self.layout = layout or Layout()
         self.current_screen = GameScreen.MAIN_MENU
         self.selected_mode = 'NUMBERS'
         self.selected_image = None  # 新增：记录选择的图片
@@ -38,6 +46,9 @@ class GameController:
         self.completion_start_time = 0
         self.game_state.current_difficulty = 'EASY'  # 初始化默认难度
         self.leaderboard_filter_difficulty = 'EASY'  # 新增：排行榜筛选难度
+        self.game_serial = 0  # 每次发牌递增，用于判断游戏界面是否需要整屏重绘
+        self.images_loading = False  # 图片选择界面上还有图片在后台解码
+        self.animator = SlideAnimator()  # 方块滑动动画（仅在有渲染器时播放）
     
     def handle_events(self, events, renderer=None):
         """处理游戏事件"""
@@ -45,24 +56,20 @@ class GameController:
             if event.type == pygame.QUIT:
                 return False
             
+            elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                # 窗口内容可能已丢失，下一帧整屏重绘
+                if renderer:
+                    renderer.invalidate()
+            
             elif self.current_screen == GameScreen.IMAGE_SELECT:
-                result = self.handle_image_selection(event, renderer)
-                if result is not None:
-                    return result
+                if event.type == pygame.MOUSEBUTTONDOWN:
+                    return self.click(event.pos, renderer)
+                if event.type == pygame.KEYDOWN and event.key in KEY_MAPPINGS['QUIT']:
+                    self.current_screen = GameScreen.DIFFICULTY_SELECT
+                return True
             
             elif event.type == pygame.MOUSEBUTTONDOWN:
-                if self.current_screen == GameScreen.MAIN_MENU:
-                    return self.handle_main_menu(event, renderer)
-                elif self.current_screen == GameScreen.DIFFICULTY_SELECT:
-                    return self.handle_difficulty_select(event, renderer)
-                elif self.current_screen == GameScreen.GAME_PLAY:
-                    return self.handle_game_play(event, renderer)
-                elif self.current_screen == GameScreen.GAME_COMPLETE:
-                    return self.handle_game_complete(event, renderer)
-                elif self.current_screen == GameScreen.LEADERBOARD:
-                    return self.handle_leaderboard(event, renderer)
-                elif self.current_screen == GameScreen.CONFIRM_CLEAR:
-                    return self.handle_confirm_clear(event, renderer)
+                return self.click(event.pos, renderer)
             
             elif event.type == pygame.KEYDOWN:
                 if event.key in KEY_MAPPINGS['QUIT']:
@@ -70,161 +77,190 @@ class GameController:
         
         return True
     
-    def handle_main_menu(self, event, renderer) -> bool:
-        """处理主菜单事件（仅支持鼠标操作）"""
-        if event.type == pygame.MOUSEBUTTONDOWN and renderer:
-            numbers_button, images_button, leaderboard_button, language_button = renderer.draw_main_menu()
-            
-            if numbers_button.collidepoint(event.pos):
-                self.selected_mode = 'NUMBERS'
-                self.current_screen = GameScreen.DIFFICULTY_SELECT
-            elif images_button.collidepoint(event.pos):
-                self.selected_mode = 'IMAGES'
-                self.current_screen = GameScreen.DIFFICULTY_SELECT
-            elif leaderboard_button.collidepoint(event.pos):
-                # 点击排行榜按钮
-                self.current_screen = GameScreen.LEADERBOARD
-            elif language_button.collidepoint(event.pos):
-                # 点击语言切换按钮
-                switch_language()
+    def click(self, pos, renderer=None) -> bool:
+        """处理一次鼠标点击（无界面模拟时直接调用）"""
+        handlers = {
+            GameScreen.MAIN_MENU: self.handle_main_menu,
+            GameScreen.DIFFICULTY_SELECT: self.handle_difficulty_select,
+            GameScreen.IMAGE_SELECT: self.handle_image_selection,
+            GameScreen.GAME_PLAY: self.handle_game_play,
+            GameScreen.GAME_COMPLETE: self.handle_game_complete,
+            GameScreen.LEADERBOARD: self.handle_leaderboard,
+            GameScreen.CONFIRM_CLEAR: self.handle_confirm_clear,
+        }
+        return handlers[self.current_screen](pos, renderer)
+    
+    def hit_test(self, pos, *args):
+        """在当前界面的按钮命中表中查找点击位置对应的动作（按钮矩形按界面状态缓存）"""
+        return self.layout.button_map(self.current_screen.value, *args).hit(pos)
+    
+    def handle_main_menu(self, pos, renderer=None) -> bool:
+        """处理主菜单点击（仅支持鼠标操作）"""
+        action = self.hit_test(pos)
+        
+        if action in GAME_MODES:
+            self.selected_mode = action
+            self.current_screen = GameScreen.DIFFICULTY_SELECT
+            if action == 'IMAGES' and renderer:
+                # 选择难度期间在后台解码图片
+                renderer.images.prefetch()
+        elif action == 'LEADERBOARD':
+            # 点击排行榜按钮
+            self.current_screen = GameScreen.LEADERBOARD
+        elif action == 'LANGUAGE':
+            # 点击语言切换按钮
+            switch_language()
         
         return True
     
-    def handle_difficulty_select(self, event, renderer) -> bool:
-        """处理难度选择事件"""
-        if event.type == pygame.MOUSEBUTTONDOWN and renderer:
-            buttons = renderer.draw_difficulty_menu(self.selected_mode)
-            
-            for button, action in buttons:
-                if button.collidepoint(event.pos):
-                    if action == 'SELECT_IMAGE':
-                        # 图片模式下的选择特定图片按钮
-                        self.current_screen = GameScreen.IMAGE_SELECT
-                    elif action == 'BACK':
-                        # 返回按钮
-                        self.current_screen = GameScreen.MAIN_MENU
-                    elif action in DIFFICULTY_LEVELS:
-                        # 正常的难度选择
-                        self.start_new_game(action, renderer)
-                        self.current_screen = GameScreen.GAME_PLAY
-                    break
+    def handle_difficulty_select(self, pos, renderer=None) -> bool:
+        """处理难度选择点击"""
+        action = self.hit_test(pos, self.selected_mode)
         
-        elif event.type == pygame.KEYDOWN:
-            if event.key in KEY_MAPPINGS['QUIT']:
-                self.current_screen = GameScreen.MAIN_MENU
+        if action == 'SELECT_IMAGE':
+            # 图片模式下的选择特定图片按钮（在后台解码，选择界面先显示占位框）
+            self.current_screen = GameScreen.IMAGE_SELECT
+            if renderer:
+                renderer.images.prefetch()
+        elif action == 'BACK':
+            # 返回按钮
+            self.current_screen = GameScreen.MAIN_MENU
+        elif action in DIFFICULTY_LEVELS:
+            # 正常的难度选择
+            self.start_new_game(action, renderer)
+            self.current_screen = GameScreen.GAME_PLAY
         
         return True
     
-    def handle_image_selection(self, event, renderer) -> bool:
-        """处理图片选择事件"""
-        if event.type == pygame.MOUSEBUTTONDOWN and renderer:
-            random_button, image_buttons, back_button = renderer.draw_image_selection_menu(renderer.images)
-            
+    def handle_image_selection(self, pos, renderer=None) -> bool:
+        """处理图片选择点击"""
+        image_keys = tuple(renderer.images) if renderer else ()
+        action = self.hit_test(pos, image_keys)
+        
+        if action == 'RANDOM':
             # 随机选择按钮
-            if random_button.collidepoint(event.pos):
-                self.selected_image = None  # 表示随机选择
-                self.current_screen = GameScreen.DIFFICULTY_SELECT  # 返回难度选择界面
-            
+            self.selected_image = None  # 表示随机选择
+            self.current_screen = GameScreen.DIFFICULTY_SELECT  # 返回难度选择界面
+        elif isinstance(action, tuple):
             # 具体图片选择
-            for button_rect, image_key in image_buttons:
-                if button_rect.collidepoint(event.pos):
-                    self.selected_image = image_key
-                    self.current_screen = GameScreen.DIFFICULTY_SELECT  # 返回难度选择界面
-                    break
-            
+            self.selected_image = action[1]
+            self.current_screen = GameScreen.DIFFICULTY_SELECT  # 返回难度选择界面
+        elif action == 'BACK':
             # 返回按钮
-            if back_button.collidepoint(event.pos):
-                self.current_screen = GameScreen.DIFFICULTY_SELECT
-        
-        elif event.type == pygame.KEYDOWN:
-            if event.key in KEY_MAPPINGS['QUIT']:
-                self.current_screen = GameScreen.DIFFICULTY_SELECT
+            self.current_screen = GameScreen.DIFFICULTY_SELECT
         
         return True
     
-    def handle_game_play(self, event, renderer) -> bool:
-        """处理游戏进行中的事件（仅支持鼠标操作）"""
-        if event.type == pygame.MOUSEBUTTONDOWN:
-            # 处理鼠标点击
-            restart_button, menu_button = renderer.draw_game_screen(self.game_state)
-            
-            if restart_button.collidepoint(event.pos):
-                self.restart_current_game(renderer)
-            elif menu_button.collidepoint(event.pos):
-                self.current_screen = GameScreen.MAIN_MENU
-            else:
-                # 处理游戏板点击
-                tile_pos = renderer.get_tile_position(event.pos, self.game_state)
-                if tile_pos != (-1, -1):
-                    row, col = tile_pos
-                    if self.game_state.move_tile(row, col):
-                        # 检查是否完成游戏
-                        if self.game_state.is_solved:
-                            self.prepare_game_completion()
+    def handle_game_play(self, pos, renderer=None) -> bool:
+        """处理游戏进行中的点击（仅支持鼠标操作）"""
+        action = self.hit_test(pos)
+        
+        if action == 'RESTART':
+            self.restart_current_game(renderer)
+        elif action == 'MENU':
+            self.animator.reset()
+            self.current_screen = GameScreen.MAIN_MENU
+        else:
+            # 处理游戏板点击
+            tile_pos = self.layout.tile_at(pos, self.game_state.size)
+            if tile_pos != (-1, -1):
+                if self.animator.is_active():
+                    # 滑动动画期间的点击排队，动画结束后依次执行
+                    self.animator.queue_move(tile_pos)
+                else:
+                    self.apply_move(tile_pos, renderer)
         
         return True
     
-    def handle_game_complete(self, event, renderer) -> bool:
-        """处理游戏完成事件 - 移除自动倒计时，改为纯手动确认"""
-        if event.type == pygame.MOUSEBUTTONDOWN and renderer:
-            # 绘制完成界面（不显示倒计时）
-            ok_button = renderer.draw_game_complete(self.game_state, None)
-            if ok_button.collidepoint(event.pos):
-                # 点击确定按钮，添加到排行榜并跳转
-                if self.pending_completion_entry:
-                    self.leaderboard.add_entry(self.pending_completion_entry)
-                    self.pending_completion_entry = None
-                self.current_screen = GameScreen.LEADERBOARD
-                return True
+    def apply_move(self, tile_pos, renderer=None) -> bool:
+        """移动方块；有渲染器时播放滑动动画，完成界面在最后一次滑动结束后显示"""
+        row, col = tile_pos
+        number = self.game_state.board[row][col]
+        empty_pos = self.game_state.empty_pos
+        if not self.game_state.move_tile(row, col):
+            return False
+        if renderer and self.animator.enabled:
+            self.animator.start(number, tile_pos, empty_pos)
+        # 检查是否完成游戏
+        if self.game_state.is_solved:
+            self.animator.queued_moves.clear()
+            if not self.animator.is_active():
+                self.prepare_game_completion()
+        return True
+    
+    def update_animation(self, renderer=None):
+        """推进滑动动画；一次滑动结束后执行排队的点击（无效的点击跳过），棋盘已完成时进入完成界面"""
+        if self.animator.advance() is not None:
+            return
+        while not self.animator.is_active():
+            if self.game_state.is_solved:
+                self.prepare_game_completion()
+                return
+            tile_pos = self.animator.next_move()
+            if tile_pos is None:
+                return
+            self.apply_move(tile_pos, renderer)
+        self.animator.advance()
+    
+    def handle_game_complete(self, pos, renderer=None) -> bool:
+        """处理游戏完成点击 - 移除自动倒计时，改为纯手动确认"""
+        if self.hit_test(pos) == 'OK':
+            # 点击确定按钮，添加到排行榜并跳转
+            if self.pending_completion_entry:
+                self.leaderboard.add_entry(self.pending_completion_entry)
+                self.pending_completion_entry = None
+            self.current_screen = GameScreen.LEADERBOARD
         
         return True
     
-    def handle_leaderboard(self, event, renderer) -> bool:
-        """处理排行榜事件（支持难度筛选）"""
-        if event.type == pygame.MOUSEBUTTONDOWN and renderer:
-            back_button, clear_button, easy_button, medium_button = renderer.draw_leaderboard(
-                self.leaderboard.get_entries_by_difficulty_and_mode(
-                    self.leaderboard_filter_difficulty, 
-                    self.game_state.current_mode
-                ),
-                self.game_state,
-                self.leaderboard_filter_difficulty
-            )
-            
-            if back_button.collidepoint(event.pos):
-                self.current_screen = GameScreen.MAIN_MENU
-            elif clear_button.collidepoint(event.pos):
-                # 点击清空按钮，跳转到确认界面
-                self.current_screen = GameScreen.CONFIRM_CLEAR
-            elif easy_button.collidepoint(event.pos):
-                # 选择简单难度排行榜
-                self.leaderboard_filter_difficulty = 'EASY'
-            elif medium_button.collidepoint(event.pos):
-                # 选择中等难度排行榜
-                self.leaderboard_filter_difficulty = 'MEDIUM'
+    def handle_leaderboard(self, pos, renderer=None) -> bool:
+        """处理排行榜点击（支持难度筛选）"""
+        action = self.hit_test(pos)
+        
+        if action == 'BACK':
+            self.current_screen = GameScreen.MAIN_MENU
+        elif action == 'CLEAR':
+            # 点击清空按钮，跳转到确认界面
+            self.current_screen = GameScreen.CONFIRM_CLEAR
+        elif action in ('EASY', 'MEDIUM'):
+            # 选择对应难度的排行榜
+            self.leaderboard_filter_difficulty = action
         
         return True
     
-    def handle_confirm_clear(self, event, renderer) -> bool:
-        """处理确认清空排行榜事件"""
-        if event.type == pygame.MOUSEBUTTONDOWN and renderer:
-            yes_button, no_button = renderer.draw_confirm_clear()
-            
-            if yes_button.collidepoint(event.pos):
-                # 确认清空
-                self.leaderboard.clear_leaderboard()
-                self.current_screen = GameScreen.LEADERBOARD
-            elif no_button.collidepoint(event.pos):
-                # 取消清空
-                self.current_screen = GameScreen.LEADERBOARD
+    def handle_confirm_clear(self, pos, renderer=None) -> bool:
+        """处理确认清空排行榜点击"""
+        action = self.hit_test(pos)
+        
+        if action == 'YES':
+            # 确认清空
+            self.leaderboard.clear_leaderboard()
+            self.current_screen = GameScreen.LEADERBOARD
+        elif action == 'NO':
+            # 取消清空
+            self.current_screen = GameScreen.LEADERBOARD
         
         return True
     
-    def start_new_game(self, difficulty: str, renderer=None):
-        """开始新游戏"""
+    def deal_board(self, difficulty: str, mode: str):
+        """发牌：优先从分级题库O(1)抽题，没有题库时随机生成"""
         size = DIFFICULTY_LEVELS[difficulty]['size']
-        self.game_state.initialize_board(size, self.selected_mode)
+        graded = draw_graded_board(difficulty)
+        if graded:
+            numbers, optimal_moves = graded
+            self.game_state.load_board(size, numbers, mode, optimal_moves)
+        else:
+            self.game_state.initialize_board(size, mode)
         self.game_state.current_difficulty = difficulty
+        self.game_serial += 1
+        self.animator.reset()
+    
+    def start_new_game(self, difficulty: str, renderer=None):
+        """开始新游戏"""
+        self.deal_board(difficulty, self.selected_mode)
+        
+        if renderer:
+            renderer.prepare_tile_sprites(self.game_state.size)
         
         # 如果是图片模式，准备拼图图片
         if self.selected_mode == 'IMAGES' and renderer:
@@ -234,7 +270,7 @@ class GameController:
     def restart_current_game(self, renderer=None):
         """重新开始当前游戏"""
         if self.game_state.size > 0:
-            self.game_state.restart_game()
+            self.deal_board(self.game_state.current_difficulty, self.game_state.current_mode)
             # 如果是图片模式，重新准备拼图图片
             if self.game_state.current_mode == 'IMAGES' and renderer:
                 renderer.sliced_images = {}
@@ -256,7 +292,8 @@ class GameController:
             moves=self.game_state.stats.moves,
             difficulty=self.game_state.current_difficulty,
             game_mode=self.game_state.current_mode,
-            timestamp=time.time()
+            timestamp=time.time(),
+            optimal_moves=self.game_state.optimal_moves
         )
         
         self.current_screen = GameScreen.GAME_COMPLETE
@@ -265,28 +302,69 @@ class GameController:
         """获取玩家姓名（简化版本，实际应用中可能需要弹出输入框）"""
         return "Player" if LANGUAGE == "EN" else "玩家"
     
+    def frame_key(self) -> tuple:
+        """当前画面的标识：与上一帧相同时画面内容不变（游戏界面只需增量刷新）"""
+        return (self.current_screen, get_text('game_title'), self.selected_mode,
+                self.game_state.current_mode, self.leaderboard_filter_difficulty, self.game_serial)
+    
+    def is_animating(self) -> bool:
+        """是否有需要逐帧推进的动画（方块滑动中）"""
+        return self.animator.is_active()
+
+    def next_frame_timeout(self) -> int:
+        """主循环等待事件的超时（毫秒）：0表示按全帧率刷新；计时中等到计时显示的下一整秒"""
+        if self.is_animating():
+            return 0
+        if self.current_screen == GameScreen.IMAGE_SELECT and self.images_loading:
+            return IMAGE_POLL_MS
+        stats = self.game_state.stats
+        if self.current_screen == GameScreen.GAME_PLAY and stats and stats.is_active:
+            # 多等1毫秒，确保醒来时显示的秒数已经进位
+            return 1000 - int(stats.get_elapsed_time() * 1000) % 1000 + 1
+        return IDLE_TIMEOUT_MS
+
     def render_current_screen(self, renderer):
-        """渲染当前屏幕"""
-        if self.current_screen == GameScreen.MAIN_MENU:
+        """渲染当前屏幕：画面切换时整屏重绘，游戏进行中只重绘变化的方块与信息栏"""
+        animating = self.animator.is_active()
+        if animating:
+            # 推进动画（可能执行排队的点击或进入完成界面），并统计本帧绘制耗时
+            self.update_animation(renderer)
+            draw_start = time.perf_counter()
+        slide = self.animator.slide
+        
+        if not renderer.begin_frame(self.frame_key()):
+            if self.current_screen == GameScreen.GAME_PLAY:
+                renderer.refresh_game_screen(self.game_state, slide)
+        elif self.current_screen == GameScreen.MAIN_MENU:
             renderer.draw_main_menu()
         elif self.current_screen == GameScreen.DIFFICULTY_SELECT:
             renderer.draw_difficulty_menu(self.selected_mode)
         elif self.current_screen == GameScreen.IMAGE_SELECT:
             renderer.draw_image_selection_menu(renderer.images)
+            self.images_loading = renderer.images.loading()
+            if self.images_loading:
+                # 解码完成后需要整屏重绘以替换占位框
+                renderer.invalidate()
         elif self.current_screen == GameScreen.GAME_PLAY:
-            renderer.draw_game_screen(self.game_state)
+            renderer.draw_game_screen(self.game_state, slide)
         elif self.current_screen == GameScreen.GAME_COMPLETE:
+            # 半透明完成框叠加在最终棋盘上
+            renderer.draw_game_screen(self.game_state)
             renderer.draw_game_complete(self.game_state, None)
-        elif self.current_screen == GameScreen.LEADERBOARD:
+        elif self.current_screen in (GameScreen.LEADERBOARD, GameScreen.CONFIRM_CLEAR):
             entries = self.leaderboard.get_entries_by_difficulty_and_mode(
                 self.leaderboard_filter_difficulty,
-                self.game_state.current_mode
+                self.game_state.current_mode,
+                limit=10  # 排行榜界面显示前10名
             )
             renderer.draw_leaderboard(entries, self.game_state, self.leaderboard_filter_difficulty)
-        elif self.current_screen == GameScreen.CONFIRM_CLEAR:
-            renderer.draw_confirm_clear()
+            if self.current_screen == GameScreen.CONFIRM_CLEAR:
+                # 确认框叠加在排行榜上
+                renderer.draw_confirm_clear()
         
         renderer.update_display()
+        if animating:
+            self.animator.record_draw((time.perf_counter() - draw_start) * 1000)
     
     def update_game_logic(self, dt: float):
         """更新游戏逻辑"""
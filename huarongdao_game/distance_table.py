@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+"""
+华容道3x3完整状态距离表
+从目标状态反向BFS遍历全部181,440个可解状态，按排列排名存储最优步数，查询为O(1)；
+也可以在指定步数区间内的全部状态中均匀抽取棋盘
+"""
+
+import mmap
+import os
+import random
+from array import array
+from collections import deque
+from math import factorial
+from typing import List, Optional, Sequence, Tuple
+import config
+from solvability import is_solvable
+
+SIZE = 3
+CELLS = SIZE * SIZE
+# 数字排列（不含空格）的可解半数：8!/2
+HALF_PERMUTATIONS = factorial(CELLS - 1) // 2
+STATE_COUNT = CELLS * HALF_PERMUTATIONS  # 181,440
+UNREACHED = 255
+
+# 已加载的距离表（None表示文件不存在）
+_loaded = {}
+
+
+def table_path() -> str:
+    """获取距离表文件路径"""
+    return os.path.join(config.DATA_DIR, f"distance_table_{SIZE}x{SIZE}.bin")
+
+
+def rank_permutation(perm: Sequence[int]) -> int:
+    """计算排列的字典序排名（Lehmer编码）"""
+    n = len(perm)
+    rank = 0
+    for i in range(n - 1):
+        smaller = 0
+        for j in range(i + 1, n):
+            if perm[j] < perm[i]:
+                smaller += 1
+        rank = rank * (n - i) + smaller
+    return rank
+
+
+def unrank_permutation(rank: int, n: int) -> List[int]:
+    """根据字典序排名还原0..n-1的排列"""
+    digits = []
+    for base in range(1, n + 1):
+        rank, digit = divmod(rank, base)
+        digits.append(digit)
+    remaining = list(range(n))
+    return [remaining.pop(digit) for digit in reversed(digits)]
+
+
+def state_index(tiles: Sequence[int]) -> int:
+    """
+    计算可解状态的紧凑下标：空格位置 * 8!/2 + 数字排列排名 // 2
+    字典序排名相邻的2k与2k+1只差最后两个元素的交换、奇偶性相反，
+    而3x3可解当且仅当数字排列为偶排列，因此排名整除2即可一一对应
+    """
+    blank = tiles.index(0)
+    numbers = [tile - 1 for tile in tiles if tile]
+    return blank * HALF_PERMUTATIONS + rank_permutation(numbers) // 2
+
+
+def state_tiles(index: int) -> List[int]:
+    """state_index的逆运算：还原空格位置与数字排列（排名2k与2k+1中为偶排列的那个）"""
+    blank, half_rank = divmod(index, HALF_PERMUTATIONS)
+    for rank in (half_rank * 2, half_rank * 2 + 1):
+        tiles = [num + 1 for num in unrank_permutation(rank, CELLS - 1)]
+        tiles.insert(blank, 0)
+        if is_solvable(tiles, SIZE):
+            return tiles
+    raise ValueError(f"状态下标超出范围: {index}")
+
+
+def build_table() -> bytearray:
+    """从目标状态反向BFS，生成完整距离表"""
+    distances = bytearray([UNREACHED]) * STATE_COUNT
+    goal = tuple(range(1, CELLS)) + (0,)
+    distances[state_index(goal)] = 0
+    neighbors = []
+    for pos in range(CELLS):
+        row, col = divmod(pos, SIZE)
+        neighbors.append([row2 * SIZE + col2 for row2, col2 in
+                          ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1))
+                          if 0 <= row2 < SIZE and 0 <= col2 < SIZE])
+
+    queue = deque([(goal, CELLS - 1, 0)])
+    while queue:
+        tiles, blank, distance = queue.popleft()
+        for pos in neighbors[blank]:
+            moved = list(tiles)
+            moved[blank], moved[pos] = moved[pos], 0
+            index = state_index(moved)
+            if distances[index] == UNREACHED:
+                distances[index] = distance + 1
+                queue.append((tuple(moved), pos, distance + 1))
+    return distances
+
+
+def write_table(path: str = None) -> str:
+    """生成距离表并写入文件（原子替换）"""
+    path = path or table_path()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(build_table())
+    os.replace(temp_path, path)
+    _loaded.pop(path, None)
+    return path
+
+
+class DistanceTable:
+    """3x3距离表（mmap只读加载）"""
+
+    def __init__(self, path: str = None):
+        path = path or table_path()
+        with open(path, 'rb') as f:
+            self._mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mapped) != STATE_COUNT:
+            self._mapped.close()
+            raise ValueError(f"距离表文件长度不正确: {path}")
+        self._max_distance: Optional[int] = None
+        self._states: Optional[List[array]] = None  # 各步数的状态下标（首次抽取时建立）
+
+    @property
+    def max_distance(self) -> int:
+        """表中最大的最优步数（3x3为31，首次访问时计算）"""
+        if self._max_distance is None:
+            self._max_distance = max(self._mapped[:])
+        return self._max_distance
+
+    def states_at(self, distance: int) -> Sequence[int]:
+        """最优步数为distance的全部状态下标（首次调用时遍历一遍距离表，约0.7MB）"""
+        if self._states is None:
+            states = [array('I') for _ in range(self.max_distance + 1)]
+            for index, value in enumerate(self._mapped[:]):
+                states[value].append(index)
+            self._states = states
+        if 0 <= distance < len(self._states):
+            return self._states[distance]
+        return ()
+
+    def random_state(self, min_moves: int, max_moves: int,
+                     rng: random.Random = None) -> Optional[Tuple[List[int], int]]:
+        """
+        在最优步数位于[min_moves, max_moves]的全部状态中均匀抽取一个，返回(一维数字排列, 最优步数)；
+        区间内没有状态时返回None
+        """
+        distances = range(max(min_moves, 0), min(max_moves, self.max_distance) + 1)
+        total = sum(len(self.states_at(distance)) for distance in distances)
+        if total == 0:
+            return None
+        pick = (rng or random).randrange(total)
+        for distance in distances:
+            states = self.states_at(distance)
+            if pick < len(states):
+                return state_tiles(states[pick]), distance
+            pick -= len(states)
+
+    def close(self):
+        """释放mmap映射"""
+        self._mapped.close()
+
+    def distance(self, board: List[List[int]]) -> int:
+        """查询棋盘的最优步数"""
+        return self.distance_of([num for row in board for num in row])
+
+    def distance_of(self, tiles: Sequence[int]) -> int:
+        """查询一维数字排列的最优步数"""
+        return self._mapped[state_index(tiles)]
+
+    def distance_at(self, index: int) -> int:
+        """按状态下标查询最优步数"""
+        return self._mapped[index]
+
+    def best_move(self, board: List[List[int]]) -> Optional[Tuple[int, int]]:
+        """获取提示：返回沿最优路径应移动的方块位置(row, col)，已完成时返回None"""
+        tiles = [num for row in board for num in row]
+        current = self._mapped[state_index(tiles)]
+        if current == 0:
+            return None
+        blank = tiles.index(0)
+        row, col = divmod(blank, SIZE)
+        for row2, col2 in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)):
+            if 0 <= row2 < SIZE and 0 <= col2 < SIZE:
+                pos = row2 * SIZE + col2
+                tiles[blank], tiles[pos] = tiles[pos], 0
+                if self._mapped[state_index(tiles)] == current - 1:
+                    return (row2, col2)
+                tiles[pos], tiles[blank] = tiles[blank], 0
+        return None
+
+
+def get_distance_table(path: str = None) -> Optional[DistanceTable]:
+    """获取距离表，文件不存在时返回None"""
+    path = path or table_path()
+    if path not in _loaded:
+        try:
+            _loaded[path] = DistanceTable(path)
+        except FileNotFoundError:
+            _loaded[path] = None
+    return _loaded[path]
+
+
+if __name__ == "__main__":
+    print(f"已生成: {write_table()}")
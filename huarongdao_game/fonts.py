@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+华容道字体加载
+优先使用FONTS_DIR中自带的字体；否则探测系统中文字体（可能需要枚举系统字体），
+结果连同各字体目录的修改时间保存在磁盘索引中，字体目录未变化时直接读取；
+各字号的Font对象在第一次使用时才创建，同一(路径, 字号)全局只创建一个
+"""
+
+import json
+import os
+import sys
+from collections.abc import Mapping
+from typing import Dict, List, Optional, Tuple
+import pygame
+import config
+from log import get_logger
+
+logger = get_logger('fonts')
+
+# Windows下的微软雅黑
+WINDOWS_CJK_FONT = r"C:\Windows\Fonts\msyh.ttc"
+# 按优先级排列的中文字体名称（pygame.font.match_font使用的小写无空格形式）
+CJK_FONT_NAMES = ['microsoftyahei', 'msyh', 'notosanscjksc', 'notosanscjk', 'notosanssc', 'sourcehansanssc',
+                  'wenquanyimicrohei', 'wenquanyizenhei', 'pingfangsc', 'heitisc', 'simhei', 'simsun',
+                  'droidsansfallback', 'arplumingcn']
+
+
+FONT_EXTENSIONS = ('.ttf', '.ttc', '.otf')
+
+# (路径, 字号) -> Font，所有LazyFonts共用
+_fonts: Dict[Tuple[Optional[str], int], pygame.font.Font] = {}
+
+
+def system_font_dirs() -> List[str]:
+    """当前平台的系统字体目录"""
+    home = os.path.expanduser('~')
+    if sys.platform.startswith('win'):
+        return [os.path.join(os.environ.get('WINDIR', r'C:\Windows'), 'Fonts'),
+                os.path.join(os.environ.get('LOCALAPPDATA', home), 'Microsoft', 'Windows', 'Fonts')]
+    if sys.platform == 'darwin':
+        return ['/System/Library/Fonts', '/Library/Fonts', os.path.join(home, 'Library', 'Fonts')]
+    return ['/usr/share/fonts', '/usr/local/share/fonts',
+            os.path.join(home, '.local', 'share', 'fonts'), os.path.join(home, '.fonts')]
+
+
+def font_dirs_signature(directories: Optional[List[str]] = None) -> Dict[str, Optional[float]]:
+    """各字体目录及其一级子目录的修改时间（安装或删除字体后会变化），不存在的目录记为None"""
+    signature = {}
+    for directory in directories if directories is not None else [config.FONTS_DIR] + system_font_dirs():
+        try:
+            signature[directory] = os.stat(directory).st_mtime
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        signature[entry.path] = entry.stat().st_mtime
+        except OSError:
+            signature[directory] = None
+    return signature
+
+
+def bundled_font(fonts_dir: Optional[str] = None) -> Optional[str]:
+    """FONTS_DIR中自带的字体文件（按文件名排序取第一个）"""
+    fonts_dir = fonts_dir or config.FONTS_DIR
+    try:
+        names = sorted(name for name in os.listdir(fonts_dir) if name.lower().endswith(FONT_EXTENSIONS))
+    except OSError:
+        return None
+    return os.path.join(fonts_dir, names[0]) if names else None
+
+
+def probe_cjk_font() -> Optional[str]:
+    """探测可显示中文的字体路径，找不到时返回None（可能枚举系统字体，较慢）"""
+    path = bundled_font()
+    if path:
+        return path
+    if os.path.exists(WINDOWS_CJK_FONT):
+        return WINDOWS_CJK_FONT
+    return pygame.font.match_font(CJK_FONT_NAMES)
+
+
+def resolve_cjk_font(index_file: Optional[str] = None) -> Optional[str]:
+    """
+    从字体索引读取中文字体路径；索引不存在、字体目录有变化（修改时间不同）
+    或记录的文件已不存在时重新探测并写入索引
+    """
+    index_file = index_file or config.FONT_INDEX_FILE
+    signature = font_dirs_signature()
+    try:
+        with open(index_file, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        path = index['path']
+        if index['signature'] == signature and (path is None or os.path.exists(path)):
+            return path
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    path = probe_cjk_font()
+    try:
+        with open(index_file, 'w', encoding='utf-8') as f:
+            json.dump({'signature': signature, 'path': path}, f, ensure_ascii=False)
+    except OSError as e:
+        logger.warning("无法写入字体索引 %s: %s", index_file, e)
+    return path
+
+
+def get_font(path: Optional[str], size: int) -> pygame.font.Font:
+    """获取(路径, 字号)对应的Font（全局共用一个对象）；字体文件无法加载时退回pygame默认字体"""
+    font = _fonts.get((path, size))
+    if font is None:
+        try:
+            font = pygame.font.Font(path, size)
+        except (OSError, pygame.error) as e:
+            logger.warning("字体加载失败 %s: %s", path, e)
+            font = get_font(None, size) if path is not None else pygame.font.Font(None, size)
+        _fonts[(path, size)] = font
+    return font
+
+
+class LazyFonts(Mapping):
+    """按名称（small/medium/large/title）取字体，第一次使用某个字号时才创建Font"""
+
+    def __init__(self, path: Optional[str]):
+        self.path = path  # None时使用pygame默认字体
+        self._fonts: Dict[str, pygame.font.Font] = {}
+
+    def __getitem__(self, name: str) -> pygame.font.Font:
+        font = self._fonts.get(name)
+        if font is None:
+            font = self._fonts[name] = get_font(self.path, config.FONT_SIZES[name.upper()])
+        return font
+
+    def __iter__(self):
+        return (name.lower() for name in config.FONT_SIZES)
+
+    def __len__(self) -> int:
+        return len(config.FONT_SIZES)
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+华容道批量棋盘生成
+使用NumPy向量化生成大量均匀分布的可解棋盘，用于每日挑战题库和压力测试
+"""
+
+import os
+from typing import Iterator, Optional
+import numpy as np
+
+# uint8可容纳的最大数字为255，对应最大16x16棋盘
+MAX_BATCH_SIZE = 16
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+
+def _permutation_parity(targets: np.ndarray) -> np.ndarray:
+    """
+    向量化计算每行排列的奇偶性
+    逐位做选择排序，统计实际发生的对换次数，共cells步、每步O(行数)
+    """
+    rows = np.arange(len(targets))
+    perm = targets.astype(np.intp)
+    inverse = np.empty_like(perm)
+    inverse[rows[:, None], perm] = np.arange(perm.shape[1])
+    swaps = np.zeros(len(targets), dtype=np.intp)
+    for i in range(perm.shape[1]):
+        j = inverse[:, i].copy()  # 值i当前所在位置
+        value = perm[:, i].copy()
+        moved = j != i
+        perm[rows, j] = value
+        perm[:, i] = i
+        inverse[rows, value] = j
+        inverse[:, i] = i
+        swaps += moved
+    return swaps & 1
+
+
+def _solvable_chunk(size: int, count: int, rng: np.random.Generator) -> np.ndarray:
+    """生成一块可解棋盘：随机排列后，对不可解的行交换数字1和2"""
+    cells = size * size
+    boards = rng.permuted(np.tile(np.arange(cells, dtype=np.uint8), (count, 1)), axis=1)
+
+    # 每格数字的目标格子（空格目标为最后一格）
+    targets = np.where(boards == 0, cells - 1, boards.astype(np.intp) - 1)
+    blank = np.argmax(boards == 0, axis=1)
+    blank_distance = (size - 1 - blank // size) + (size - 1 - blank % size)
+    unsolvable = np.flatnonzero(_permutation_parity(targets) != (blank_distance & 1))
+
+    # 交换数字1和2在可解与不可解排列之间一一对应，保持均匀分布
+    first = np.argmax(boards[unsolvable] == 1, axis=1)
+    second = np.argmax(boards[unsolvable] == 2, axis=1)
+    boards[unsolvable, first] = 2
+    boards[unsolvable, second] = 1
+    return boards
+
+
+def iter_board_chunks(size: int, count: int, seed: Optional[int] = None,
+                      chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[np.ndarray]:
+    """按块生成可解棋盘，每块为(n, size*size)的uint8数组"""
+    if not 2 <= size <= MAX_BATCH_SIZE:
+        raise ValueError(f"批量生成仅支持2到{MAX_BATCH_SIZE}的尺寸: {size}")
+    rng = np.random.default_rng(seed)
+    remaining = count
+    while remaining > 0:
+        n = min(chunk_size, remaining)
+        yield _solvable_chunk(size, n, rng)
+        remaining -= n
+
+
+def generate_boards(size: int, count: int, seed: Optional[int] = None, path: str = None,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE) -> np.ndarray:
+    """
+    批量生成可解棋盘，返回(count, size*size)的uint8数组（0表示空格）
+    指定path时按块流式写入.npy文件，返回该文件的只读内存映射
+    """
+    chunks = iter_board_chunks(size, count, seed, chunk_size)
+    if path is None:
+        boards = np.empty((count, size * size), dtype=np.uint8)
+        start = 0
+        for chunk in chunks:
+            boards[start:start + len(chunk)] = chunk
+            start += len(chunk)
+        return boards
+
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        header = {'descr': np.lib.format.dtype_to_descr(np.dtype(np.uint8)),
+                  'fortran_order': False, 'shape': (count, size * size)}
+        np.lib.format.write_array_header_1_0(f, header)
+        for chunk in chunks:
+            f.write(chunk.tobytes())
+    os.replace(temp_path, path)
+    return np.load(path, mmap_mode='r')
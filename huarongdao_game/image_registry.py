@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+华容道图片注册表
+启动时只列出IMAGE_DIR/CUSTOM_IMAGE_DIR中的图片文件，不解码；
+第一次使用时在线程池中解码并缩小到最大棋盘尺寸，已解码的图片保存在有界LRU中
+"""
+
+import os
+from collections import OrderedDict
+from collections.abc import Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+import pygame
+import config
+from log import get_logger
+
+logger = get_logger('images')
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.gif', '.webp')
+
+
+def scale_surface(surface: pygame.Surface, size: Tuple[int, int]) -> pygame.Surface:
+    """平滑缩放（smoothscale仅支持24/32位图像，其他格式退回普通缩放）"""
+    try:
+        return pygame.transform.smoothscale(surface, size)
+    except ValueError:
+        return pygame.transform.scale(surface, size)
+
+
+def discover_images(directories: Iterable[str]) -> Dict[str, str]:
+    """列出目录中的图片文件：{图片键: 路径}（只读目录，不打开文件）"""
+    images = {}
+    seen = set()
+    for index, directory in enumerate(directories):
+        directory = os.path.abspath(directory)
+        if directory in seen or not os.path.isdir(directory):
+            continue
+        seen.add(directory)
+        prefix = '' if index == 0 else 'custom/'
+        for name in sorted(os.listdir(directory)):
+            if name.lower().endswith(IMAGE_EXTENSIONS):
+                images[prefix + name] = os.path.join(directory, name)
+    return images
+
+
+class ImageRegistry(Mapping):
+    """
+    按需解码的图片集合：键在创建时确定，registry[键]返回解码并缩小后的Surface
+    （尚未解码时阻塞等待）；prefetch提前在线程池中解码
+    """
+
+    def __init__(self, max_size: int, directories: Optional[Iterable[str]] = None,
+                 cache_size: Optional[int] = None, workers: Optional[int] = None):
+        self.max_size = max_size  # 解码后短边缩小到该尺寸（最大棋盘边长）
+        self.cache_size = cache_size or config.IMAGE_CACHE_SIZE
+        self.paths = discover_images(directories or (config.IMAGE_DIR, config.CUSTOM_IMAGE_DIR))
+        self._surfaces: 'OrderedDict[str, pygame.Surface]' = OrderedDict()
+        self._futures: Dict[str, Future] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._workers = workers or config.IMAGE_LOAD_WORKERS
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def __iter__(self):
+        return iter(self.paths)
+
+    def __contains__(self, key) -> bool:
+        return key in self.paths
+
+    def __getitem__(self, key: str) -> pygame.Surface:
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            return surface
+        if key not in self.paths:
+            raise KeyError(key)
+        future = self._futures.get(key) or self._submit(key)
+        try:
+            surface = future.result()
+        except (pygame.error, OSError) as e:
+            # 无法解码、已被删除或无法读取的文件从注册表中移除，之后不再出现在选择界面
+            logger.warning("无法加载图片 %s: %s", self.paths[key], e)
+            del self.paths[key]
+            raise KeyError(key) from e
+        finally:
+            self._futures.pop(key, None)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.cache_size:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def _submit(self, key: str) -> Future:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix='image-loader')
+        future = self._futures[key] = self._executor.submit(self._decode, self.paths[key])
+        return future
+
+    def _decode(self, path: str) -> pygame.Surface:
+        """在工作线程中解码，短边超过max_size时按比例缩小"""
+        image = pygame.image.load(path)
+        width, height = image.get_size()
+        scale = self.max_size / min(width, height)
+        if scale < 1:
+            image = scale_surface(image, (max(1, round(width * scale)), max(1, round(height * scale))))
+        return image
+
+    def prefetch(self, keys: Optional[Iterable[str]] = None):
+        """在线程池中开始解码（不等待）；已解码或正在解码的图片跳过"""
+        for key in list(keys if keys is not None else self.paths):
+            if key in self.paths and key not in self._surfaces and key not in self._futures:
+                self._submit(key)
+
+    def ensure_loaded(self, keys: Optional[Iterable[str]] = None) -> List[str]:
+        """并行解码并等待完成，返回成功解码的图片键"""
+        keys = list(keys if keys is not None else self.paths)
+        self.prefetch(keys)
+        loaded = []
+        for key in keys:
+            try:
+                self[key]
+            except KeyError:
+                continue
+            loaded.append(key)
+        return loaded
+
+    def peek(self, key: str) -> Optional[pygame.Surface]:
+        """
+        不阻塞地取图片：已解码时返回Surface；尚未解码完成时返回None（未开始时提交到线程池）；
+        无法解码或读取的图片从注册表移除并返回None
+        """
+        surface = self._surfaces.get(key)
+        if surface is not None or key not in self.paths:
+            return surface
+        future = self._futures.get(key) or self._submit(key)
+        if not future.done():
+            return None
+        try:
+            return self[key]
+        except KeyError:
+            return None
+
+    def loading(self) -> bool:
+        """是否还有已提交但尚未取出结果的解码任务"""
+        return bool(self._futures)
+
+    def is_loaded(self, key: str) -> bool:
+        """图片是否已解码并在缓存中"""
+        return key in self._surfaces
+
+    def close(self):
+        """停止线程池"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+"""
+华容道界面布局
+集中计算各界面按钮与游戏板的位置，供渲染器绘制和控制器点击检测共用；
+不依赖显示窗口，没有安装pygame时也可用于无界面模拟
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import config
+from config import WINDOW_WIDTH, WINDOW_HEIGHT
+
+try:
+    from pygame import Rect
+except ImportError:
+    class Rect:
+        """pygame.Rect的最小替代（仅用于无pygame环境下的点击检测）"""
+
+        def __init__(self, x: int, y: int, width: int, height: int):
+            self.x, self.y, self.width, self.height = x, y, width, height
+
+        @property
+        def center(self) -> Tuple[int, int]:
+            return (self.x + self.width // 2, self.y + self.height // 2)
+
+        def collidepoint(self, *pos) -> bool:
+            x, y = pos[0] if len(pos) == 1 else pos
+            return self.x <= x < self.x + self.width and self.y <= y < self.y + self.height
+
+# 游戏板按4x4标准尺寸布局，较小的棋盘居中显示
+STANDARD_SIZE = 4
+DIFFICULTY_BUTTONS = ['EASY', 'MEDIUM']
+
+
+class ButtonMap:
+    """一个界面的按钮命中表：按纵向分带索引，点击时只检查所在分带内的按钮"""
+
+    BAND_HEIGHT = 50
+
+    def __init__(self, buttons: Iterable[Tuple[Rect, object]]):
+        self.buttons = list(buttons)
+        self._bands: Dict[int, List[Tuple[Rect, object]]] = {}
+        for rect, action in self.buttons:
+            first = rect.y // self.BAND_HEIGHT
+            last = (rect.y + rect.height - 1) // self.BAND_HEIGHT
+            for band in range(first, last + 1):
+                self._bands.setdefault(band, []).append((rect, action))
+
+    def hit(self, pos: Tuple[int, int]) -> Optional[object]:
+        """返回点击位置所在按钮的动作，不在任何按钮上时返回None"""
+        for rect, action in self._bands.get(pos[1] // self.BAND_HEIGHT, ()):
+            if rect.collidepoint(pos):
+                return action
+        return None
+
+
+class Layout:
+    """界面布局（按窗口尺寸一次计算，各界面按钮矩形按需生成）"""
+
+    def __init__(self, width: int = WINDOW_WIDTH, height: int = WINDOW_HEIGHT):
+        self.width = width
+        self.height = height
+
+        # 信息显示区域高度（时间、步数等）
+        self.info_height = 120
+
+        # 边距设置
+        horizontal_padding = 20
+        vertical_padding = 15
+
+        # 可用空间计算
+        available_height = height - self.info_height - 2 * vertical_padding
+        available_width = width - 2 * horizontal_padding
+
+        # 计算拼图区域（基于4×4标准）
+        self.tile_size = min(available_width, available_height) // STANDARD_SIZE
+
+        # 居中放置游戏板
+        board_size = self.tile_size * STANDARD_SIZE
+        self.board_x = (width - board_size) // 2
+        self.board_y = self.info_height + vertical_padding + (available_height - board_size) // 2
+
+        # (界面, 语言, 界面参数) -> ButtonMap，按钮矩形每种界面状态只计算一次
+        self._button_maps: Dict[tuple, ButtonMap] = {}
+
+    def button_map(self, screen: str, *args) -> ButtonMap:
+        """获取界面的按钮命中表（screen为GameScreen的值，args为影响按钮的界面参数）"""
+        key = (screen, config.LANGUAGE) + args
+        buttons = self._button_maps.get(key)
+        if buttons is None:
+            buttons = self._button_maps[key] = ButtonMap(self._screen_buttons(screen, *args))
+        return buttons
+
+    def _screen_buttons(self, screen: str, *args) -> List[Tuple[Rect, object]]:
+        """各界面的[(按钮, 动作)]"""
+        if screen == 'main_menu':
+            return list(zip(self.main_menu(), ['NUMBERS', 'IMAGES', 'LEADERBOARD', 'LANGUAGE']))
+        if screen == 'difficulty_select':
+            return self.difficulty_menu(*args)
+        if screen == 'image_select':
+            random_button, image_buttons, back_button = self.image_selection(*args)
+            return ([(random_button, 'RANDOM')] + [(rect, ('IMAGE', key)) for rect, key in image_buttons]
+                    + [(back_button, 'BACK')])
+        if screen == 'game_play':
+            return list(zip(self.control_buttons(), ['RESTART', 'MENU']))
+        if screen == 'game_complete':
+            return [(self.completion_ok_button(), 'OK')]
+        if screen == 'leaderboard':
+            return list(zip(self.leaderboard(), ['BACK', 'CLEAR', 'EASY', 'MEDIUM']))
+        if screen == 'confirm_clear':
+            return list(zip(self.confirm_buttons(), ['YES', 'NO']))
+        raise ValueError(f"未知界面: {screen}")
+
+    def main_menu(self) -> Tuple[Rect, Rect, Rect, Rect]:
+        """主菜单：数字模式、图片模式、排行榜、语言切换按钮"""
+        mode_y = 150
+        button_width = self.width - 80
+        button_height = 50
+        button_x = 40
+        numbers_button = Rect(button_x, mode_y + 50, button_width, button_height)
+        images_button = Rect(button_x, mode_y + 120, button_width, button_height)
+        leaderboard_button = Rect(button_x, mode_y + 190, button_width, button_height)
+        language_button = Rect(self.width - 100 - 15, 25, 100, 30)
+        return numbers_button, images_button, leaderboard_button, language_button
+
+    def difficulty_menu(self, game_mode: str) -> List[Tuple[Rect, str]]:
+        """难度选择：[(按钮, 动作)]，动作为难度、SELECT_IMAGE或BACK"""
+        button_y = 180
+        button_width = self.width - 80
+        button_height = 55
+        button_x = 40
+        buttons = [(Rect(button_x, button_y + i * 70, button_width, button_height), difficulty)
+                   for i, difficulty in enumerate(DIFFICULTY_BUTTONS)]
+        # 图片模式下增加选择特定图片按钮
+        if game_mode == 'IMAGES':
+            buttons.append((Rect(button_x, button_y + 2 * 70, button_width, button_height), 'SELECT_IMAGE'))
+        buttons.append((Rect(20, self.height - 70, 100, 50), 'BACK'))
+        return buttons
+
+    def image_selection(self, image_keys: Sequence[str]) -> Tuple[Rect, List[Tuple[Rect, str]], Rect]:
+        """图片选择：随机按钮、[(预览区域, 图片键)]、返回按钮"""
+        random_button = Rect(self.width // 2 - 100, 150, 200, 50)
+        preview_y = 230
+        preview_width = 120
+        preview_height = 120
+        spacing = 20
+        images_per_row = 3
+        margin = (self.width - (images_per_row * preview_width + (images_per_row - 1) * spacing)) // 2
+        image_buttons = []
+        for i, key in enumerate(image_keys):
+            row, col = divmod(i, images_per_row)
+            x = margin + col * (preview_width + spacing)
+            y = preview_y + row * (preview_height + spacing + 30)
+            # 可点击区域包含下方标签
+            image_buttons.append((Rect(x, y, preview_width, preview_height + 30), key))
+        back_button = Rect(20, self.height - 70, 100, 50)
+        return random_button, image_buttons, back_button
+
+    def board_origin(self, size: int) -> Tuple[int, int]:
+        """size x size棋盘左上角坐标（不同大小的拼图居中显示）"""
+        offset = (STANDARD_SIZE - size) * self.tile_size // 2
+        return self.board_x + offset, self.board_y + offset
+
+    def board_background(self, padding: int = 8) -> Rect:
+        """游戏板背景区域"""
+        board_size = self.tile_size * STANDARD_SIZE
+        return Rect(self.board_x - padding, self.board_y - padding,
+                    board_size + 2 * padding, board_size + 2 * padding)
+
+    def tile_rect(self, size: int, row: int, col: int) -> Rect:
+        """方块区域"""
+        start_x, start_y = self.board_origin(size)
+        return Rect(start_x + col * self.tile_size, start_y + row * self.tile_size,
+                    self.tile_size, self.tile_size)
+
+    def tile_at(self, pos: Tuple[int, int], size: int) -> Tuple[int, int]:
+        """根据点击位置获取方块坐标，不在游戏板内时返回(-1, -1)"""
+        start_x, start_y = self.board_origin(size)
+        rel_x = pos[0] - start_x
+        rel_y = pos[1] - start_y
+        if 0 <= rel_x < size * self.tile_size and 0 <= rel_y < size * self.tile_size:
+            return (rel_y // self.tile_size, rel_x // self.tile_size)
+        return (-1, -1)
+
+    def control_buttons(self) -> Tuple[Rect, Rect]:
+        """游戏界面底部：重新开始、主菜单按钮"""
+        button_width = (self.width - 60) // 2
+        button_height = 45
+        bottom_y = self.height - button_height - 20
+        restart_button = Rect(20, bottom_y, button_width, button_height)
+        menu_button = Rect(self.width - button_width - 20, bottom_y, button_width, button_height)
+        return restart_button, menu_button
+
+    def completion_box(self) -> Rect:
+        """游戏完成信息框"""
+        box_height = 250
+        return Rect(30, (self.height - box_height) // 2, self.width - 60, box_height)
+
+    def completion_ok_button(self) -> Rect:
+        """游戏完成界面的确定按钮"""
+        return Rect(self.width // 2 - 60, self.completion_box().y + 170, 120, 40)
+
+    def leaderboard(self) -> Tuple[Rect, Rect, Rect, Rect]:
+        """排行榜：返回、清空、简单难度筛选、中等难度筛选按钮"""
+        filter_button_width = 80
+        filter_y = 90 + 40
+        easy_button = Rect(self.width // 2 - filter_button_width - 10, filter_y, filter_button_width, 30)
+        medium_button = Rect(self.width // 2 + 10, filter_y, filter_button_width, 30)
+        button_y = self.height - 80
+        back_button = Rect(30, button_y, 120, 50)
+        clear_button = Rect(self.width - 120 - 30, button_y, 120, 50)
+        return back_button, clear_button, easy_button, medium_button
+
+    def confirm_box(self) -> Rect:
+        """确认清空对话框"""
+        box_width = 320
+        box_height = 180
+        return Rect((self.width - box_width) // 2, (self.height - box_height) // 2, box_width, box_height)
+
+    def confirm_buttons(self) -> Tuple[Rect, Rect]:
+        """确认清空对话框：确定、取消按钮"""
+        box = self.confirm_box()
+        button_y = box.y + 130
+        button_width = 100
+        yes_button = Rect(box.x + 40, button_y, button_width, 35)
+        no_button = Rect(box.x + box.width - button_width - 40, button_y, button_width, 35)
+        return yes_button, no_button
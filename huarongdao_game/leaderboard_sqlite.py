@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+"""
+华容道SQLite排行榜
+保留全部历史成绩（不受MAX_LEADERBOARD_ENTRIES限制，该值只限制单次查询返回的条数），
+(难度, 模式, 用时, 步数)复合索引使排名查询只需顺序读取索引的前N项；
+WAL模式、复用单个连接，SQL语句为固定字符串，由sqlite3的语句缓存复用预编译结果
+"""
+
+import sqlite3
+import threading
+from typing import Iterable, List, Optional
+import config
+from models import LeaderboardEntry
+
+COLUMNS = ('player_name', 'time_seconds', 'moves', 'difficulty', 'game_mode', 'timestamp', 'optimal_moves')
+
+CREATE_TABLE = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    player_name TEXT NOT NULL,
+    time_seconds REAL NOT NULL,
+    moves INTEGER NOT NULL,
+    difficulty TEXT NOT NULL,
+    game_mode TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    optimal_moves INTEGER
+)"""
+# 索引隐含rowid（id）为最后一列，成绩相同时按插入顺序排列也能直接走索引
+CREATE_INDEX = """
+CREATE INDEX IF NOT EXISTS entries_rank ON entries (difficulty, game_mode, time_seconds, moves)"""
+INSERT = f"INSERT INTO entries ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})"
+SELECT_TOP = (f"SELECT {', '.join(COLUMNS)} FROM entries WHERE difficulty = ? AND game_mode = ? "
+              f"ORDER BY time_seconds, moves, id LIMIT ?")
+SELECT_ALL = f"SELECT {', '.join(COLUMNS)} FROM entries ORDER BY time_seconds, moves, id"
+
+
+def _to_row(entry: LeaderboardEntry) -> tuple:
+    return (entry.player_name, entry.time_seconds, entry.moves, entry.difficulty,
+            entry.game_mode, entry.timestamp, entry.optimal_moves)
+
+
+class SQLiteLeaderboard:
+    """SQLite排行榜（与models.Leaderboard接口相同，可注入GameController）"""
+
+    def __init__(self, filename: str = None):
+        self.filename = filename or config.LEADERBOARD_DB_FILE
+        # 连接在整个生命周期内复用；后台写入线程也可使用，访问由锁串行化
+        self._conn = sqlite3.connect(self.filename, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")  # WAL下提交不再每次fsync，检查点时落盘
+            self._conn.execute(CREATE_TABLE)
+            self._conn.execute(CREATE_INDEX)
+            self._conn.commit()
+
+    @property
+    def entries(self) -> List[LeaderboardEntry]:
+        """
+        全部历史成绩（按用时、步数排序）：每次访问都读出整张表，只用于导出等一次性操作；
+        界面显示排名请用get_entries_by_difficulty_and_mode
+        """
+        with self._lock:
+            rows = self._conn.execute(SELECT_ALL).fetchall()
+        return [LeaderboardEntry(*row) for row in rows]
+
+    def load_leaderboard(self):
+        """数据保存在数据库中，无需加载"""
+
+    def save_leaderboard(self):
+        """每次写入都已提交，无需另外保存"""
+
+    def add_entry(self, entry: LeaderboardEntry):
+        """添加一条成绩"""
+        with self._lock, self._conn:
+            self._conn.execute(INSERT, _to_row(entry))
+
+    def add_entries(self, entries: Iterable[LeaderboardEntry]):
+        """批量添加成绩（单个事务）"""
+        with self._lock, self._conn:
+            self._conn.executemany(INSERT, (_to_row(entry) for entry in entries))
+
+    def clear_leaderboard(self):
+        """清空排行榜"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM entries")
+
+    def get_entries_by_difficulty_and_mode(self, difficulty: str, mode: str,
+                                           limit: Optional[int] = None) -> List[LeaderboardEntry]:
+        """获取特定难度和模式的前limit名（沿复合索引读取，不排序）"""
+        with self._lock:
+            rows = self._conn.execute(SELECT_TOP, (difficulty, mode,
+                                                   limit or config.MAX_LEADERBOARD_ENTRIES)).fetchall()
+        return [LeaderboardEntry(*row) for row in rows]
+
+    def count(self) -> int:
+        """已保存的成绩条数"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def close(self):
+        """关闭连接（WAL内容在关闭时写回主数据库）"""
+        with self._lock:
+            self._conn.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    from leaderboard_store import JournalStore
+
+    parser = argparse.ArgumentParser(description="把各终端的leaderboard.json（及日志）合并到SQLite排行榜")
+    parser.add_argument('sources', nargs='+', help="leaderboard.json路径")
+    parser.add_argument('--db', default=config.LEADERBOARD_DB_FILE)
+    args = parser.parse_args()
+    leaderboard = SQLiteLeaderboard(args.db)
+    for source in args.sources:
+        # 直接读取快照与日志中的原始记录（Leaderboard加载时会按桶限额截断）
+        store = JournalStore(source)
+        entries = [LeaderboardEntry.from_dict(record) for record in store.load()]
+        store.close()
+        leaderboard.add_entries(entries)
+        print(f"已导入 {source}: {len(entries)}条")
+    print(f"{args.db}: 共{leaderboard.count()}条")
+    leaderboard.close()
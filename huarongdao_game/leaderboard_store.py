@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""
+华容道排行榜存储
+快照 + 追加日志：每次完成游戏只向日志追加一行JSON（按批fsync），
+加载时读取快照再重放日志；日志过长时在后台线程把当前排行榜写成新快照并截断日志。
+快照与日志都通过临时文件 + rename原子替换，写到一半崩溃不会丢失已有记录
+"""
+
+import json
+import os
+import tempfile
+import threading
+from typing import Dict, List, Optional, Tuple
+import config
+
+
+def write_atomic(path: str, text: str):
+    """原子写文件：写入同目录临时文件并fsync后rename覆盖目标"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix=os.path.basename(path))
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+
+class JournalStore:
+    """
+    排行榜的快照 + 追加日志存储
+    每条日志带递增序号，快照记录已包含的最大序号；加载时跳过快照已包含的日志，
+    因此压缩过程中任何时刻崩溃都不会丢记录或重复记录
+    """
+
+    def __init__(self, snapshot_path: str, journal_path: Optional[str] = None,
+                 fsync_every: Optional[int] = None, compact_after: Optional[int] = None):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path or os.path.splitext(snapshot_path)[0] + '.jsonl'
+        self.fsync_every = fsync_every or config.LEADERBOARD_FSYNC_BATCH
+        self.compact_after = compact_after or config.LEADERBOARD_COMPACT_RECORDS
+        self._lock = threading.Lock()
+        self._journal = None
+        self._seq = 0  # 最后写入的日志序号
+        self._journal_records = 0  # 日志中快照未包含的记录数
+        self._unsynced = 0
+        self._compactor: Optional[threading.Thread] = None
+
+    def load(self) -> List[Dict]:
+        """读取快照并重放日志，返回全部条目字典（按写入顺序）"""
+        snapshot_seq, records = self._read_snapshot()
+        self._seq = snapshot_seq
+        self._journal_records = 0
+        journal, valid_bytes = self._read_journal()
+        for seq, record in journal:
+            if seq <= snapshot_seq:
+                continue
+            records.append(record)
+            self._seq = seq
+            self._journal_records += 1
+        with self._lock:
+            self._drop_torn_tail_locked(valid_bytes)
+        return records
+
+    def _read_snapshot(self) -> Tuple[int, List[Dict]]:
+        """快照为{"seq": 序号, "entries": [...]}；兼容旧版直接保存的条目列表"""
+        try:
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return 0, []
+        if isinstance(data, list):
+            return 0, data
+        return data.get('seq', 0), list(data.get('entries', []))
+
+    def _read_journal(self) -> Tuple[List[Tuple[int, Dict]], int]:
+        """
+        逐行读取日志，遇到写了一半的行（崩溃时的最后一行）即停止；
+        返回(序号, 条目)列表与其后完整部分的字节数
+        """
+        records = []
+        valid_bytes = 0
+        try:
+            with open(self.journal_path, 'rb') as f:
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        break
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break
+                    records.append((record['seq'], record['entry']))
+                    valid_bytes += len(line)
+        except FileNotFoundError:
+            pass
+        return records, valid_bytes
+
+    def _drop_torn_tail_locked(self, valid_bytes: int):
+        """
+        截掉日志末尾写了一半的行：否则之后追加的记录会接在残行后面，
+        重新加载时在残行处停止，崩溃后写入的成绩全部丢失
+        """
+        try:
+            if os.path.getsize(self.journal_path) <= valid_bytes:
+                return
+        except FileNotFoundError:
+            return
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        with open(self.journal_path, 'r+b') as f:
+            f.truncate(valid_bytes)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def append(self, entry: Dict):
+        """向日志追加一条记录（每次都刷到操作系统，满fsync_every条才fsync到磁盘）"""
+        self.append_many([entry])
+
+    def append_many(self, entries: List[Dict]):
+        """向日志追加多条记录（一次写入和刷新，合并连续提交的成绩）"""
+        with self._lock:
+            if self._journal is None:
+                self._journal = open(self.journal_path, 'a', encoding='utf-8')
+            lines = []
+            for entry in entries:
+                self._seq += 1
+                lines.append(json.dumps({'seq': self._seq, 'entry': entry}, ensure_ascii=False) + '\n')
+            self._journal.write(''.join(lines))
+            self._journal.flush()
+            self._journal_records += len(entries)
+            self._unsynced += len(entries)
+            if self._unsynced >= self.fsync_every:
+                self._sync_locked()
+
+    def needs_compaction(self) -> bool:
+        """日志记录数超过阈值且没有正在进行的压缩"""
+        return self._journal_records >= self.compact_after and not self.is_compacting()
+
+    def is_compacting(self) -> bool:
+        return self._compactor is not None and self._compactor.is_alive()
+
+    def compact(self, entries: List[Dict]):
+        """把当前全部条目写成快照，并从日志中去掉快照已包含的记录"""
+        with self._lock:
+            seq = self._seq
+        self._compact(seq, entries)
+
+    def compact_async(self, entries: List[Dict]):
+        """在后台线程中压缩（entries须为调用时排行榜的副本，序号在调用线程中确定）"""
+        if self.is_compacting():
+            return
+        with self._lock:
+            seq = self._seq
+        self._compactor = threading.Thread(target=self._compact, args=(seq, entries),
+                                           name='leaderboard-compactor', daemon=True)
+        self._compactor.start()
+
+    def _compact(self, seq: int, entries: List[Dict]):
+        self._write_snapshot(seq, entries)
+        with self._lock:
+            self._truncate_journal_locked(seq)
+
+    def clear(self):
+        """清空：写入空快照，再截断日志"""
+        self.wait_compaction()
+        with self._lock:
+            self._write_snapshot(self._seq, [])
+            self._truncate_journal_locked(self._seq)
+
+    def _write_snapshot(self, seq: int, entries: List[Dict]):
+        write_atomic(self.snapshot_path, json.dumps({'seq': seq, 'entries': entries}, ensure_ascii=False))
+
+    def _truncate_journal_locked(self, seq: int):
+        """保留序号大于seq的日志记录（压缩期间新追加的），原子替换日志文件"""
+        self._sync_locked()
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        journal, _ = self._read_journal()
+        kept = [(record_seq, entry) for record_seq, entry in journal if record_seq > seq]
+        write_atomic(self.journal_path, ''.join(
+            json.dumps({'seq': record_seq, 'entry': entry}, ensure_ascii=False) + '\n'
+            for record_seq, entry in kept))
+        self._journal_records = len(kept)
+
+    def _sync_locked(self):
+        if self._journal is not None and self._unsynced:
+            os.fsync(self._journal.fileno())
+        self._unsynced = 0
+
+    def flush(self):
+        """把尚未fsync的日志记录写到磁盘"""
+        with self._lock:
+            self._sync_locked()
+
+    def wait_compaction(self):
+        """等待后台压缩结束"""
+        if self._compactor is not None:
+            self._compactor.join()
+            self._compactor = None
+
+    def close(self):
+        """等待压缩、fsync并关闭日志"""
+        self.wait_compaction()
+        with self._lock:
+            self._sync_locked()
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
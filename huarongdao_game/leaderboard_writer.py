@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""
+华容道排行榜异步写入
+成绩提交只放入有界队列，由后台线程写入实际的排行榜后端（日志或SQLite），
+连续提交的成绩合并为一次批量写入；尚未写完的成绩在查询时合并到结果中，界面立即可见。
+后端自行加锁（Leaderboard的桶、SQLiteLeaderboard的连接），后台写入与渲染线程的查询可以同时进行
+"""
+
+import queue
+import threading
+import time
+from typing import Dict, List, Optional
+import config
+from log import get_logger
+from models import LeaderboardEntry
+
+logger = get_logger('leaderboard')
+
+_STOP = object()
+
+
+class AsyncLeaderboard:
+    """排行榜后台写入包装（与models.Leaderboard接口相同，可注入GameController）"""
+
+    def __init__(self, leaderboard, max_pending: Optional[int] = None, max_batch: Optional[int] = None):
+        self.leaderboard = leaderboard
+        self.max_batch = max_batch or config.LEADERBOARD_WRITE_BATCH
+        self._queue: 'queue.Queue' = queue.Queue(maxsize=max_pending or config.LEADERBOARD_QUEUE_SIZE)
+        self._pending: List[LeaderboardEntry] = []  # 已提交但尚未写入后端的成绩
+        self._lock = threading.Lock()
+        self._metrics = {'writes': 0, 'batches': 0, 'errors': 0, 'max_queue_depth': 0,
+                         'last_write_ms': 0.0, 'max_write_ms': 0.0, 'total_write_ms': 0.0}
+        self._worker = threading.Thread(target=self._run, name='leaderboard-writer', daemon=True)
+        self._worker.start()
+
+    def add_entry(self, entry: LeaderboardEntry):
+        """提交成绩（队列满时等待，正常情况下立即返回）"""
+        with self._lock:
+            self._pending.append(entry)
+        self._queue.put(entry)
+        depth = self._queue.qsize()
+        if depth > self._metrics['max_queue_depth']:
+            self._metrics['max_queue_depth'] = depth
+
+    def add_entries(self, entries: List[LeaderboardEntry]):
+        """批量提交成绩"""
+        for entry in entries:
+            self.add_entry(entry)
+
+    def _run(self):
+        """后台线程：取出一条后把队列中已有的成绩一起写入"""
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                self._queue.task_done()
+                return
+            batch = [item]
+            stop = False
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            self._write(batch)
+            for _ in range(len(batch) + stop):
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _write(self, batch: List[LeaderboardEntry]):
+        start = time.perf_counter()
+        try:
+            self.leaderboard.add_entries(batch)
+        except Exception as e:
+            self._metrics['errors'] += 1
+            logger.error("保存排行榜失败: %s", e)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._lock:
+            del self._pending[:len(batch)]
+        metrics = self._metrics
+        metrics['writes'] += len(batch)
+        metrics['batches'] += 1
+        metrics['last_write_ms'] = elapsed_ms
+        metrics['max_write_ms'] = max(metrics['max_write_ms'], elapsed_ms)
+        metrics['total_write_ms'] += elapsed_ms
+
+    def _merge_pending(self, entries: List[LeaderboardEntry], difficulty: Optional[str] = None,
+                       mode: Optional[str] = None) -> List[LeaderboardEntry]:
+        """把尚未写入的成绩合并到查询结果（写入与移出待写列表之间可能已在结果中，按值去重）"""
+        with self._lock:
+            pending = [entry for entry in self._pending
+                       if difficulty is None or (entry.difficulty == difficulty and entry.game_mode == mode)]
+        missing = [entry for entry in pending if entry not in entries]
+        if not missing:
+            return entries
+        return sorted(entries + missing, key=LeaderboardEntry.rank_key)
+
+    @property
+    def entries(self) -> List[LeaderboardEntry]:
+        """全部条目（含尚未写入的成绩）"""
+        return self._merge_pending(self.leaderboard.entries)
+
+    def get_entries_by_difficulty_and_mode(self, difficulty: str, mode: str,
+                                           limit: Optional[int] = None) -> List[LeaderboardEntry]:
+        """获取特定难度和模式的前limit名（含尚未写入的成绩）"""
+        limit = limit or config.MAX_LEADERBOARD_ENTRIES
+        entries = self.leaderboard.get_entries_by_difficulty_and_mode(difficulty, mode, limit)
+        return self._merge_pending(entries, difficulty, mode)[:limit]
+
+    def load_leaderboard(self):
+        """重新加载后端数据（先写完队列中的成绩）"""
+        self.flush()
+        self.leaderboard.load_leaderboard()
+
+    def save_leaderboard(self):
+        """写完队列中的成绩并保存后端"""
+        self.flush()
+        self.leaderboard.save_leaderboard()
+
+    def clear_leaderboard(self):
+        """清空排行榜（先写完队列中的成绩）"""
+        self.flush()
+        self.leaderboard.clear_leaderboard()
+
+    def flush(self):
+        """等待队列中的成绩全部写入后端"""
+        self._queue.join()
+
+    def metrics(self) -> Dict[str, float]:
+        """队列深度与写入延迟统计（毫秒）"""
+        metrics = dict(self._metrics)
+        metrics['queue_depth'] = self._queue.qsize()
+        metrics['avg_write_ms'] = metrics['total_write_ms'] / metrics['batches'] if metrics['batches'] else 0.0
+        return metrics
+
+    def close(self):
+        """写完队列、停止后台线程并关闭后端（退出前调用）"""
+        if self._worker.is_alive():
+            self._queue.put(_STOP)
+            self._worker.join()
+        self.leaderboard.close()
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+"""
+华容道日志
+各模块通过get_logger取得标准库logging的记录器，消息参数延迟格式化（级别不够时不拼接字符串）；
+每步移动、计时器等热路径上的调试日志写在 `if DEBUG:` 中，DEBUG在模块加载时由config.DEBUG_LOG确定，
+关闭时只有一次全局变量判断，不调用记录器
+"""
+
+import logging
+import config
+
+DEBUG = config.DEBUG_LOG
+
+LOG_FORMAT = '%(asctime)s %(levelname)s %(name)s: %(message)s'
+
+
+def get_logger(name: str) -> logging.Logger:
+    """取得模块记录器（统一挂在huarongdao下）"""
+    return logging.getLogger(f'huarongdao.{name}')
+
+
+def configure(level: str = None):
+    """配置日志输出（游戏入口调用）：DEBUG_LOG开启时输出DEBUG级别，否则使用LOG_LEVEL"""
+    level = level or ('DEBUG' if config.DEBUG_LOG else config.LOG_LEVEL)
+    logging.basicConfig(level=getattr(logging, level.upper()), format=LOG_FORMAT)
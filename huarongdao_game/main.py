@@ -7,40 +7,71 @@
 import pygame
 import sys
 from config import *
+import log
 from renderer import GameRenderer
 from controllers import GameController
+from profiler import FrameProfiler
+
+logger = log.get_logger('main')
+
+
+def wait_events(controller: GameController, renderer: GameRenderer) -> list:
+    """
+    取得本轮要处理的事件：有动画时按FPS限速后取出全部事件；
+    画面静止时阻塞等待事件，超时（如计时器需要刷新秒数）时返回空列表
+    """
+    timeout = controller.next_frame_timeout()
+    if timeout == 0:
+        renderer.clock.tick(FPS)
+        return pygame.event.get()
+
+    event = pygame.event.wait(timeout)
+    if event.type == pygame.NOEVENT:
+        return []
+    return [event] + pygame.event.get()
 
 
 def main():
-    """主函数"""
+    """主函数（事件驱动：画面不变时不重复渲染）"""
+    log.configure()
+    controller = None
+    profiler = None
     try:
         renderer = GameRenderer()
-        controller = GameController()
-        
+        controller = GameController(layout=renderer.layout)
+        # 鼠标移动不影响画面，不唤醒主循环
+        pygame.event.set_blocked(pygame.MOUSEMOTION)
+        # FRAME_PROFILER关闭时为None，不包装任何方法
+        profiler = FrameProfiler.from_config(controller, renderer)
+
         running = True
         while running:
-            events = pygame.event.get()
+            events = wait_events(controller, renderer)
+            if profiler:
+                profiler.begin_frame()
             for event in events:
                 if event.type == pygame.QUIT:
                     running = False
-            
+
             # 处理游戏事件
             if not controller.handle_events(events, renderer):  # 修复方法名
                 running = False
-            
-            # 渲染当前屏幕
+
+            # 渲染当前屏幕（画面标识不变时只提交变化的区域）
             controller.render_current_screen(renderer)
-            
-            # 控制帧率
-            renderer.clock.tick(FPS)
-            
-    except Exception as e:
-        print(f"游戏运行出错: {e}")
-        import traceback
-        traceback.print_exc()
+            if profiler:
+                profiler.end_frame()
+
+    except Exception:
+        logger.exception("游戏运行出错")
     finally:
+        if controller:
+            # 退出前写完后台队列中的成绩，并把按批fsync的日志写到磁盘
+            controller.leaderboard.close()
+        if profiler:
+            logger.info("帧耗时统计已写入 %s", profiler.dump())
         pygame.quit()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
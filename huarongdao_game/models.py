@@ -4,11 +4,20 @@
 包含游戏状态、排行榜条目等数据结构
 """
 
-import json
+import bisect
+import heapq
+import threading
 import time
 from dataclasses import dataclass, asdict
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import config
+import log
+from board import make_board
+from leaderboard_store import JournalStore
+from distance_table import SIZE as TABLE_SIZE, get_distance_table
+from solvability import is_solvable, random_solvable_permutation
+
+logger = log.get_logger('models')
 
 
 @dataclass
@@ -26,7 +35,8 @@ class GameStats:
             self.start_time = time.time()
             self.is_active = True
             self.game_started = True
-            print(f"计时器启动: {self.start_time}")  # 调试信息
+            if log.DEBUG:
+                logger.debug("计时器启动: %.3f", self.start_time)
     
     def stop_timer(self):
         """停止计时并记录最终时间"""
@@ -63,6 +73,7 @@ class LeaderboardEntry:
     difficulty: str
     game_mode: str
     timestamp: float
+    optimal_moves: Optional[int] = None  # 初始局面的最优步数（未知时为None）
     
     def __post_init__(self):
         """在初始化后处理数据"""
@@ -78,6 +89,10 @@ class LeaderboardEntry:
         """从字典创建实例"""
         return cls(**data)
     
+    def rank_key(self) -> Tuple[float, int]:
+        """排名依据：用时优先，其次步数"""
+        return (self.time_seconds, self.moves)
+    
     def get_formatted_time(self) -> str:
         """获取格式化的时间显示（精确到0.01秒）"""
         minutes = int(self.time_seconds // 60)
@@ -86,58 +101,134 @@ class LeaderboardEntry:
 
 
 class Leaderboard:
-    """排行榜管理类"""
+    """
+    排行榜管理类（按(难度, 模式)分桶，桶内按(用时, 步数)有序，每桶最多保留MAX_LEADERBOARD_ENTRIES条）
+    数据经store持久化，默认为快照 + 追加日志（leaderboard_store.JournalStore）；
+    可由后台线程写入（leaderboard_writer.AsyncLeaderboard）的同时在渲染线程查询：
+    _lock保护桶的修改与读取（不包含磁盘写入），_write_lock使各次写入依次进行
+    """
     
-    def __init__(self, filename: str = None):
+    def __init__(self, filename: str = None, store=None):
         # 如果没有提供文件名，使用配置中的默认路径
         self.filename = filename or config.LEADERBOARD_FILE
-        self.entries: List[LeaderboardEntry] = []
+        self.store = store or JournalStore(self.filename)
+        self._buckets: Dict[Tuple[str, str], List[LeaderboardEntry]] = {}
+        self._bucket_keys: Dict[Tuple[str, str], List[Tuple[float, int]]] = {}  # 与桶内条目一一对应的排名依据
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
         self.load_leaderboard()
     
+    @property
+    def entries(self) -> List[LeaderboardEntry]:
+        """全部条目（各桶归并，按用时、步数排序）"""
+        with self._lock:
+            return list(heapq.merge(*self._buckets.values(), key=LeaderboardEntry.rank_key))
+    
+    @entries.setter
+    def entries(self, entries: List[LeaderboardEntry]):
+        with self._lock:
+            self._buckets = {}
+            self._bucket_keys = {}
+            for entry in entries:
+                self._insert(entry)
+    
+    def _insert(self, entry: LeaderboardEntry) -> bool:
+        """
+        把条目插入所属桶的有序位置（二分查找），超出每桶上限时淘汰本桶最后一名；未上榜时返回False
+        （调用方持有_lock）
+        """
+        bucket = (entry.difficulty, entry.game_mode)
+        keys = self._bucket_keys.setdefault(bucket, [])
+        entries = self._buckets.setdefault(bucket, [])
+        key = entry.rank_key()
+        # 成绩相同时排在已有条目之后，与稳定排序一致
+        index = bisect.bisect_right(keys, key)
+        if index >= config.MAX_LEADERBOARD_ENTRIES:
+            return False
+        keys.insert(index, key)
+        entries.insert(index, entry)
+        if len(entries) > config.MAX_LEADERBOARD_ENTRIES:
+            keys.pop()
+            entries.pop()
+        return True
+    
     def load_leaderboard(self):
-        """从文件加载排行榜"""
-        try:
-            with open(self.filename, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                self.entries = [LeaderboardEntry.from_dict(entry) for entry in data]
-        except (FileNotFoundError, json.JSONDecodeError):
-            self.entries = []
+        """从快照和日志重建排行榜"""
+        with self._write_lock:
+            self.entries = [LeaderboardEntry.from_dict(entry) for entry in self.store.load()]
     
     def save_leaderboard(self):
-        """保存排行榜到文件"""
-        try:
-            with open(self.filename, 'w', encoding='utf-8') as f:
-                data = [entry.to_dict() for entry in self.entries]
-                json.dump(data, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"保存排行榜失败: {e}")
+        """把整个排行榜写成快照（原子替换）并截断日志"""
+        with self._write_lock:
+            try:
+                self.store.compact([entry.to_dict() for entry in self.entries])
+            except Exception as e:
+                logger.error("保存排行榜失败: %s", e)
     
     def add_entry(self, entry: LeaderboardEntry):
-        """添加新的排行榜条目"""
-        self.entries.append(entry)
-        # 按时间排序
-        self.entries.sort(key=lambda x: (x.time_seconds, x.moves))
-        # 保持最大条目数
-        self.entries = self.entries[:config.MAX_LEADERBOARD_ENTRIES]
-        self.save_leaderboard()
+        """添加新的排行榜条目（O(log n)定位，只向日志追加一行；日志过长时后台压缩）"""
+        self.add_entries([entry])
+    
+    def add_entries(self, entries: List[LeaderboardEntry]):
+        """批量添加条目（上榜的条目一次追加到日志；写日志时不持有_lock，不阻塞查询）"""
+        with self._write_lock:
+            with self._lock:
+                added = [entry.to_dict() for entry in entries if self._insert(entry)]
+            if not added:
+                return
+            try:
+                self.store.append_many(added)
+                if self.store.needs_compaction():
+                    self.store.compact_async([item.to_dict() for item in self.entries])
+            except Exception as e:
+                logger.error("保存排行榜失败: %s", e)
     
     def clear_leaderboard(self):
         """清空排行榜"""
-        self.entries = []
-        self.save_leaderboard()
-    
-    def get_entries_by_difficulty_and_mode(self, difficulty: str, mode: str) -> List[LeaderboardEntry]:
-        """获取特定难度和模式的排行榜"""
-        filtered = [entry for entry in self.entries 
-                   if entry.difficulty == difficulty and entry.game_mode == mode]
-        return sorted(filtered, key=lambda x: (x.time_seconds, x.moves))[:config.MAX_LEADERBOARD_ENTRIES]
+        with self._write_lock:
+            self.entries = []
+            try:
+                self.store.clear()
+            except Exception as e:
+                logger.error("保存排行榜失败: %s", e)
+    
+    def close(self):
+        """等待后台压缩并把日志写到磁盘（退出前调用）"""
+        self.store.close()
+    
+    def get_entries_by_difficulty_and_mode(self, difficulty: str, mode: str,
+                                           limit: Optional[int] = None) -> List[LeaderboardEntry]:
+        """获取特定难度和模式的前limit名（桶内已有序，只复制需要的条目）"""
+        with self._lock:
+            entries = self._buckets.get((difficulty, mode), [])
+            return entries[:limit or config.MAX_LEADERBOARD_ENTRIES]
+
+
+def open_leaderboard(backend: Optional[str] = None, asynchronous: Optional[bool] = None):
+    """
+    按后端名称（默认config.LEADERBOARD_BACKEND）创建排行榜；
+    asynchronous（默认config.LEADERBOARD_ASYNC）为True时由后台线程写入
+    """
+    backend = backend or config.LEADERBOARD_BACKEND
+    if backend == 'journal':
+        leaderboard = Leaderboard()
+    elif backend == 'sqlite':
+        from leaderboard_sqlite import SQLiteLeaderboard
+        leaderboard = SQLiteLeaderboard()
+    else:
+        raise ValueError(f"未知排行榜后端: {backend}")
+    if config.LEADERBOARD_ASYNC if asynchronous is None else asynchronous:
+        from leaderboard_writer import AsyncLeaderboard
+        leaderboard = AsyncLeaderboard(leaderboard)
+    return leaderboard
 
 
 class GameState:
     """游戏状态管理"""
     
     def __init__(self):
-        self.board: List[List[int]] = []
+        self.board: List[List[int]] = []  # 二维列表视图（供渲染器使用）
+        self.cells = None  # 紧凑棋盘表示（PackedBoard/ArrayBoard）
         self.size: int = 0
         self.empty_pos: tuple = (0, 0)
         self.stats: Optional[GameStats] = None
@@ -145,60 +236,62 @@ class GameState:
         self.current_difficulty: str = 'EASY'
         self.current_mode: str = 'NUMBERS'
         self.game_ready: bool = False  # 标记游戏是否准备好开始
+        self.optimal_moves: Optional[int] = None  # 初始局面的最优步数（仅3x3可查表）
         
-    def initialize_board(self, size: int, mode: str = 'NUMBERS'):
-        """初始化游戏板"""
+    def initialize_board(self, size: int, mode: str = 'NUMBERS',
+                         distance_range: Optional[Tuple[int, int]] = None):
+        """初始化游戏板（distance_range为最优步数范围，仅3x3有距离表时生效）"""
         self.size = size
         self.current_mode = mode
         
-        # 创建有序的数字板
-        numbers = list(range(1, size * size))
-        numbers.append(0)  # 0表示空格
-        
-        # 打乱数组
-        import random
-        random.shuffle(numbers)
+        table = get_distance_table() if size == TABLE_SIZE else None
+        if table and distance_range is not None:
+            # 在区间内的全部状态中均匀抽取（不做拒绝采样，最窄的区间也一次得到）
+            drawn = table.random_state(*distance_range)
+            if drawn is None:
+                raise ValueError(f"最优步数范围{distance_range}内没有棋盘（最大步数为{table.max_distance}）")
+            numbers, self.optimal_moves = drawn
+        else:
+            # 直接生成可解的随机排列（0表示空格），查表得到最优步数（O(1)）
+            numbers = random_solvable_permutation(size)
+            self.optimal_moves = table.distance_of(numbers) if table else None
         
-        # 确保可解性
-        while not self._is_solvable(numbers, size):
-            random.shuffle(numbers)
+        self._set_board(numbers)
         
-        # 转换为二维数组
-        self.board = []
-        for i in range(size):
-            row = []
-            for j in range(size):
-                num = numbers[i * size + j]
-                row.append(num)
-                if num == 0:
-                    self.empty_pos = (i, j)
-            self.board.append(row)
+        # 初始化统计数据（不激活计时器）
+        self.stats = GameStats(start_time=0)
+        self.is_solved = False
+        self.game_ready = True  # 标记游戏已准备好
+    
+    def load_board(self, size: int, numbers: List[int], mode: str = 'NUMBERS',
+                   optimal_moves: Optional[int] = None):
+        """使用给定的一维数字排列初始化游戏板（如从分级题库抽取的题目）"""
+        if not self._is_solvable(numbers, size):
+            raise ValueError("棋盘不可解")
+        self.size = size
+        self.current_mode = mode
+        self.optimal_moves = optimal_moves
+        self._set_board(list(numbers))
         
         # 初始化统计数据（不激活计时器）
         self.stats = GameStats(start_time=0)
         self.is_solved = False
         self.game_ready = True  # 标记游戏已准备好
     
+    def _set_board(self, numbers: List[int]):
+        """根据一维数字排列设置棋盘"""
+        self.cells = make_board(self.size, numbers)
+        self.board = self.cells.to_rows()
+        self.empty_pos = divmod(self.cells.empty, self.size)
+    
     def start_game(self):
         """正式开始游戏（启动计时器）"""
         if self.stats and self.game_ready and not self.stats.game_started:
             self.stats.start_timer()
     
     def _is_solvable(self, numbers: List[int], size: int) -> bool:
-        """检查排列是否可解"""
-        inversions = 0
-        for i in range(len(numbers)):
-            for j in range(i + 1, len(numbers)):
-                if numbers[i] != 0 and numbers[j] != 0 and numbers[i] > numbers[j]:
-                    inversions += 1
-        
-        if size % 2 == 1:
-            # 奇数尺寸：逆序数必须是偶数
-            return inversions % 2 == 0
-        else:
-            # 偶数尺寸：逆序数的奇偶性必须与空格所在行数的奇偶性相同
-            empty_row = numbers.index(0) // size
-            return (inversions + empty_row) % 2 == 0
+        """检查排列是否可解（置换环分解，O(n)）"""
+        return is_solvable(numbers, size)
     
     def move_tile(self, row: int, col: int) -> bool:
         """移动指定位置的方块"""
@@ -215,14 +308,16 @@ class GameState:
         if abs(row - empty_row) + abs(col - empty_col) != 1:
             return False
         
-        # 交换位置
+        # 交换位置（紧凑棋盘同步维护空格和错位计数）
+        self.cells.move(row * self.size + col)
         self.board[empty_row][empty_col] = self.board[row][col]
         self.board[row][col] = 0
         self.empty_pos = (row, col)
         
         # 更新步数
         self.stats.moves += 1
-        print(f"移动次数: {self.stats.moves}")  # 调试信息
+        if log.DEBUG:
+            logger.debug("移动方块 (%d, %d)，移动次数: %d", row, col, self.stats.moves)
         
         # 检查是否完成
         self._check_solved()
@@ -245,25 +340,23 @@ class GameState:
         
         return False
     
+    def get_hint(self) -> Optional[Tuple[int, int]]:
+        """获取提示：返回沿最优路径应移动的方块位置，无法提示时返回None"""
+        if self.size != TABLE_SIZE or self.is_solved:
+            return None
+        table = get_distance_table()
+        return table.best_move(self.board) if table else None
+    
     def _check_solved(self):
-        """检查游戏是否完成"""
-        expected = 1
-        for i in range(self.size):
-            for j in range(self.size):
-                if i == self.size - 1 and j == self.size - 1:
-                    # 最后一个应该是0
-                    if self.board[i][j] != 0:
-                        return
-                else:
-                    if self.board[i][j] != expected:
-                        return
-                    expected += 1
+        """检查游戏是否完成（错位计数为0，O(1)）"""
+        if not self.cells.is_solved():
+            return
         
         # 游戏完成
         self.is_solved = True
         if self.stats:
             self.stats.stop_timer()
-        print("游戏完成!")  # 调试信息
+        logger.info("游戏完成: %d步", self.stats.moves if self.stats else 0)
     
     def restart_game(self):
         """重新开始游戏"""
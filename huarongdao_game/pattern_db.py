@@ -0,0 +1,284 @@
+# -*- coding: utf-8 -*-
+"""
+华容道加性模式数据库（Additive Pattern Database）
+离线构建不相交分组的精确距离表，运行时通过mmap加载，查表为O(1)
+"""
+
+import mmap
+import os
+import struct
+from typing import Dict, List, Optional, Sequence
+import config
+
+# 默认的不相交分组（数字编号，目标位置为 数字-1，空格在右下角）
+DEFAULT_PARTITIONS = {
+    4: ((1, 5, 6, 9, 10, 13), (7, 8, 11, 12, 14, 15), (2, 3, 4)),  # 6-6-3
+    5: ((1, 2, 6, 7), (3, 4, 8, 9), (5, 10, 15, 20),
+        (11, 12, 16, 17), (13, 14, 18, 19), (21, 22, 23, 24)),       # 4-4-4-4-4-4
+}
+
+# 文件格式：魔数 + 版本 + 棋盘尺寸 + 分组数，随后每组为 长度 + 数字列表，最后依次为各组距离表
+MAGIC = b'HRPD'
+VERSION = 1
+UNREACHED = 255
+
+# 已加载的数据库（同一进程内共享）
+_loaded: Dict[int, Optional['PatternDatabase']] = {}
+
+
+def database_path(size: int) -> str:
+    """获取指定尺寸的数据库文件路径"""
+    return os.path.join(config.DATA_DIR, f"pattern_db_{size}x{size}.bin")
+
+
+def pattern_weights(cells: int, length: int) -> List[int]:
+    """计算k-排列排名的各位权重 P(cells-1-i, length-1-i)"""
+    weights = []
+    for i in range(length):
+        weight = 1
+        for j in range(cells - length + 1, cells - i):
+            weight *= j
+        weights.append(weight)
+    return weights
+
+
+def table_entries(cells: int, length: int) -> int:
+    """分组距离表的条目数 cells!/(cells-length)!"""
+    entries = 1
+    for i in range(length):
+        entries *= cells - i
+    return entries
+
+
+class PatternDatabase:
+    """加性模式数据库启发函数（可直接作为solver.Solver的heuristic）"""
+
+    def __init__(self, size: int, patterns: Sequence[Sequence[int]], tables: Sequence, mapped=None):
+        self.size = size
+        self.patterns = [tuple(pattern) for pattern in patterns]
+        self.tables = list(tables)
+        self._mapped = mapped
+        cells = size * size
+        self.weights = [pattern_weights(cells, len(pattern)) for pattern in self.patterns]
+        # pattern_of[tile]: 数字所属分组编号（-1表示空格）
+        self.pattern_of = [-1] * cells
+        for index, pattern in enumerate(self.patterns):
+            for tile in pattern:
+                self.pattern_of[tile] = index
+
+    @classmethod
+    def load(cls, size: int, path: str = None) -> 'PatternDatabase':
+        """通过mmap加载数据库文件（只读，多进程共享同一份页缓存）"""
+        path = path or database_path(size)
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, file_size, count = struct.unpack_from('<4sBBB', mapped, 0)
+            if magic != MAGIC or version != VERSION or file_size != size:
+                raise ValueError(f"模式数据库文件格式不正确: {path}")
+            offset = 7
+            patterns = []
+            for _ in range(count):
+                length = mapped[offset]
+                patterns.append(tuple(mapped[offset + 1:offset + 1 + length]))
+                offset += 1 + length
+            view = memoryview(mapped)
+            tables = []
+            for pattern in patterns:
+                entries = table_entries(size * size, len(pattern))
+                tables.append(view[offset:offset + entries])
+                offset += entries
+            if offset != len(mapped):
+                raise ValueError(f"模式数据库文件长度不正确: {path}")
+        except Exception:
+            mapped.close()
+            raise
+        return cls(size, patterns, tables, mapped)
+
+    def close(self):
+        """释放mmap映射"""
+        if self._mapped is not None:
+            for table in self.tables:
+                if isinstance(table, memoryview):
+                    table.release()
+            self.tables = []
+            self._mapped.close()
+            self._mapped = None
+
+    def rank(self, index: int, positions: Sequence[int]) -> int:
+        """计算第index组数字位置的k-排列排名"""
+        rank = 0
+        placed = []
+        for tile, weight in zip(self.patterns[index], self.weights[index]):
+            pos = positions[tile]
+            digit = pos
+            for other in placed:
+                if other < pos:
+                    digit -= 1
+            rank += digit * weight
+            placed.append(pos)
+        return rank
+
+    def estimate(self, tiles: Sequence[int]) -> int:
+        """完整计算启发值（各组距离之和）"""
+        positions = [0] * len(tiles)
+        for pos, tile in enumerate(tiles):
+            positions[tile] = pos
+        return sum(table[self.rank(index, positions)] for index, table in enumerate(self.tables))
+
+    def update(self, tiles: List[int], positions: List[int], h: int, tile: int, src: int, dst: int) -> int:
+        """增量更新启发值：只重新查询被移动数字所在分组"""
+        index = self.pattern_of[tile]
+        table = self.tables[index]
+        new_value = table[self.rank(index, positions)]
+        positions[tile] = src
+        old_value = table[self.rank(index, positions)]
+        positions[tile] = dst
+        return h + new_value - old_value
+
+
+def get_pattern_database(size: int) -> Optional[PatternDatabase]:
+    """获取指定尺寸的模式数据库，文件不存在时返回None"""
+    if size not in _loaded:
+        try:
+            _loaded[size] = PatternDatabase.load(size)
+        except FileNotFoundError:
+            _loaded[size] = None
+    return _loaded[size]
+
+
+def build_pattern_table(size: int, pattern: Sequence[int], chunk_size: int = 1 << 18):
+    """
+    构建单个分组的距离表（需要NumPy，仅离线使用）
+    在(分组数字位置, 空格连通区域)上做逐层BFS，
+    非分组数字的移动代价为0，因此空格所在连通区域内的位置视为同一状态
+    """
+    import numpy as np
+
+    cells = size * size
+    length = len(pattern)
+    entries = table_entries(cells, length)
+    weights = np.array(pattern_weights(cells, length), dtype=np.int64)
+    full = (1 << cells) - 1
+    not_first_col = full
+    not_last_col = full
+    for row in range(size):
+        not_first_col &= ~(1 << (row * size))
+        not_last_col &= ~(1 << (row * size + size - 1))
+    bits = np.left_shift(np.int64(1), np.arange(cells, dtype=np.int64))
+
+    def rank(positions):
+        digits = positions.astype(np.int64)
+        result = np.zeros(len(positions), dtype=np.int64)
+        for i in range(length):
+            digit = digits[:, i].copy()
+            for j in range(i):
+                digit -= digits[:, j] < digits[:, i]
+            result += digit * weights[i]
+        return result
+
+    def flood(seed, free):
+        # 在空闲格子上从seed开始扩展连通区域
+        region = seed
+        while True:
+            grown = region | ((region << 1) & not_first_col) | ((region >> 1) & not_last_col)
+            grown |= (region << size) | (region >> size)
+            grown &= free
+            if np.array_equal(grown, region):
+                return region
+            region = grown
+
+    def lowest_cell(region):
+        return np.log2((region & -region).astype(np.float64)).astype(np.int64)
+
+    def occupancy(positions):
+        occupied = np.zeros(len(positions), dtype=np.int64)
+        for i in range(length):
+            occupied |= bits[positions[:, i]]
+        return occupied
+
+    table = np.full(entries, UNREACHED, dtype=np.uint8)
+    visited = np.zeros(entries * cells, dtype=bool)
+
+    goal = np.array([[tile - 1 for tile in pattern]], dtype=np.int64)
+    goal_free = full & ~occupancy(goal)
+    goal_region = flood(bits[[cells - 1]], goal_free)
+    goal_key = rank(goal) * cells + lowest_cell(goal_region)
+    visited[goal_key] = True
+    table[rank(goal)] = 0
+
+    frontier_positions, frontier_cells = goal, lowest_cell(goal_region)
+    steps = ((-size, None), (size, None), (-1, 0), (1, size - 1))
+    distance = 0
+    while len(frontier_positions):
+        distance += 1
+        next_positions, next_cells = [], []
+        for start in range(0, len(frontier_positions), chunk_size):
+            positions = frontier_positions[start:start + chunk_size]
+            blank_cells = frontier_cells[start:start + chunk_size]
+            free = full & ~occupancy(positions)
+            region = flood(bits[blank_cells], free)
+            for i in range(length):
+                source = positions[:, i]
+                for delta, edge_col in steps:
+                    target = source + delta
+                    valid = (target >= 0) & (target < cells)
+                    if edge_col is not None:
+                        valid &= source % size != edge_col
+                    target = np.where(valid, target, 0)
+                    valid &= ((region >> target) & 1) == 1
+                    if not valid.any():
+                        continue
+                    moved = positions[valid].copy()
+                    moved[:, i] = target[valid]
+                    # 分组数字移入空格区域后，原位置成为新空格
+                    new_region = flood(bits[source[valid]], full & ~occupancy(moved))
+                    new_cells = lowest_cell(new_region)
+                    ranks = rank(moved)
+                    keys = ranks * cells + new_cells
+                    fresh = ~visited[keys]
+                    keys, first = np.unique(keys[fresh], return_index=True)
+                    visited[keys] = True
+                    ranks = ranks[fresh][first]
+                    table[ranks] = np.minimum(table[ranks], distance)
+                    next_positions.append(moved[fresh][first])
+                    next_cells.append(new_cells[fresh][first])
+        if not next_positions:
+            break
+        frontier_positions = np.concatenate(next_positions)
+        frontier_cells = np.concatenate(next_cells)
+
+    if (table == UNREACHED).any():
+        raise RuntimeError(f"分组{tuple(pattern)}存在未到达的状态")
+    return table
+
+
+def build_database(size: int, partition: Sequence[Sequence[int]] = None, path: str = None) -> str:
+    """构建并写入完整的加性模式数据库文件（原子替换）"""
+    partition = partition or DEFAULT_PARTITIONS[size]
+    tiles = sorted(tile for pattern in partition for tile in pattern)
+    if tiles != list(range(1, size * size)):
+        raise ValueError("分组必须不重不漏地覆盖所有数字")
+
+    path = path or database_path(size)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(struct.pack('<4sBBB', MAGIC, VERSION, size, len(partition)))
+        for pattern in partition:
+            f.write(bytes([len(pattern)]) + bytes(pattern))
+        for pattern in partition:
+            f.write(build_pattern_table(size, pattern).tobytes())
+    os.replace(temp_path, path)
+    _loaded.pop(size, None)
+    return path
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="构建华容道加性模式数据库")
+    parser.add_argument('sizes', nargs='*', type=int, default=sorted(DEFAULT_PARTITIONS))
+    args = parser.parse_args()
+    for board_size in args.sizes:
+        print(f"已生成: {build_database(board_size)}")
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+华容道帧耗时分析
+按帧记录各阶段耗时：控制器事件处理（handle_events）、渲染器的各draw_*方法、显示提交（update_display），
+每个阶段的最近PROFILER_SAMPLES帧保存在环形缓冲中，可计算p50/p95/p99、在画面上叠加显示，退出时写入JSON；
+只在FRAME_PROFILER开启时包装这些方法，关闭时没有任何额外开销
+"""
+
+import json
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional
+import config
+
+FRAME = 'frame'  # 整帧（事件处理到显示提交，不含等待事件的时间）
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """最近秩百分位数（sorted_values已升序）"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * q // 100))  # 向上取整
+    return sorted_values[int(rank) - 1]
+
+
+class FrameProfiler:
+    """每帧各阶段耗时（毫秒）；同一阶段在一帧内多次调用时累加，嵌套的draw_*各自记录含子调用的耗时"""
+
+    def __init__(self, samples: Optional[int] = None, overlay: Optional[bool] = None):
+        self.samples = samples or config.PROFILER_SAMPLES
+        self.overlay = config.PROFILER_OVERLAY if overlay is None else overlay
+        self.timings: Dict[str, Deque[float]] = {}  # 阶段 -> 最近各帧耗时（环形缓冲）
+        self.frames = 0
+        self._current: Dict[str, float] = {}
+        self._frame_start: Optional[float] = None
+        self._overlay_text = ''
+
+    @classmethod
+    def from_config(cls, controller, renderer) -> Optional['FrameProfiler']:
+        """FRAME_PROFILER开启时创建分析器并包装控制器与渲染器，否则返回None"""
+        if not config.FRAME_PROFILER:
+            return None
+        profiler = cls()
+        profiler.instrument(controller, renderer)
+        return profiler
+
+    def _timed(self, name: str, method):
+        """包装方法：调用耗时累加到本帧的name阶段"""
+        current = self._current
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                current[name] = current.get(name, 0.0) + (time.perf_counter() - start) * 1000
+        timed.__wrapped__ = method
+        return timed
+
+    def instrument(self, controller, renderer):
+        """在实例上替换handle_events、各draw_*方法与update_display为计时版本"""
+        controller.handle_events = self._timed('handle_events', controller.handle_events)
+        for name in dir(type(renderer)):
+            if name.startswith('draw_') and callable(getattr(renderer, name)):
+                setattr(renderer, name, self._timed(name, getattr(renderer, name)))
+        update_display = self._timed('update_display', renderer.update_display)
+
+        def update_with_overlay():
+            if self.overlay:
+                self.draw_overlay(renderer)
+            update_display()
+        renderer.update_display = update_with_overlay
+
+    def begin_frame(self):
+        """一帧开始（主循环取得事件之后）"""
+        self._current.clear()
+        self._frame_start = time.perf_counter()
+
+    def end_frame(self):
+        """一帧结束：把本帧各阶段耗时放入环形缓冲"""
+        if self._frame_start is None:
+            return
+        self._current[FRAME] = (time.perf_counter() - self._frame_start) * 1000
+        for name, elapsed_ms in self._current.items():
+            buffer = self.timings.get(name)
+            if buffer is None:
+                buffer = self.timings[name] = deque(maxlen=self.samples)
+            buffer.append(elapsed_ms)
+        self._current.clear()
+        self._frame_start = None
+        self.frames += 1
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """各阶段在最近帧中的统计：帧数、平均、p50/p95/p99、最大（毫秒）"""
+        result = {}
+        for name, buffer in self.timings.items():
+            values = sorted(buffer)
+            stats = {'count': len(values), 'mean': sum(values) / len(values)}
+            for q in PERCENTILES:
+                stats[f'p{q}'] = percentile(values, q)
+            stats['max'] = values[-1]
+            result[name] = stats
+        return result
+
+    def draw_overlay(self, renderer):
+        """在画面底部显示整帧耗时p50/p95/p99（每帧都会重绘，加入脏矩形）"""
+        buffer = self.timings.get(FRAME)
+        if buffer:
+            values = sorted(buffer)
+            self._overlay_text = 'frame ms p50 {:.1f}  p95 {:.1f}  p99 {:.1f}  ({} frames)'.format(
+                percentile(values, 50), percentile(values, 95), percentile(values, 99), len(values))
+        screen_rect = renderer.screen.get_rect()
+        rect = screen_rect.copy()
+        rect.height = 18
+        rect.bottom = screen_rect.bottom
+        renderer.screen.fill(config.COLORS['BLACK'], rect)
+        # 数值每帧变化，不经过文字缓存
+        text = renderer.fonts['small'].render(self._overlay_text, True, config.COLORS['WHITE'])
+        renderer.screen.blit(text, (4, rect.top + 1))
+        renderer.dirty_rects.append(rect)
+
+    def dump(self, path: Optional[str] = None) -> str:
+        """把统计与原始样本写入JSON（退出时调用），返回文件路径"""
+        path = path or config.PROFILER_DUMP_FILE
+        data = {
+            'frames': self.frames,
+            'samples': self.samples,
+            'summary': self.summary(),
+            'timings': {name: list(buffer) for name, buffer in self.timings.items()},
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        return path
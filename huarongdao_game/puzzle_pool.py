@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+"""
+华容道分级题库
+按最优步数生成指定难度区间的棋盘，并预先构建按步数索引的题库文件，开局时O(1)抽题
+"""
+
+import bisect
+import mmap
+import os
+import random
+import struct
+from typing import Dict, List, Optional, Tuple
+import config
+from distance_table import SIZE as TABLE_SIZE, get_distance_table, state_tiles
+from solver import Solver
+
+# 文件格式：魔数 + 版本 + 棋盘尺寸 + 最小步数 + 最大步数，
+# 随后为(最大步数-最小步数+2)个uint32累计偏移，最后是按步数排序的棋盘记录（每条size*size字节）
+MAGIC = b'HRPP'
+VERSION = 1
+HEADER = struct.Struct('<4sBBBB')
+
+# 各尺寸已知的最大最优步数（3x3由距离表得到，4x4为已证明的80步）
+MAX_OPTIMAL_MOVES = {2: 6, 3: 31, 4: 80}
+# 没有距离表时反向随机游走的最多尝试次数
+MAX_GRADED_ATTEMPTS = 10000
+
+# 已加载的题库（None表示文件不存在）
+_loaded: Dict[int, Optional['PuzzlePool']] = {}
+
+
+def pool_path(size: int) -> str:
+    """获取指定尺寸的题库文件路径"""
+    return os.path.join(config.DATA_DIR, f"puzzle_pool_{size}x{size}.bin")
+
+
+def _random_walk(size: int, steps: int, rng: random.Random) -> List[int]:
+    """从目标状态反向随机走若干步（不立即回退）"""
+    tiles = list(range(1, size * size)) + [0]
+    blank, prev = size * size - 1, -1
+    for _ in range(steps):
+        row, col = divmod(blank, size)
+        options = [pos for pos, ok in ((blank - size, row > 0), (blank + size, row < size - 1),
+                                       (blank - 1, col > 0), (blank + 1, col < size - 1))
+                   if ok and pos != prev]
+        pos = rng.choice(options)
+        tiles[blank], tiles[pos] = tiles[pos], 0
+        prev, blank = blank, pos
+    return tiles
+
+
+def _check_range(size: int, min_moves: int, max_moves: int):
+    """步数区间为空或超出该尺寸的最大最优步数时报ValueError（否则生成会无限重试）"""
+    if min_moves > max_moves or max_moves < 0:
+        raise ValueError(f"步数区间为空: [{min_moves}, {max_moves}]")
+    limit = MAX_OPTIMAL_MOVES.get(size)
+    if limit is not None and min_moves > limit:
+        raise ValueError(f"{size}x{size}棋盘的最优步数最多为{limit}: [{min_moves}, {max_moves}]")
+
+
+def generate_graded_board(size: int, min_moves: int, max_moves: int,
+                          rng: random.Random = None, solver: Solver = None) -> Tuple[List[int], int]:
+    """
+    生成最优步数在[min_moves, max_moves]内的棋盘，返回(一维数字排列, 最优步数)
+    3x3在距离表中区间内的全部状态里均匀抽取；其他尺寸使用反向随机游走，
+    先用启发值剪掉过难的局面，再用求解器验证，尝试MAX_GRADED_ATTEMPTS次仍未得到时报ValueError
+    """
+    _check_range(size, min_moves, max_moves)
+    rng = rng or random.Random()
+    table = get_distance_table() if size == TABLE_SIZE else None
+    if table is not None:
+        drawn = table.random_state(min_moves, max_moves, rng)
+        if drawn is None:
+            raise ValueError(f"距离表中没有最优步数在[{min_moves}, {max_moves}]内的棋盘")
+        return drawn
+
+    solver = solver or Solver(size)
+    for _ in range(MAX_GRADED_ATTEMPTS):
+        numbers = _random_walk(size, rng.randint(max(min_moves, 0), 2 * max_moves), rng)
+        if solver.heuristic.estimate(numbers) > max_moves:
+            continue
+        distance = len(solver.solve([numbers[row * size:(row + 1) * size] for row in range(size)]))
+        if min_moves <= distance <= max_moves:
+            return numbers, distance
+    raise ValueError(f"尝试{MAX_GRADED_ATTEMPTS}次仍未生成最优步数在[{min_moves}, {max_moves}]内的棋盘")
+
+
+def _sample_table_states(per_distance: int, min_moves: int, max_moves: int,
+                         rng: random.Random) -> Dict[int, List[List[int]]]:
+    """3x3：从距离表的各步数状态中直接无放回抽样"""
+    table = get_distance_table()
+    buckets: Dict[int, List[List[int]]] = {}
+    for distance in range(min_moves, max_moves + 1):
+        states = table.states_at(distance)
+        picked = rng.sample(range(len(states)), min(per_distance, len(states)))
+        buckets[distance] = [state_tiles(states[i]) for i in picked]
+    return buckets
+
+
+def build_pool(size: int, min_moves: int, max_moves: int, per_distance: int = 100,
+               seed: int = None, path: str = None) -> str:
+    """构建按最优步数索引的题库文件（原子替换）"""
+    _check_range(size, min_moves, max_moves)
+    rng = random.Random(seed)
+    if size == TABLE_SIZE and get_distance_table() is not None:
+        buckets = _sample_table_states(per_distance, min_moves, max_moves, rng)
+    else:
+        buckets = {distance: [] for distance in range(min_moves, max_moves + 1)}
+        solver = Solver(size)
+        while any(len(boards) < per_distance for boards in buckets.values()):
+            # 只为尚未填满的步数生成，缩小搜索区间
+            missing = [distance for distance, boards in buckets.items() if len(boards) < per_distance]
+            numbers, distance = generate_graded_board(size, min(missing), max(missing), rng, solver)
+            if len(buckets[distance]) < per_distance:
+                buckets[distance].append(numbers)
+
+    path = path or pool_path(size)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, size, min_moves, max_moves))
+        offset = 0
+        offsets = [offset]
+        for distance in range(min_moves, max_moves + 1):
+            offset += len(buckets[distance])
+            offsets.append(offset)
+        f.write(struct.pack(f'<{len(offsets)}I', *offsets))
+        for distance in range(min_moves, max_moves + 1):
+            for numbers in buckets[distance]:
+                f.write(bytes(numbers))
+    os.replace(temp_path, path)
+    _loaded.pop(size, None)
+    return path
+
+
+class PuzzlePool:
+    """按最优步数索引的题库（mmap只读加载）"""
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            self._mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.size, self.min_moves, self.max_moves = HEADER.unpack_from(self._mapped, 0)
+        if magic != MAGIC or version != VERSION:
+            self._mapped.close()
+            raise ValueError(f"题库文件格式不正确: {path}")
+        count = self.max_moves - self.min_moves + 2
+        self.offsets = struct.unpack_from(f'<{count}I', self._mapped, HEADER.size)
+        self.records_start = HEADER.size + 4 * count
+        self.cells = self.size * self.size
+
+    def close(self):
+        """释放mmap映射"""
+        self._mapped.close()
+
+    def count(self, min_moves: int, max_moves: int) -> int:
+        """区间内的题目数量"""
+        start, end = self._bounds(min_moves, max_moves)
+        return max(0, end - start)
+
+    def _bounds(self, min_moves: int, max_moves: int) -> Tuple[int, int]:
+        """区间对应的记录下标范围[start, end)"""
+        low = max(min_moves, self.min_moves) - self.min_moves
+        high = min(max_moves, self.max_moves) - self.min_moves
+        if low > high:
+            return 0, 0
+        return self.offsets[low], self.offsets[high + 1]
+
+    def draw(self, min_moves: int, max_moves: int,
+             rng: random.Random = None) -> Optional[Tuple[List[int], int]]:
+        """O(1)随机抽取一道最优步数在区间内的题目，返回(一维数字排列, 最优步数)"""
+        start, end = self._bounds(min_moves, max_moves)
+        if end <= start:
+            return None
+        index = (rng or random).randrange(start, end)
+        offset = self.records_start + index * self.cells
+        numbers = list(self._mapped[offset:offset + self.cells])
+        # 由累计偏移得到该记录的步数
+        return numbers, self.min_moves + bisect.bisect_right(self.offsets, index) - 1
+
+
+def get_puzzle_pool(size: int) -> Optional[PuzzlePool]:
+    """获取指定尺寸的题库，文件不存在时返回None"""
+    if size not in _loaded:
+        try:
+            _loaded[size] = PuzzlePool(pool_path(size))
+        except FileNotFoundError:
+            _loaded[size] = None
+    return _loaded[size]
+
+
+def draw_graded_board(difficulty: str, rng: random.Random = None) -> Optional[Tuple[List[int], int]]:
+    """按难度配置的步数区间从题库抽题，没有题库或区间为空时返回None"""
+    level = config.DIFFICULTY_LEVELS[difficulty]
+    if 'moves' not in level:
+        return None
+    pool = get_puzzle_pool(level['size'])
+    if pool is None:
+        return None
+    return pool.draw(*level['moves'], rng=rng)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="构建华容道分级题库")
+    parser.add_argument('--per-distance', type=int, default=100, help="每个步数保存的题目数")
+    parser.add_argument('--seed', type=int, default=2024)
+    args = parser.parse_args()
+    for level in config.DIFFICULTY_LEVELS.values():
+        low, high = level['moves']
+        print(f"已生成: {build_pool(level['size'], low, high, args.per_distance, args.seed)}")
@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+"""
+华容道最优解求解器
+基于IDA*搜索，默认使用加性模式数据库，缺少数据库文件时使用曼哈顿距离 + 线性冲突启发函数（增量计算）；
+4x4在数秒内求解依赖预构建的模式数据库，退回线性冲突时随机4x4棋盘可能需要几分钟，可用max_nodes限制搜索量
+"""
+
+from typing import List, Optional, Sequence, Tuple
+import log
+from pattern_db import get_pattern_database
+from solvability import is_solvable
+
+logger = log.get_logger('solver')
+
+# 搜索找到解时的返回标记
+FOUND = -1
+INFINITY = float('inf')
+
+
+class ManhattanDistance:
+    """曼哈顿距离启发函数（支持增量更新）"""
+
+    def __init__(self, size: int):
+        self.size = size
+        cells = size * size
+        # distance[tile][pos]: 数字tile位于pos时到目标位置的曼哈顿距离
+        self.distance = [[0] * cells for _ in range(cells)]
+        self.goal_row = [0] * cells
+        self.goal_col = [0] * cells
+        for tile in range(1, cells):
+            goal_row, goal_col = divmod(tile - 1, size)
+            self.goal_row[tile] = goal_row
+            self.goal_col[tile] = goal_col
+            for pos in range(cells):
+                row, col = divmod(pos, size)
+                self.distance[tile][pos] = abs(row - goal_row) + abs(col - goal_col)
+
+    def estimate(self, tiles: Sequence[int]) -> int:
+        """完整计算启发值"""
+        return sum(self.distance[tile][pos] for pos, tile in enumerate(tiles) if tile)
+
+    def update(self, tiles: List[int], positions: List[int], h: int, tile: int, src: int, dst: int) -> int:
+        """增量更新启发值（tiles已完成移动：tile从src移到dst）"""
+        return h + self.distance[tile][dst] - self.distance[tile][src]
+
+
+class ManhattanLinearConflict(ManhattanDistance):
+    """曼哈顿距离 + 线性冲突启发函数（支持增量更新）"""
+
+    def __init__(self, size: int):
+        super().__init__(size)
+        # 行/列冲突值缓存，键为(方向, 行列号, 该行列内容)
+        self._conflict_cache = {}
+
+    def estimate(self, tiles: Sequence[int]) -> int:
+        """完整计算启发值"""
+        size = self.size
+        h = super().estimate(tiles)
+        for line in range(size):
+            h += self._row_conflict(line, tuple(tiles[line * size:(line + 1) * size]))
+            h += self._col_conflict(line, tuple(tiles[line::size]))
+        return h
+
+    def update(self, tiles: List[int], positions: List[int], h: int, tile: int, src: int, dst: int) -> int:
+        """增量更新启发值（tiles已完成移动：tile从src移到dst）"""
+        size = self.size
+        h += self.distance[tile][dst] - self.distance[tile][src]
+
+        if src - dst == 1 or dst - src == 1:
+            # 水平移动：行内顺序不变，只可能影响方块目标列所在的那一列
+            goal = self.goal_col[tile]
+            src_line, dst_line = src % size, dst % size
+            if goal == src_line or goal == dst_line:
+                after = tuple(tiles[goal::size])
+                tiles[src], tiles[dst] = tile, 0
+                before = tuple(tiles[goal::size])
+                tiles[src], tiles[dst] = 0, tile
+                h += self._col_conflict(goal, after) - self._col_conflict(goal, before)
+        else:
+            # 垂直移动：列内顺序不变，只可能影响方块目标行所在的那一行
+            goal = self.goal_row[tile]
+            src_line, dst_line = src // size, dst // size
+            if goal == src_line or goal == dst_line:
+                start = goal * size
+                after = tuple(tiles[start:start + size])
+                tiles[src], tiles[dst] = tile, 0
+                before = tuple(tiles[start:start + size])
+                tiles[src], tiles[dst] = 0, tile
+                h += self._row_conflict(goal, after) - self._row_conflict(goal, before)
+
+        return h
+
+    def _row_conflict(self, row: int, line: tuple) -> int:
+        """计算一行的线性冲突值"""
+        key = (0, row, line)
+        value = self._conflict_cache.get(key)
+        if value is None:
+            goals = [self.goal_col[tile] for tile in line if tile and self.goal_row[tile] == row]
+            value = self._conflict_cache[key] = self._line_conflict(goals)
+        return value
+
+    def _col_conflict(self, col: int, line: tuple) -> int:
+        """计算一列的线性冲突值"""
+        key = (1, col, line)
+        value = self._conflict_cache.get(key)
+        if value is None:
+            goals = [self.goal_row[tile] for tile in line if tile and self.goal_col[tile] == col]
+            value = self._conflict_cache[key] = self._line_conflict(goals)
+        return value
+
+    @staticmethod
+    def _line_conflict(goals: List[int]) -> int:
+        """线性冲突：需移出该行列的最少方块数×2（即 长度 - 最长递增子序列）"""
+        if len(goals) < 2:
+            return 0
+        longest = [1] * len(goals)
+        for i in range(1, len(goals)):
+            for j in range(i):
+                if goals[j] < goals[i] and longest[j] + 1 > longest[i]:
+                    longest[i] = longest[j] + 1
+        return 2 * (len(goals) - max(longest))
+
+
+class NodeLimitExceeded(Exception):
+    """搜索展开的节点数超过max_nodes（仅在求解器内部使用）"""
+
+
+class Solver:
+    """IDA*最优解求解器"""
+
+    def __init__(self, size: int, heuristic=None, max_nodes: Optional[int] = None):
+        self.size = size
+        self.heuristic = heuristic or default_heuristic(size)
+        self.max_nodes = max_nodes  # 每次求解最多展开的节点数，None为不限
+        self.nodes = 0  # 最近一次求解展开的节点数
+        # 预计算每个空格位置的相邻位置
+        self.neighbors = []
+        for pos in range(size * size):
+            row, col = divmod(pos, size)
+            adjacent = []
+            if row > 0:
+                adjacent.append(pos - size)
+            if row < size - 1:
+                adjacent.append(pos + size)
+            if col > 0:
+                adjacent.append(pos - 1)
+            if col < size - 1:
+                adjacent.append(pos + 1)
+            self.neighbors.append(tuple(adjacent))
+
+    def solve(self, board: List[List[int]]) -> Optional[List[Tuple[int, int]]]:
+        """
+        求解最优移动序列，返回可直接传给GameState.move_tile的(row, col)列表；
+        展开节点数超过max_nodes时放弃并返回None
+        """
+        size = self.size
+        tiles = [num for row in board for num in row]
+        if len(board) != size or len(tiles) != size * size:
+            raise ValueError(f"棋盘尺寸与求解器不一致: 期望{size}x{size}")
+        if sorted(tiles) != list(range(size * size)):
+            raise ValueError(f"棋盘必须恰好包含0到{size * size - 1}各一次")
+        if not is_solvable(tiles, size):
+            raise ValueError("棋盘不可解")
+
+        heuristic = self.heuristic
+        update = heuristic.update
+        neighbors = self.neighbors
+        positions = [0] * len(tiles)
+        for pos, tile in enumerate(tiles):
+            positions[tile] = pos
+        path: List[int] = []
+        nodes = 0
+        bound = 0
+        max_nodes = INFINITY if self.max_nodes is None else self.max_nodes
+
+        def search(blank: int, g: int, h: int, prev: int):
+            nonlocal nodes
+            nodes += 1
+            if nodes > max_nodes:
+                raise NodeLimitExceeded
+            if h == 0:
+                return FOUND
+            minimum = INFINITY
+            g += 1
+            for pos in neighbors[blank]:
+                if pos == prev:
+                    continue
+                tile = tiles[pos]
+                tiles[blank] = tile
+                tiles[pos] = 0
+                positions[tile] = blank
+                new_h = update(tiles, positions, h, tile, pos, blank)
+                f = g + new_h
+                if f <= bound:
+                    path.append(pos)
+                    f = search(pos, g, new_h, blank)
+                    if f == FOUND:
+                        return FOUND
+                    path.pop()
+                tiles[pos] = tile
+                tiles[blank] = 0
+                positions[tile] = pos
+                if f < minimum:
+                    minimum = f
+            return minimum
+
+        h = heuristic.estimate(tiles)
+        bound = h
+        blank = tiles.index(0)
+        while True:
+            try:
+                result = search(blank, 0, h, -1)
+            except NodeLimitExceeded:
+                self.nodes = nodes
+                return None
+            if result == FOUND:
+                self.nodes = nodes
+                return [divmod(pos, size) for pos in path]
+            if result == INFINITY:
+                self.nodes = nodes
+                return None
+            bound = result
+
+
+def default_heuristic(size: int):
+    """优先使用预构建的模式数据库，不存在时退回曼哈顿距离 + 线性冲突"""
+    database = get_pattern_database(size)
+    if database is not None:
+        return database
+    if size >= 4:
+        logger.warning("没有%dx%d模式数据库，退回线性冲突启发函数，求解可能需要几分钟；"
+                       "请先运行 python huarongdao_game/pattern_db.py %d", size, size, size)
+    return ManhattanLinearConflict(size)
+
+
+def solve(board: List[List[int]], heuristic=None,
+          max_nodes: Optional[int] = None) -> Optional[List[Tuple[int, int]]]:
+    """求解给定棋盘（GameState.board格式）的最优移动序列"""
+    return Solver(len(board), heuristic, max_nodes).solve(board)
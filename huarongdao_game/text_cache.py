@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+华容道文字渲染缓存
+按(字体, 文本, 抗锯齿, 颜色)缓存已渲染的文字Surface，避免每帧重复光栅化；
+容量有限（LRU淘汰），切换语言时整体失效
+"""
+
+from collections import OrderedDict
+from typing import Dict, Tuple
+import config
+
+
+class TextCache:
+    """有界LRU文字Surface缓存"""
+
+    def __init__(self, max_entries: int = None):
+        self.max_entries = max_entries or config.TEXT_CACHE_SIZE
+        self._surfaces: 'OrderedDict[tuple, object]' = OrderedDict()
+        self._language = config.LANGUAGE
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._surfaces)
+
+    def render(self, font, text: str, antialias: bool, color: Tuple[int, ...]):
+        """返回渲染好的文字Surface（调用方只读使用，不要修改返回的Surface）"""
+        if config.LANGUAGE != self._language:
+            # 切换语言后界面文本整体更换，旧条目不会再命中
+            self.clear()
+            self._language = config.LANGUAGE
+        key = (font, text, antialias, tuple(color))
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        """清空缓存（命中统计保留）"""
+        self._surfaces.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """命中统计"""
+        total = self.hits + self.misses
+        return {
+            'entries': len(self._surfaces),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
@@ -4,22 +4,77 @@
 用于验证核心功能的正确性
 """
 
+import contextlib
+import io
 import unittest
 import sys
+import json
 import os
+import random
+import tempfile
+import threading
+import time
+from unittest import mock
+
+import pygame
 
 # 添加项目根目录到Python路径
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, project_root)
 
 try:
-    from huarongdao_game.models import GameState, Leaderboard, LeaderboardEntry
-    from huarongdao_game.config import DIFFICULTY_LEVELS
+    from huarongdao_game.models import GameState, Leaderboard, LeaderboardEntry, open_leaderboard
+    from huarongdao_game.leaderboard_store import JournalStore
+    from huarongdao_game.leaderboard_sqlite import SELECT_TOP, SQLiteLeaderboard
+    from huarongdao_game.leaderboard_writer import AsyncLeaderboard
+    from huarongdao_game.config import (DIFFICULTY_LEVELS, IDLE_TIMEOUT_MS, MAX_LEADERBOARD_ENTRIES, TILE_SLIDE_MS,
+                                        switch_language)
+    from huarongdao_game.board import ArrayBoard, PackedBoard, make_board
+    from huarongdao_game.solvability import is_solvable, permutation_parity, random_solvable_permutation
+    from huarongdao_game.solver import ManhattanLinearConflict, Solver, solve
+    from huarongdao_game.pattern_db import PatternDatabase, build_database, get_pattern_database
+    from huarongdao_game.distance_table import (
+        DistanceTable, get_distance_table, rank_permutation, unrank_permutation, write_table
+    )
+    from huarongdao_game.puzzle_pool import PuzzlePool, build_pool, generate_graded_board
+    from huarongdao_game.batch_solver import UNSOLVABLE, iter_solutions, solve_many
+    from huarongdao_game.controllers import GameController, GameScreen
+    from huarongdao_game.renderer import GameRenderer
+    from huarongdao_game.text_cache import TextCache
+    from huarongdao_game.image_registry import ImageRegistry
+    from huarongdao_game.animation import SlideAnimator
+    from huarongdao_game.profiler import FrameProfiler, percentile
+    from huarongdao_game.fonts import LazyFonts, bundled_font, get_font, resolve_cjk_font
 except ImportError:
     # 如果上面的方式不行，尝试直接导入
     sys.path.insert(0, os.path.join(project_root, 'huarongdao_game'))
-    from models import GameState, Leaderboard, LeaderboardEntry
-    from config import DIFFICULTY_LEVELS
+    from models import GameState, Leaderboard, LeaderboardEntry, open_leaderboard
+    from leaderboard_store import JournalStore
+    from leaderboard_sqlite import SELECT_TOP, SQLiteLeaderboard
+    from leaderboard_writer import AsyncLeaderboard
+    from config import DIFFICULTY_LEVELS, IDLE_TIMEOUT_MS, MAX_LEADERBOARD_ENTRIES, TILE_SLIDE_MS, switch_language
+    from board import ArrayBoard, PackedBoard, make_board
+    from solvability import is_solvable, permutation_parity, random_solvable_permutation
+    from solver import ManhattanLinearConflict, Solver, solve
+    from pattern_db import PatternDatabase, build_database, get_pattern_database
+    from distance_table import DistanceTable, get_distance_table, rank_permutation, unrank_permutation, write_table
+    from puzzle_pool import PuzzlePool, build_pool, generate_graded_board
+    from batch_solver import UNSOLVABLE, iter_solutions, solve_many
+    from controllers import GameController, GameScreen
+    from renderer import GameRenderer
+    from text_cache import TextCache
+    from image_registry import ImageRegistry
+    from animation import SlideAnimator
+    from profiler import FrameProfiler, percentile
+    from fonts import LazyFonts, bundled_font, get_font, resolve_cjk_font
+
+
+def create_renderer(test_class):
+    """在setUpClass中创建渲染器：字体索引写入临时目录（测试类结束后删除），不修改assets/data"""
+    font_dir = tempfile.TemporaryDirectory()
+    test_class.addClassCleanup(font_dir.cleanup)
+    with mock.patch('config.FONT_INDEX_FILE', os.path.join(font_dir.name, 'font_index.json')):
+        return GameRenderer()
 
 
 class TestGameState(unittest.TestCase):
@@ -64,6 +119,12 @@ class TestGameState(unittest.TestCase):
         # 测试已知不可解的排列
         unsolvable_3x3 = [1, 2, 3, 4, 5, 6, 8, 7, 0]  # 交换7和8
         self.assertFalse(self.game_state._is_solvable(unsolvable_3x3, 3))
+        
+        # 偶数尺寸：已完成状态可解，交换两个数字后不可解
+        solvable_4x4 = list(range(1, 16)) + [0]
+        self.assertTrue(self.game_state._is_solvable(solvable_4x4, 4))
+        unsolvable_4x4 = list(range(1, 14)) + [15, 14, 0]
+        self.assertFalse(self.game_state._is_solvable(unsolvable_4x4, 4))
     
     def test_move_tile_valid(self):
         """测试有效移动"""
@@ -93,6 +154,962 @@ class TestGameState(unittest.TestCase):
         self.assertEqual(self.game_state.stats.moves, 0)
 
 
+class TestSolvability(unittest.TestCase):
+    """可解性与可解排列生成测试"""
+    
+    def test_parity(self):
+        """测试置换奇偶性"""
+        self.assertEqual(permutation_parity([1, 2, 3, 4, 5, 6, 7, 8, 0]), 0)
+        self.assertEqual(permutation_parity([1, 2, 3, 4, 5, 6, 8, 7, 0]), 1)
+        self.assertEqual(permutation_parity([1, 2, 3, 4, 5, 6, 7, 0, 8]), 1)
+    
+    def test_blank_moves_keep_solvable(self):
+        """测试空格移动后仍然可解"""
+        for size in (3, 4, 5):
+            numbers = list(range(1, size * size)) + [0]
+            numbers[-1], numbers[-2] = numbers[-2], numbers[-1]
+            self.assertTrue(is_solvable(numbers, size))
+            numbers[-2], numbers[-2 - size] = numbers[-2 - size], numbers[-2]
+            self.assertTrue(is_solvable(numbers, size))
+            self.assertFalse(is_solvable([2, 1] + numbers[2:], size))
+    
+    def test_generator_always_solvable(self):
+        """测试生成器只产生可解排列"""
+        import random
+        rng = random.Random(42)
+        for size in range(3, 11):
+            for _ in range(20):
+                numbers = random_solvable_permutation(size, rng)
+                self.assertEqual(sorted(numbers), list(range(size * size)))
+                self.assertTrue(is_solvable(numbers, size))
+
+
+class TestBatchGenerator(unittest.TestCase):
+    """批量生成测试"""
+    
+    def setUp(self):
+        """批量生成依赖NumPy"""
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            self.skipTest("批量生成需要NumPy")
+        try:
+            from huarongdao_game.generator import generate_boards
+        except ImportError:
+            from generator import generate_boards
+        self.generate_boards = generate_boards
+    
+    def test_boards_are_solvable_permutations(self):
+        """测试生成结果均为可解排列"""
+        for size in (3, 4, 6):
+            boards = self.generate_boards(size, 500, seed=1, chunk_size=128)
+            self.assertEqual(boards.shape, (500, size * size))
+            self.assertEqual(boards.dtype.name, 'uint8')
+            for board in boards:
+                numbers = [int(num) for num in board]
+                self.assertEqual(sorted(numbers), list(range(size * size)))
+                self.assertTrue(is_solvable(numbers, size))
+    
+    def test_seed_and_npy_stream(self):
+        """测试相同种子结果一致，且流式写入与内存结果相同"""
+        import numpy as np
+        boards = self.generate_boards(4, 1000, seed=7, chunk_size=300)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'boards.npy')
+            streamed = self.generate_boards(4, 1000, seed=7, path=path, chunk_size=300)
+            self.assertTrue(np.array_equal(boards, streamed))
+            self.assertTrue(np.array_equal(boards, np.load(path)))
+            del streamed
+
+
+class TestBoard(unittest.TestCase):
+    """紧凑棋盘表示测试"""
+    
+    def test_representation_by_size(self):
+        """测试按尺寸选择棋盘表示"""
+        self.assertIsInstance(make_board(4, list(range(1, 16)) + [0]), PackedBoard)
+        self.assertIsInstance(make_board(5, list(range(1, 25)) + [0]), ArrayBoard)
+    
+    def test_move_and_solved(self):
+        """测试移动、空格跟踪与完成判断"""
+        for size in (3, 4, 5):
+            tiles = list(range(1, size * size)) + [0]
+            board = make_board(size, tiles)
+            self.assertTrue(board.is_solved())
+            self.assertFalse(board.move(0))  # 不相邻
+            self.assertTrue(board.move(size * size - 2))
+            self.assertEqual(board.empty, size * size - 2)
+            self.assertEqual(board.misplaced, 1)
+            self.assertFalse(board.is_solved())
+            self.assertTrue(board.move(size * size - 1))
+            self.assertTrue(board.is_solved())
+            self.assertEqual(board.to_list(), tiles)
+    
+    def test_hash_and_copy(self):
+        """测试哈希、比较与复制"""
+        for size in (4, 5):
+            tiles = list(range(1, size * size)) + [0]
+            board = make_board(size, tiles)
+            moved = board.copy()
+            moved.move(size * size - 2)
+            self.assertNotEqual(board, moved)
+            self.assertEqual(len({board, moved, make_board(size, tiles)}), 2)
+            moved.move(size * size - 1)
+            self.assertEqual(board, moved)
+            self.assertEqual(hash(board), hash(moved))
+    
+    def test_rows_view(self):
+        """测试二维列表视图与GameState同步"""
+        game_state = GameState()
+        game_state.initialize_board(4, 'NUMBERS')
+        empty_row, empty_col = game_state.empty_pos
+        target = (empty_row - 1, empty_col) if empty_row > 0 else (empty_row + 1, empty_col)
+        self.assertTrue(game_state.move_tile(*target))
+        self.assertEqual(game_state.board, game_state.cells.to_rows())
+
+
+class TestSolver(unittest.TestCase):
+    """求解器测试"""
+    
+    def test_solved_board(self):
+        """测试已完成的棋盘无需移动"""
+        self.assertEqual(solve([[1, 2, 3], [4, 5, 6], [7, 8, 0]]), [])
+    
+    def test_known_optimal_length(self):
+        """测试已知最优步数的棋盘"""
+        # 3x3最难局面之一，最优解为31步
+        board = [[8, 6, 7], [2, 5, 4], [3, 0, 1]]
+        self.assertEqual(len(solve(board)), 31)
+    
+    def test_known_optimal_length_4x4(self):
+        """测试4x4棋盘的最优步数"""
+        board = [[6, 11, 2, 3], [9, 0, 5, 10], [13, 1, 15, 4], [14, 8, 12, 7]]
+        self.assertEqual(len(Solver(4).solve(board)), 34)
+    
+    def test_moves_replay_on_game_state(self):
+        """测试求解结果可以直接在GameState上回放（随机4x4需要预构建的模式数据库）"""
+        for size in (3, 4):
+            with self.subTest(size=size):
+                if size > 3 and get_pattern_database(size) is None:
+                    self.skipTest(f"没有{size}x{size}模式数据库，随机棋盘求解可能需要几分钟")
+                # 固定种子：随机4x4的求解耗时相差很大，选一个用模式数据库不到1秒的棋盘
+                game_state = GameState()
+                game_state.load_board(size, random_solvable_permutation(size, random.Random(7)))
+                moves = Solver(size).solve(game_state.board)
+                for row, col in moves:
+                    self.assertTrue(game_state.move_tile(row, col))
+                self.assertTrue(game_state.is_solved)
+    
+    def test_unsolvable_board(self):
+        """测试不可解的棋盘"""
+        with self.assertRaises(ValueError):
+            solve([[1, 2, 3], [4, 5, 6], [8, 7, 0]])
+    
+    def test_malformed_board(self):
+        """测试数字重复或越界的棋盘报ValueError（而不是无限搜索或IndexError）"""
+        for board in ([[1, 1, 3], [4, 5, 6], [7, 8, 0]], [[1, 2, 3], [4, 5, 6], [7, 10, 0]]):
+            with self.assertRaises(ValueError):
+                solve(board)
+    
+    def test_node_limit(self):
+        """测试超过节点预算时放弃搜索并返回None"""
+        solver = Solver(3, ManhattanLinearConflict(3), max_nodes=10)
+        self.assertIsNone(solver.solve([[8, 6, 7], [2, 5, 4], [3, 0, 1]]))
+        self.assertEqual(solver.nodes, 11)
+
+
+class TestPatternDatabase(unittest.TestCase):
+    """模式数据库测试"""
+    
+    def setUp(self):
+        """构建3x3的4-4分组数据库到临时文件"""
+        try:
+            import numpy  # noqa: F401
+        except ImportError:
+            self.skipTest("构建模式数据库需要NumPy")
+        self.temp_dir = tempfile.TemporaryDirectory()
+        path = os.path.join(self.temp_dir.name, 'pattern_db_3x3.bin')
+        build_database(3, ((1, 2, 3, 4), (5, 6, 7, 8)), path)
+        self.database = PatternDatabase.load(3, path)
+    
+    def tearDown(self):
+        """测试后清理"""
+        self.database.close()
+        self.temp_dir.cleanup()
+    
+    def test_goal_is_zero(self):
+        """测试目标状态的启发值为0"""
+        self.assertEqual(self.database.estimate([1, 2, 3, 4, 5, 6, 7, 8, 0]), 0)
+    
+    def test_optimal_with_pattern_database(self):
+        """测试使用模式数据库仍然得到最优解"""
+        board = [[8, 6, 7], [2, 5, 4], [3, 0, 1]]
+        tiles = [num for row in board for num in row]
+        self.assertLessEqual(self.database.estimate(tiles), 31)
+        self.assertEqual(len(Solver(3, self.database).solve(board)), 31)
+
+
+class TestDistanceTable(unittest.TestCase):
+    """3x3距离表测试"""
+    
+    @classmethod
+    def setUpClass(cls):
+        """生成距离表到临时文件"""
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.table = DistanceTable(write_table(os.path.join(cls.temp_dir.name, 'distance_table_3x3.bin')))
+    
+    @classmethod
+    def tearDownClass(cls):
+        """测试后清理"""
+        cls.table.close()
+        cls.temp_dir.cleanup()
+    
+    def test_rank_round_trip(self):
+        """测试排列排名与还原互逆"""
+        for rank in (0, 1, 12345, 40319):
+            self.assertEqual(rank_permutation(unrank_permutation(rank, 8)), rank)
+    
+    def test_known_distances(self):
+        """测试已知局面的最优步数"""
+        self.assertEqual(self.table.distance([[1, 2, 3], [4, 5, 6], [7, 8, 0]]), 0)
+        self.assertEqual(self.table.distance([[1, 2, 3], [4, 5, 6], [7, 0, 8]]), 1)
+        self.assertEqual(self.table.distance([[8, 6, 7], [2, 5, 4], [3, 0, 1]]), 31)
+    
+    def test_hint_follows_optimal_path(self):
+        """测试按提示移动可以用最优步数完成"""
+        game_state = GameState()
+        game_state.initialize_board(3, 'NUMBERS')
+        distance = self.table.distance(game_state.board)
+        for _ in range(distance):
+            self.assertTrue(game_state.move_tile(*self.table.best_move(game_state.board)))
+        self.assertTrue(game_state.is_solved)
+        self.assertIsNone(self.table.best_move(game_state.board))
+    
+    def test_initialize_board_distance_range(self):
+        """测试按最优步数范围生成棋盘"""
+        game_state = GameState()
+        game_state.initialize_board(3, 'NUMBERS', distance_range=(10, 12))
+        if game_state.optimal_moves is None:
+            self.skipTest("assets/data中缺少3x3距离表")
+        self.assertTrue(10 <= game_state.optimal_moves <= 12)
+        self.assertEqual(self.table.distance(game_state.board), game_state.optimal_moves)
+    
+    def test_unreachable_distance_range(self):
+        """测试超出表中最大步数的范围立即报错，而不是无限重抽"""
+        self.assertEqual(self.table.max_distance, 31)
+        if get_distance_table() is None:
+            self.skipTest("assets/data中缺少3x3距离表")
+        with self.assertRaises(ValueError):
+            GameState().initialize_board(3, 'NUMBERS', distance_range=(32, 40))
+    
+    def test_narrowest_distance_range(self):
+        """测试只有少数状态的步数区间也能直接抽到（31步只有2个状态）"""
+        if get_distance_table() is None:
+            self.skipTest("assets/data中缺少3x3距离表")
+        game_state = GameState()
+        for _ in range(20):
+            game_state.initialize_board(3, 'NUMBERS', distance_range=(31, 31))
+            self.assertEqual(game_state.optimal_moves, 31)
+            self.assertEqual(self.table.distance(game_state.board), 31)
+    
+    def test_random_state_uniform_over_range(self):
+        """测试random_state覆盖区间内的全部状态"""
+        rng = random.Random(5)
+        drawn = {tuple(self.table.random_state(0, 2, rng)[0]) for _ in range(200)}
+        self.assertEqual(len(drawn), len(self.table.states_at(0)) + len(self.table.states_at(1))
+                         + len(self.table.states_at(2)))
+        self.assertIsNone(self.table.random_state(32, 40, rng))
+        self.assertIsNone(self.table.random_state(12, 10, rng))
+
+
+class TestPuzzlePool(unittest.TestCase):
+    """分级题库测试"""
+    
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.rng = random.Random(7)
+    
+    def tearDown(self):
+        """测试后清理"""
+        self.temp_dir.cleanup()
+    
+    def test_build_and_draw_3x3(self):
+        """测试3x3题库按步数索引，抽出的题目步数在区间内"""
+        path = build_pool(3, 10, 12, per_distance=5, seed=1,
+                          path=os.path.join(self.temp_dir.name, 'puzzle_pool_3x3.bin'))
+        pool = PuzzlePool(path)
+        try:
+            self.assertEqual(pool.count(10, 12), 15)
+            self.assertEqual(pool.count(11, 11), 5)
+            self.assertEqual(pool.count(20, 30), 0)
+            self.assertIsNone(pool.draw(20, 30, self.rng))
+            for _ in range(20):
+                numbers, moves = pool.draw(11, 12, self.rng)
+                self.assertTrue(11 <= moves <= 12)
+                self.assertTrue(is_solvable(numbers, 3))
+                self.assertEqual(len(solve([numbers[i:i + 3] for i in range(0, 9, 3)])), moves)
+        finally:
+            pool.close()
+    
+    def test_generate_graded_board_4x4(self):
+        """测试4x4按步数区间生成棋盘"""
+        numbers, moves = generate_graded_board(4, 8, 10, self.rng)
+        self.assertTrue(8 <= moves <= 10)
+        self.assertEqual(len(solve([numbers[i:i + 4] for i in range(0, 16, 4)])), moves)
+    
+    def test_unreachable_range(self):
+        """测试区间为空或超出最大最优步数时立即报错，而不是无限重试"""
+        path = os.path.join(self.temp_dir.name, 'puzzle_pool.bin')
+        for size, low, high in ((3, 32, 40), (3, 12, 10), (4, 81, 90)):
+            with self.assertRaises(ValueError):
+                generate_graded_board(size, low, high, self.rng)
+            with self.assertRaises(ValueError):
+                build_pool(size, low, high, per_distance=1, seed=1, path=path)
+        self.assertFalse(os.path.exists(path))
+    
+    def test_generate_graded_board_3x3_narrow(self):
+        """测试3x3只有2个状态的最大步数也能直接生成"""
+        numbers, moves = generate_graded_board(3, 31, 31, self.rng)
+        self.assertEqual(moves, 31)
+        self.assertEqual(len(solve([numbers[i:i + 3] for i in range(0, 9, 3)])), 31)
+    
+    def test_load_board(self):
+        """测试使用题库题目初始化游戏"""
+        game_state = GameState()
+        game_state.load_board(3, [1, 2, 3, 4, 5, 6, 7, 0, 8], optimal_moves=1)
+        self.assertEqual(game_state.board, [[1, 2, 3], [4, 5, 6], [7, 0, 8]])
+        self.assertEqual(game_state.empty_pos, (2, 1))
+        self.assertEqual(game_state.optimal_moves, 1)
+        self.assertTrue(game_state.game_ready)
+        with self.assertRaises(ValueError):
+            game_state.load_board(3, [2, 1, 3, 4, 5, 6, 7, 8, 0])
+
+
+class TestBatchSolver(unittest.TestCase):
+    """批量求解测试"""
+    
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        rng = random.Random(3)
+        self.boards = [random_solvable_permutation(3, rng) for _ in range(12)]
+        self.expected = [len(solve([board[i:i + 3] for i in range(0, 9, 3)])) for board in self.boards]
+    
+    def tearDown(self):
+        """测试后清理"""
+        self.temp_dir.cleanup()
+    
+    def test_results_in_order(self):
+        """测试多进程求解结果按输入顺序返回"""
+        boards = self.boards + [[2, 1, 3, 4, 5, 6, 7, 8, 0]]
+        moves = [moves for moves, _ in iter_solutions(boards, workers=2, batch_size=5)]
+        self.assertEqual(moves, self.expected + [UNSOLVABLE])
+    
+    def test_jsonl_output(self):
+        """测试JSONL输出包含玩家步数与超出最优解的步数"""
+        path = os.path.join(self.temp_dir.name, 'results.jsonl')
+        player_moves = [moves + 4 for moves in self.expected]
+        self.assertEqual(solve_many(self.boards, path, workers=2, player_moves=player_moves), 12)
+        with open(path, 'r', encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual([record['index'] for record in records], list(range(12)))
+        self.assertEqual([record['moves'] for record in records], self.expected)
+        self.assertTrue(all(record['excess'] == 4 for record in records))
+    
+    def test_npy_output(self):
+        """测试NPY输出"""
+        try:
+            import numpy as np
+        except ImportError:
+            self.skipTest("需要NumPy")
+        path = os.path.join(self.temp_dir.name, 'results.npy')
+        solve_many(np.array(self.boards, dtype=np.uint8), path, workers=2)
+        self.assertEqual(np.load(path).tolist(), self.expected)
+    
+    def test_npy_output_from_iterator(self):
+        """测试NPY输出接受不支持len()的输入（如生成器）"""
+        try:
+            import numpy as np
+        except ImportError:
+            self.skipTest("需要NumPy")
+        path = os.path.join(self.temp_dir.name, 'results.npy')
+        self.assertEqual(solve_many(iter(self.boards), path, workers=2), 12)
+        self.assertEqual(np.load(path).tolist(), self.expected)
+        self.assertFalse(os.path.exists(path + '.tmp'))
+    
+    def test_malformed_boards(self):
+        """测试数字重复、越界或长度不符的棋盘记为UNSOLVABLE，不影响其他棋盘"""
+        malformed = [[1, 1, 3, 4, 5, 6, 7, 8, 0], [1, 2, 3, 4, 5, 6, 7, 10, 0], [1, 2, 3]]
+        moves = [moves for moves, _ in iter_solutions(malformed + self.boards[:2], size=3, workers=2)]
+        self.assertEqual(moves, [UNSOLVABLE] * 3 + self.expected[:2])
+
+
+class TestHeadlessController(unittest.TestCase):
+    """无界面控制器测试"""
+    
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        leaderboard = Leaderboard(os.path.join(self.temp_dir.name, 'leaderboard.json'))
+        self.controller = GameController(leaderboard=leaderboard)
+        self.layout = self.controller.layout
+    
+    def tearDown(self):
+        """测试后清理"""
+        self.temp_dir.cleanup()
+    
+    def test_scripted_session(self):
+        """测试不创建窗口完成一局：选择模式、难度、按最优解点击方块、确认成绩"""
+        numbers_button = self.layout.main_menu()[0]
+        self.controller.click(numbers_button.center)
+        self.assertEqual(self.controller.current_screen, GameScreen.DIFFICULTY_SELECT)
+        
+        easy_button = dict((action, button) for button, action in self.layout.difficulty_menu('NUMBERS'))['EASY']
+        self.controller.click(easy_button.center)
+        self.assertEqual(self.controller.current_screen, GameScreen.GAME_PLAY)
+        game_state = self.controller.game_state
+        self.assertEqual(game_state.size, 3)
+        
+        for row, col in solve(game_state.board):
+            self.controller.click(self.layout.tile_rect(game_state.size, row, col).center)
+        self.assertEqual(self.controller.current_screen, GameScreen.GAME_COMPLETE)
+        
+        self.controller.click(self.layout.completion_ok_button().center)
+        self.assertEqual(self.controller.current_screen, GameScreen.LEADERBOARD)
+        self.assertEqual(len(self.controller.leaderboard.entries), 1)
+    
+    def test_tile_hit_testing(self):
+        """测试点击位置与方块坐标互相对应"""
+        for size in (3, 4):
+            for row in range(size):
+                for col in range(size):
+                    rect = self.layout.tile_rect(size, row, col)
+                    self.assertEqual(self.layout.tile_at(rect.center, size), (row, col))
+        self.assertEqual(self.layout.tile_at((0, 0), 3), (-1, -1))
+    
+    def test_button_map_cached(self):
+        """测试按钮命中表按界面状态只构建一次，点击按分带查找到对应动作"""
+        buttons = self.layout.button_map('main_menu')
+        self.assertIs(self.layout.button_map('main_menu'), buttons)
+        for rect, action in buttons.buttons:
+            self.assertEqual(buttons.hit(rect.center), action)
+        self.assertIsNone(buttons.hit((0, self.layout.height - 1)))
+        self.assertIsNot(self.layout.button_map('difficulty_select', 'IMAGES'),
+                         self.layout.button_map('difficulty_select', 'NUMBERS'))
+        switch_language()
+        try:
+            self.assertIsNot(self.layout.button_map('main_menu'), buttons)
+        finally:
+            switch_language()
+    
+    def test_leaderboard_click_does_not_query(self):
+        """测试排行榜界面的点击不查询排行榜"""
+        self.controller.current_screen = GameScreen.LEADERBOARD
+        medium_button = self.layout.leaderboard()[3]
+        with mock.patch.object(self.controller.leaderboard, 'get_entries_by_difficulty_and_mode') as query:
+            self.controller.click(medium_button.center)
+        query.assert_not_called()
+        self.assertEqual(self.controller.leaderboard_filter_difficulty, 'MEDIUM')
+    
+    def test_frame_timeout(self):
+        """测试静态画面长时间等待，计时中在下一整秒醒来"""
+        self.assertEqual(self.controller.next_frame_timeout(), IDLE_TIMEOUT_MS)
+        self.controller.start_new_game('EASY')
+        self.controller.current_screen = GameScreen.GAME_PLAY
+        self.assertEqual(self.controller.next_frame_timeout(), IDLE_TIMEOUT_MS)
+        self.controller.game_state.start_game()
+        self.assertTrue(1 <= self.controller.next_frame_timeout() <= 1001)
+
+
+class TestDirtyRendering(unittest.TestCase):
+    """脏矩形渲染测试（使用dummy视频驱动，不打开窗口）"""
+    
+    @classmethod
+    def setUpClass(cls):
+        """创建渲染器"""
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        cls.renderer = create_renderer(cls)
+    
+    def setUp(self):
+        """开始一局并完成首帧整屏绘制"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.controller = GameController(leaderboard=Leaderboard(os.path.join(self.temp_dir.name, 'lb.json')),
+                                         layout=self.renderer.layout)
+        self.controller.start_new_game('EASY')
+        self.controller.current_screen = GameScreen.GAME_PLAY
+        self.controller.render_current_screen(self.renderer)
+    
+    def tearDown(self):
+        """测试后清理"""
+        self.temp_dir.cleanup()
+    
+    def test_idle_frame_pushes_nothing(self):
+        """测试画面无变化时不重绘任何区域"""
+        self.assertFalse(self.renderer.begin_frame(self.controller.frame_key()))
+        self.renderer.refresh_game_screen(self.controller.game_state)
+        self.assertEqual(self.renderer.dirty_rects, [])
+    
+    def test_move_redraws_two_tiles_and_info(self):
+        """测试移动一步只重绘两个格子和信息栏"""
+        game_state = self.controller.game_state
+        row, col = game_state.empty_pos
+        target = (row - 1, col) if row > 0 else (row + 1, col)
+        self.assertTrue(game_state.move_tile(*target))
+        self.assertFalse(self.renderer.begin_frame(self.controller.frame_key()))
+        self.renderer.refresh_game_screen(game_state)
+        layout = self.renderer.layout
+        self.assertEqual(len(self.renderer.dirty_rects), 3)
+        self.assertIn(layout.tile_rect(3, *target), self.renderer.dirty_rects)
+        self.assertIn(layout.tile_rect(3, row, col), self.renderer.dirty_rects)
+    
+    def test_screen_change_forces_full_redraw(self):
+        """测试切换画面或重新发牌时整屏重绘"""
+        self.controller.restart_current_game()
+        self.assertTrue(self.renderer.begin_frame(self.controller.frame_key()))
+        self.controller.current_screen = GameScreen.MAIN_MENU
+        self.assertTrue(self.renderer.begin_frame(self.controller.frame_key()))
+
+
+class TestAnimation(unittest.TestCase):
+    """方块滑动动画测试（时间来源替换为可控时钟）"""
+    
+    @classmethod
+    def setUpClass(cls):
+        """创建渲染器"""
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        cls.renderer = create_renderer(cls)
+    
+    def setUp(self):
+        """开始一局并完成首帧整屏绘制"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.now = 0.0
+        self.controller = GameController(leaderboard=Leaderboard(os.path.join(self.temp_dir.name, 'lb.json')),
+                                         layout=self.renderer.layout)
+        self.controller.animator.clock = lambda: self.now
+        self.controller.start_new_game('EASY', self.renderer)
+        self.controller.current_screen = GameScreen.GAME_PLAY
+        self.controller.render_current_screen(self.renderer)
+    
+    def tearDown(self):
+        """测试后清理"""
+        self.temp_dir.cleanup()
+    
+    def run_frames(self, count):
+        """按60FPS渲染若干帧"""
+        for _ in range(count):
+            self.now += 1 / 60
+            self.controller.render_current_screen(self.renderer)
+    
+    def click_next_to_empty(self):
+        """点击空格上方（或下方）的方块，返回该方块位置与原空格位置"""
+        game_state = self.controller.game_state
+        row, col = game_state.empty_pos
+        target = (row - 1, col) if row > 0 else (row + 1, col)
+        self.controller.click(self.renderer.layout.tile_rect(3, *target).center, self.renderer)
+        return target, (row, col)
+    
+    def test_fixed_timestep_progress(self):
+        """测试进度随时间单调增加，与帧间隔无关地在设定时长后结束"""
+        animator = SlideAnimator(duration_ms=100, step_ms=4, clock=lambda: self.now)
+        animator.start(5, (0, 0), (0, 1))
+        progress = []
+        for frame_ms in (7, 16, 16, 33, 16):
+            self.now += frame_ms / 1000
+            slide = animator.advance()
+            progress.append(slide.progress)
+        self.assertEqual(progress, sorted(progress))
+        self.assertTrue(0 < progress[0] and progress[-1] < 1)
+        self.now += 0.016
+        self.assertIsNone(animator.advance())
+        self.assertEqual(animator.frame_stats()['frames'], 6)
+        self.assertEqual(animator.frame_stats()['over_budget'], 1)
+    
+    def test_clicks_queued_during_slide(self):
+        """测试滑动期间的点击排队，动画结束后依次执行"""
+        target, empty = self.click_next_to_empty()
+        game_state = self.controller.game_state
+        self.assertTrue(self.controller.is_animating())
+        self.assertEqual(self.controller.next_frame_timeout(), 0)
+        # 把刚移动的方块点回原位：动画期间只排队，不改变棋盘
+        self.controller.click(self.renderer.layout.tile_rect(3, *empty).center, self.renderer)
+        self.assertEqual(game_state.stats.moves, 1)
+        
+        self.run_frames(TILE_SLIDE_MS // 16 + 1)
+        self.assertEqual(game_state.stats.moves, 2)
+        self.assertEqual(game_state.empty_pos, empty)
+        self.assertEqual(self.controller.animator.slide.to_cell, target)
+        self.run_frames(TILE_SLIDE_MS // 16 + 1)
+        self.assertFalse(self.controller.is_animating())
+    
+    def test_slide_redraws_swept_rect_only(self):
+        """测试动画帧只重绘滑动方块扫过的矩形"""
+        target, empty = self.click_next_to_empty()
+        self.controller.render_current_screen(self.renderer)
+        self.now += 0.03
+        self.controller.update_animation(self.renderer)
+        self.assertFalse(self.renderer.begin_frame(self.controller.frame_key()))
+        self.renderer.refresh_game_screen(self.controller.game_state, self.controller.animator.slide)
+        layout = self.renderer.layout
+        self.assertEqual(self.renderer.dirty_rects, [layout.tile_rect(3, *target).union(layout.tile_rect(3, *empty))])
+        self.renderer.update_display()
+    
+    def test_headless_moves_not_animated(self):
+        """测试没有渲染器时移动立即生效，不播放动画"""
+        controller = GameController(leaderboard=self.controller.leaderboard)
+        controller.start_new_game('EASY')
+        controller.current_screen = GameScreen.GAME_PLAY
+        row, col = controller.game_state.empty_pos
+        target = (row - 1, col) if row > 0 else (row + 1, col)
+        controller.click(controller.layout.tile_rect(3, *target).center)
+        self.assertFalse(controller.is_animating())
+        self.assertEqual(controller.game_state.empty_pos, target)
+
+
+class TestFrameProfiler(unittest.TestCase):
+    """帧耗时分析测试"""
+    
+    def setUp(self):
+        """创建独立的渲染器与控制器（分析器会替换实例上的方法）"""
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        self.temp_dir = tempfile.TemporaryDirectory()
+        with mock.patch('config.FONT_INDEX_FILE', os.path.join(self.temp_dir.name, 'font_index.json')):
+            self.renderer = GameRenderer()
+        self.controller = GameController(leaderboard=Leaderboard(os.path.join(self.temp_dir.name, 'lb.json')),
+                                         layout=self.renderer.layout)
+    
+    def tearDown(self):
+        """测试后清理"""
+        self.temp_dir.cleanup()
+    
+    def test_percentiles(self):
+        """测试最近秩百分位数"""
+        values = [float(v) for v in range(1, 101)]
+        self.assertEqual([percentile(values, q) for q in (50, 95, 99)], [50.0, 95.0, 99.0])
+        self.assertEqual(percentile([3.0], 99), 3.0)
+        self.assertEqual(percentile([], 50), 0.0)
+    
+    def test_ring_buffer_bounded(self):
+        """测试每个阶段只保留最近的帧"""
+        profiler = FrameProfiler(samples=5)
+        for _ in range(10):
+            profiler.begin_frame()
+            profiler.end_frame()
+        self.assertEqual(profiler.frames, 10)
+        self.assertEqual(len(profiler.timings['frame']), 5)
+    
+    def test_instrumented_frame(self):
+        """测试记录事件处理、各draw_*方法与显示提交，并写出JSON"""
+        profiler = FrameProfiler(overlay=True)
+        profiler.instrument(self.controller, self.renderer)
+        self.controller.start_new_game('EASY', self.renderer)
+        self.controller.current_screen = GameScreen.GAME_PLAY
+        for _ in range(3):
+            profiler.begin_frame()
+            self.controller.handle_events([], self.renderer)
+            self.controller.render_current_screen(self.renderer)
+            profiler.end_frame()
+        summary = profiler.summary()
+        for phase in ('frame', 'handle_events', 'draw_game_screen', 'draw_game_board', 'update_display'):
+            self.assertIn(phase, summary)
+        self.assertEqual(summary['draw_game_screen']['count'], 1)
+        self.assertEqual(summary['frame']['count'], 3)
+        
+        dump_file = os.path.join(self.temp_dir.name, 'profile.json')
+        profiler.dump(dump_file)
+        with open(dump_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        self.assertEqual(data['frames'], 3)
+        self.assertEqual(len(data['timings']['frame']), 3)
+    
+    def test_disabled_by_default(self):
+        """测试关闭时不创建分析器，也不替换任何方法"""
+        self.assertIsNone(FrameProfiler.from_config(self.controller, self.renderer))
+        self.assertNotIn('draw_game_screen', vars(self.renderer))
+        self.assertNotIn('handle_events', vars(self.controller))
+
+
+class TestLogging(unittest.TestCase):
+    """日志测试：热路径在调试开关关闭时不输出也不调用记录器"""
+    
+    def setUp(self):
+        """测试前准备"""
+        self.game_state = GameState()
+        self.game_state.initialize_board(3, 'NUMBERS')
+    
+    def move_next_to_empty(self):
+        row, col = self.game_state.empty_pos
+        self.assertTrue(self.game_state.move_tile(row - 1 if row > 0 else row + 1, col))
+    
+    def test_hot_path_silent(self):
+        """测试关闭DEBUG_LOG时移动与启动计时不写标准输出、不调用记录器"""
+        output = io.StringIO()
+        with mock.patch('models.logger') as logger, contextlib.redirect_stdout(output):
+            self.move_next_to_empty()
+        self.assertEqual(output.getvalue(), '')
+        logger.debug.assert_not_called()
+    
+    def test_debug_flag_lazy_arguments(self):
+        """测试开启调试开关后记录移动，参数交给记录器延迟格式化"""
+        with mock.patch('log.DEBUG', True), mock.patch('models.logger') as logger:
+            self.move_next_to_empty()
+        message, *args = logger.debug.call_args_list[-1][0]
+        self.assertIn('%d', message)
+        self.assertEqual(args[-1], 1)
+
+
+class TestTileAtlas(unittest.TestCase):
+    """图片模式方块图集测试"""
+    
+    @classmethod
+    def setUpClass(cls):
+        """创建渲染器"""
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        cls.renderer = create_renderer(cls)
+        if not cls.renderer.images:
+            raise unittest.SkipTest("assets/images中没有图片")
+        cls.image_key = sorted(cls.renderer.images)[0]
+    
+    def test_atlas_cached_and_prescaled(self):
+        """测试同一图片和尺寸只构建一次，方块已缩放到方块内尺寸"""
+        tiles = self.renderer.get_tile_atlas(self.image_key, 4)
+        self.assertIs(self.renderer.get_tile_atlas(self.image_key, 4), tiles)
+        self.assertEqual(sorted(tiles), list(range(1, 16)))
+        inner_size = self.renderer.tile_size - 6
+        self.assertTrue(all(tile.get_size() == (inner_size, inner_size) for tile in tiles.values()))
+    
+    def test_draw_without_rescaling(self):
+        """测试绘制图片模式棋盘与选择界面时不再逐帧缩放"""
+        game_state = GameState()
+        game_state.initialize_board(3, 'IMAGES')
+        self.renderer.prepare_puzzle_images(game_state, self.image_key)
+        self.renderer.images.ensure_loaded()
+        self.renderer.draw_image_selection_menu(self.renderer.images)
+        with mock.patch('pygame.transform.scale') as scale, mock.patch('pygame.transform.smoothscale') as smoothscale:
+            self.renderer.draw_game_screen(game_state)
+            self.renderer.draw_image_selection_menu(self.renderer.images)
+        scale.assert_not_called()
+        smoothscale.assert_not_called()
+    
+    def test_selection_menu_does_not_wait_for_decoding(self):
+        """测试图片选择界面不阻塞等待解码"""
+        with mock.patch.object(self.renderer.images, 'ensure_loaded') as ensure_loaded:
+            self.renderer.preview_images.clear()
+            self.renderer.draw_image_selection_menu(self.renderer.images)
+        ensure_loaded.assert_not_called()
+
+
+class TestImageRegistry(unittest.TestCase):
+    """按需解码的图片注册表测试"""
+    
+    def setUp(self):
+        """在临时目录中生成测试图片"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        for i, size in enumerate([(400, 300), (80, 60), (500, 500)]):
+            pygame.image.save(pygame.Surface(size), os.path.join(self.temp_dir.name, f"img{i}.png"))
+        with open(os.path.join(self.temp_dir.name, "broken.png"), 'wb') as f:
+            f.write(b"not an image")
+        with open(os.path.join(self.temp_dir.name, "notes.txt"), 'w') as f:
+            f.write("skip")
+        self.registry = ImageRegistry(max_size=100, directories=[self.temp_dir.name], cache_size=2)
+    
+    def tearDown(self):
+        """测试后清理"""
+        self.registry.close()
+        self.temp_dir.cleanup()
+    
+    def test_discovery_does_not_decode(self):
+        """测试创建时只列出图片文件，不解码"""
+        with mock.patch('pygame.image.load') as load:
+            registry = ImageRegistry(max_size=100, directories=[self.temp_dir.name])
+        load.assert_not_called()
+        self.assertEqual(sorted(registry), ["broken.png", "img0.png", "img1.png", "img2.png"])
+        self.assertIn("img0.png", registry)
+    
+    def test_downscaled_on_load(self):
+        """测试解码后短边缩小到max_size，较小的图片保持原尺寸"""
+        self.assertEqual(self.registry["img0.png"].get_size(), (133, 100))
+        self.assertEqual(self.registry["img1.png"].get_size(), (80, 60))
+    
+    def test_lru_bound(self):
+        """测试已解码图片数量不超过缓存容量"""
+        self.registry.ensure_loaded(["img0.png", "img1.png", "img2.png"])
+        self.assertFalse(self.registry.is_loaded("img0.png"))
+        self.assertTrue(self.registry.is_loaded("img2.png"))
+    
+    def test_peek_does_not_block(self):
+        """测试peek在解码完成前立即返回None，完成后返回图片"""
+        release = threading.Event()
+        decode = self.registry._decode
+        
+        def slow_decode(path):
+            release.wait(5)
+            return decode(path)
+        
+        with mock.patch.object(self.registry, '_decode', slow_decode):
+            self.assertIsNone(self.registry.peek("img1.png"))
+            self.assertTrue(self.registry.loading())
+            release.set()
+            self.assertEqual(self.registry["img1.png"].get_size(), (80, 60))
+        self.assertFalse(self.registry.loading())
+        self.assertIsNotNone(self.registry.peek("img1.png"))
+    
+    def test_broken_image_dropped(self):
+        """测试无法解码的图片从注册表移除"""
+        with mock.patch('image_registry.logger') as logger:
+            loaded = self.registry.ensure_loaded()
+        self.assertEqual(loaded, ["img0.png", "img1.png", "img2.png"])
+        logger.warning.assert_called_once()
+        self.assertNotIn("broken.png", self.registry)
+    
+    def test_missing_image_dropped(self):
+        """测试列出后被删除的图片与无法解码的图片一样移除，peek不会把异常抛给渲染循环"""
+        os.remove(os.path.join(self.temp_dir.name, "img1.png"))
+        with mock.patch('image_registry.logger') as logger:
+            self.registry.prefetch(["img1.png"])
+            self.registry._futures["img1.png"].exception(5)
+            self.assertIsNone(self.registry.peek("img1.png"))
+            self.assertEqual(self.registry.ensure_loaded(["img0.png", "img1.png"]), ["img0.png"])
+        logger.warning.assert_called_once()
+        self.assertNotIn("img1.png", self.registry)
+        self.assertFalse(self.registry.loading())
+
+
+class TestTileSprites(unittest.TestCase):
+    """数字方块预渲染精灵测试"""
+    
+    @classmethod
+    def setUpClass(cls):
+        """创建渲染器"""
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        cls.renderer = create_renderer(cls)
+    
+    def test_sprites_cached(self):
+        """测试同一方块尺寸只渲染一次，包含空格（0）"""
+        sprites = self.renderer.get_tile_sprites(self.renderer.tile_size, 9)
+        self.assertIs(self.renderer.get_tile_sprites(self.renderer.tile_size), sprites)
+        self.assertTrue(set(range(9)) <= set(sprites))
+        size = self.renderer.tile_size
+        self.assertTrue(all(sprite.get_size() == (size, size) for sprite in sprites.values()))
+    
+    def test_draw_without_new_surfaces(self):
+        """测试预渲染后绘制数字棋盘不再新建Surface"""
+        game_state = GameState()
+        game_state.initialize_board(4, 'NUMBERS')
+        self.renderer.prepare_tile_sprites(4)
+        with mock.patch('pygame.Surface') as surface:
+            self.renderer.draw_game_board(game_state)
+        surface.assert_not_called()
+
+
+class TestFonts(unittest.TestCase):
+    """字体索引与按需创建字号测试"""
+    
+    def setUp(self):
+        """测试前准备"""
+        pygame.font.init()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.index_file = os.path.join(self.temp_dir.name, 'font_index.json')
+    
+    def tearDown(self):
+        """测试后清理"""
+        self.temp_dir.cleanup()
+    
+    def test_index_skips_probe(self):
+        """测试首次启动探测字体并写入索引，之后直接读取索引"""
+        with mock.patch('fonts.probe_cjk_font', return_value=None) as probe:
+            self.assertIsNone(resolve_cjk_font(self.index_file))
+            self.assertIsNone(resolve_cjk_font(self.index_file))
+        self.assertEqual(probe.call_count, 1)
+    
+    def test_stale_index_reprobed(self):
+        """测试索引中的字体文件已不存在时重新探测"""
+        with open(self.index_file, 'w', encoding='utf-8') as f:
+            json.dump({'path': os.path.join(self.temp_dir.name, 'missing.ttf')}, f)
+        with mock.patch('fonts.probe_cjk_font', return_value=None) as probe:
+            self.assertIsNone(resolve_cjk_font(self.index_file))
+        probe.assert_called_once()
+    
+    def test_font_dir_change_reprobed(self):
+        """测试字体目录修改时间变化（安装了新字体）时重新探测"""
+        with mock.patch('fonts.probe_cjk_font', return_value=None) as probe, \
+                mock.patch('fonts.font_dirs_signature', return_value={'/fonts': 1.0}):
+            resolve_cjk_font(self.index_file)
+            resolve_cjk_font(self.index_file)
+            self.assertEqual(probe.call_count, 1)
+        with mock.patch('fonts.probe_cjk_font', return_value=None) as probe, \
+                mock.patch('fonts.font_dirs_signature', return_value={'/fonts': 2.0}):
+            resolve_cjk_font(self.index_file)
+        probe.assert_called_once()
+    
+    def test_bundled_font_preferred(self):
+        """测试FONTS_DIR中自带的字体优先于系统字体"""
+        self.assertIsNone(bundled_font(self.temp_dir.name))
+        for name in ('b.ttf', 'a.otf', 'readme.txt'):
+            open(os.path.join(self.temp_dir.name, name), 'wb').close()
+        self.assertEqual(bundled_font(self.temp_dir.name), os.path.join(self.temp_dir.name, 'a.otf'))
+    
+    def test_lazy_sizes(self):
+        """测试字号在第一次使用时才创建，之后复用"""
+        fonts = LazyFonts(None)
+        size = 97  # 其他测试不使用的字号，保证共享缓存中没有
+        with mock.patch.dict('config.FONT_SIZES', {'SMALL': size}), \
+                mock.patch('pygame.font.Font', wraps=pygame.font.Font) as font_class:
+            self.assertIs(fonts['small'], fonts['small'])
+        font_class.assert_called_once()
+        self.assertEqual(sorted(fonts), ['large', 'medium', 'small', 'title'])
+    
+    def test_fonts_shared(self):
+        """测试相同(路径, 字号)的Font在各渲染器之间共用"""
+        self.assertIs(LazyFonts(None)['medium'], LazyFonts(None)['medium'])
+        self.assertIs(get_font(None, 20), get_font(None, 20))
+
+
+class TestTextCache(unittest.TestCase):
+    """文字渲染缓存测试"""
+    
+    @classmethod
+    def setUpClass(cls):
+        """初始化字体模块"""
+        import pygame
+        pygame.font.init()
+        cls.font = pygame.font.Font(None, 18)
+    
+    def test_hits_and_misses(self):
+        """测试相同参数命中缓存并返回同一Surface"""
+        cache = TextCache(8)
+        first = cache.render(self.font, "12", True, (255, 255, 255))
+        second = cache.render(self.font, "12", True, (255, 255, 255))
+        cache.render(self.font, "12", True, (0, 0, 0))
+        self.assertIs(first, second)
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (1, 2, 2))
+    
+    def test_lru_bound(self):
+        """测试超出容量时淘汰最久未使用的条目"""
+        cache = TextCache(3)
+        for text in ("a", "b", "c"):
+            cache.render(self.font, text, True, (0, 0, 0))
+        cache.render(self.font, "a", True, (0, 0, 0))
+        cache.render(self.font, "d", True, (0, 0, 0))
+        self.assertEqual(len(cache), 3)
+        misses = cache.misses
+        cache.render(self.font, "a", True, (0, 0, 0))
+        self.assertEqual(cache.misses, misses)
+        cache.render(self.font, "b", True, (0, 0, 0))
+        self.assertEqual(cache.misses, misses + 1)
+    
+    def test_language_switch_invalidates(self):
+        """测试切换语言后缓存失效"""
+        cache = TextCache(8)
+        cache.render(self.font, "ok", True, (0, 0, 0))
+        switch_language()
+        try:
+            cache.render(self.font, "ok", True, (0, 0, 0))
+            self.assertEqual((cache.hits, cache.misses, len(cache)), (0, 2, 1))
+        finally:
+            switch_language()
+
+
 class TestLeaderboard(unittest.TestCase):
     """排行榜测试"""
     
@@ -111,8 +1128,10 @@ class TestLeaderboard(unittest.TestCase):
 
     def tearDown(self):
         """测试后清理"""
-        if hasattr(self, 'temp_file') and os.path.exists(self.temp_file.name):
-            os.unlink(self.temp_file.name)
+        self.leaderboard.close()
+        for path in (self.temp_file.name, self.leaderboard.store.journal_path):
+            if os.path.exists(path):
+                os.unlink(path)
     
     def test_add_entry(self):
         """测试添加排行榜条目"""
@@ -147,6 +1166,27 @@ class TestLeaderboard(unittest.TestCase):
         self.assertEqual(self.leaderboard.entries[1].player_name, "玩家1")
         self.assertEqual(self.leaderboard.entries[2].player_name, "玩家3")
     
+    def test_bucket_cap_per_mode(self):
+        """测试每个(难度, 模式)桶单独限额，一种模式的成绩不会挤掉另一种模式"""
+        self.leaderboard.add_entry(LeaderboardEntry("图片玩家", 300, 90, "EASY", "IMAGES", 1000.0))
+        for i in range(MAX_LEADERBOARD_ENTRIES + 5):
+            self.leaderboard.add_entry(LeaderboardEntry(f"玩家{i}", 100 - i, 30, "EASY", "NUMBERS", 1000.0 + i))
+        numbers = self.leaderboard.get_entries_by_difficulty_and_mode("EASY", "NUMBERS")
+        self.assertEqual(len(numbers), MAX_LEADERBOARD_ENTRIES)
+        self.assertEqual([entry.time_seconds for entry in numbers],
+                         sorted(entry.time_seconds for entry in numbers))
+        self.assertEqual(numbers[0].time_seconds, 100 - (MAX_LEADERBOARD_ENTRIES + 4))
+        images = self.leaderboard.get_entries_by_difficulty_and_mode("EASY", "IMAGES")
+        self.assertEqual([entry.player_name for entry in images], ["图片玩家"])
+        self.assertEqual(len(self.leaderboard.get_entries_by_difficulty_and_mode("EASY", "NUMBERS", limit=3)), 3)
+    
+    def test_ties_keep_insertion_order(self):
+        """测试用时和步数相同时先上榜的排在前面"""
+        for name in ("先", "后"):
+            self.leaderboard.add_entry(LeaderboardEntry(name, 60, 20, "EASY", "NUMBERS", 1000.0))
+        entries = self.leaderboard.get_entries_by_difficulty_and_mode("EASY", "NUMBERS")
+        self.assertEqual([entry.player_name for entry in entries], ["先", "后"])
+    
     def test_clear_leaderboard(self):
         """测试清空排行榜"""
         # 添加一些条目
@@ -171,6 +1211,212 @@ class TestLeaderboard(unittest.TestCase):
         self.assertEqual(len(self.leaderboard.entries), 0)
 
 
+class TestLeaderboardStore(unittest.TestCase):
+    """排行榜快照 + 追加日志存储测试"""
+    
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'leaderboard.json')
+    
+    def tearDown(self):
+        """测试后清理"""
+        self.temp_dir.cleanup()
+    
+    def make_leaderboard(self, **kwargs):
+        return Leaderboard(self.path, store=JournalStore(self.path, **kwargs))
+    
+    def add_entries(self, leaderboard, count):
+        for i in range(count):
+            leaderboard.add_entry(LeaderboardEntry(f"玩家{i}", 100 - i, 30, "EASY", "NUMBERS", 1000.0 + i))
+    
+    def test_append_only_and_reload(self):
+        """测试添加成绩只追加日志，不写快照，重新加载后内容一致"""
+        leaderboard = self.make_leaderboard()
+        self.add_entries(leaderboard, 5)
+        leaderboard.close()
+        self.assertFalse(os.path.exists(self.path))
+        with open(leaderboard.store.journal_path, encoding='utf-8') as f:
+            self.assertEqual(len(f.readlines()), 5)
+        self.assertEqual([e.player_name for e in Leaderboard(self.path).entries],
+                         [e.player_name for e in leaderboard.entries])
+    
+    def test_torn_last_line_ignored(self):
+        """测试日志最后一行写了一半（崩溃）时保留之前的记录，之后追加的记录重新加载后也不丢失"""
+        leaderboard = self.make_leaderboard()
+        self.add_entries(leaderboard, 3)
+        leaderboard.close()
+        with open(leaderboard.store.journal_path, 'a', encoding='utf-8') as f:
+            f.write('{"seq": 4, "entry": {"player_')
+        reloaded = Leaderboard(self.path)
+        self.assertEqual(len(reloaded.entries), 3)
+        self.add_entries(reloaded, 2)
+        reloaded.close()
+        self.assertEqual(len(Leaderboard(self.path).entries), 5)
+        with open(leaderboard.store.journal_path, encoding='utf-8') as f:
+            self.assertEqual([json.loads(line)['seq'] for line in f], [1, 2, 3, 4, 5])
+    
+    def test_compaction(self):
+        """测试日志超过阈值后压缩为快照并截断日志"""
+        leaderboard = self.make_leaderboard(compact_after=4)
+        self.add_entries(leaderboard, 6)
+        leaderboard.close()
+        with open(self.path, encoding='utf-8') as f:
+            snapshot = json.load(f)
+        self.assertEqual(snapshot['seq'], 4)
+        with open(leaderboard.store.journal_path, encoding='utf-8') as f:
+            self.assertEqual(len(f.readlines()), 2)
+        self.assertEqual(len(Leaderboard(self.path).entries), 6)
+    
+    def test_crash_between_snapshot_and_truncate(self):
+        """测试快照已替换但日志尚未截断时重新加载不会重复记录"""
+        leaderboard = self.make_leaderboard()
+        self.add_entries(leaderboard, 3)
+        leaderboard.store._write_snapshot(3, [e.to_dict() for e in leaderboard.entries])
+        leaderboard.close()
+        self.assertEqual(len(Leaderboard(self.path).entries), 3)
+    
+    def test_legacy_snapshot(self):
+        """测试兼容旧版直接保存条目列表的leaderboard.json"""
+        entry = LeaderboardEntry("玩家", 12.5, 40, "EASY", "NUMBERS", 1000.0)
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump([entry.to_dict()], f)
+        leaderboard = Leaderboard(self.path)
+        self.add_entries(leaderboard, 1)
+        leaderboard.close()
+        self.assertEqual(len(Leaderboard(self.path).entries), 2)
+
+
+class TestSQLiteLeaderboard(unittest.TestCase):
+    """SQLite排行榜测试"""
+    
+    def setUp(self):
+        """测试前准备"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'leaderboard.db')
+        self.leaderboard = SQLiteLeaderboard(self.path)
+    
+    def tearDown(self):
+        """测试后清理"""
+        self.leaderboard.close()
+        self.temp_dir.cleanup()
+    
+    def test_wal_and_index(self):
+        """测试使用WAL模式，排名查询走复合索引且不需要额外排序"""
+        conn = self.leaderboard._conn
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], 'wal')
+        plan = ' '.join(row[-1] for row in conn.execute(
+            "EXPLAIN QUERY PLAN " + SELECT_TOP, ('EASY', 'NUMBERS', 10)))
+        self.assertIn('entries_rank', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+    
+    def test_bulk_insert_and_query(self):
+        """测试批量插入后按难度和模式返回有序前N名，保留全部历史"""
+        entries = [LeaderboardEntry(f"玩家{i}", 100 - i % 50, i, "EASY", "NUMBERS" if i % 2 else "IMAGES", 1000.0 + i)
+                   for i in range(200)]
+        self.leaderboard.add_entries(entries)
+        self.leaderboard.add_entry(LeaderboardEntry("最快", 1, 10, "EASY", "NUMBERS", 2000.0))
+        self.assertEqual(self.leaderboard.count(), 201)
+        top = self.leaderboard.get_entries_by_difficulty_and_mode("EASY", "NUMBERS", limit=5)
+        self.assertEqual(top[0].player_name, "最快")
+        self.assertEqual([e.rank_key() for e in top], sorted(e.rank_key() for e in top))
+        self.assertTrue(all(e.game_mode == "NUMBERS" for e in top))
+        self.leaderboard.close()
+        self.leaderboard = SQLiteLeaderboard(self.path)
+        self.assertEqual(self.leaderboard.count(), 201)
+        self.leaderboard.clear_leaderboard()
+        self.assertEqual(self.leaderboard.get_entries_by_difficulty_and_mode("EASY", "NUMBERS"), [])
+    
+    def test_backend_selection(self):
+        """测试按后端名称创建排行榜"""
+        with mock.patch('config.LEADERBOARD_DB_FILE', os.path.join(self.temp_dir.name, 'other.db')):
+            leaderboard = open_leaderboard('sqlite', asynchronous=False)
+        self.assertIsInstance(leaderboard, SQLiteLeaderboard)
+        leaderboard.close()
+        with self.assertRaises(ValueError):
+            open_leaderboard('csv')
+
+
+class TestAsyncLeaderboard(unittest.TestCase):
+    """排行榜后台写入测试"""
+    
+    def setUp(self):
+        """后端写入被阻塞，直到测试放行"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.backend = Leaderboard(os.path.join(self.temp_dir.name, 'leaderboard.json'))
+        self.release = threading.Event()
+        backend_add = self.backend.add_entries
+        
+        def slow_add_entries(entries):
+            self.release.wait(5)
+            backend_add(entries)
+        
+        self.backend.add_entries = slow_add_entries
+        self.leaderboard = AsyncLeaderboard(self.backend)
+    
+    def tearDown(self):
+        """测试后清理"""
+        self.release.set()
+        self.leaderboard.close()
+        self.temp_dir.cleanup()
+    
+    def entry(self, i):
+        return LeaderboardEntry(f"玩家{i}", 100 - i, 30, "EASY", "NUMBERS", 1000.0 + i)
+    
+    def test_pending_entries_visible(self):
+        """测试提交后立即返回，后端尚未写完时查询结果已包含新成绩"""
+        self.leaderboard.add_entry(self.entry(0))
+        self.leaderboard.add_entry(self.entry(1))
+        self.assertEqual(self.backend.entries, [])
+        top = self.leaderboard.get_entries_by_difficulty_and_mode("EASY", "NUMBERS")
+        self.assertEqual([e.player_name for e in top], ["玩家1", "玩家0"])
+        self.release.set()
+        self.leaderboard.flush()
+        self.assertEqual(len(self.backend.entries), 2)
+        self.assertEqual(len(self.leaderboard.get_entries_by_difficulty_and_mode("EASY", "NUMBERS")), 2)
+    
+    def test_burst_coalesced(self):
+        """测试连续提交的成绩合并为少量批次写入，并统计队列深度与写入延迟"""
+        for i in range(10):
+            self.leaderboard.add_entry(self.entry(i))
+        self.release.set()
+        self.leaderboard.flush()
+        metrics = self.leaderboard.metrics()
+        self.assertEqual(metrics['writes'], 10)
+        self.assertLessEqual(metrics['batches'], 2)
+        self.assertGreater(metrics['max_queue_depth'], 1)
+        self.assertEqual(metrics['queue_depth'], 0)
+        self.assertGreater(metrics['max_write_ms'], 0)
+    
+    def test_clear_after_pending(self):
+        """测试清空时先写完队列中的成绩，清空后不会再出现"""
+        self.leaderboard.add_entry(self.entry(0))
+        self.release.set()
+        self.leaderboard.clear_leaderboard()
+        self.assertEqual(self.leaderboard.entries, [])
+    
+    def test_backend_update_waits_for_reader(self):
+        """测试后台线程修改桶时与查询互斥：查询持有锁期间写入线程等待"""
+        self.release.set()
+        with self.backend._lock:
+            self.leaderboard.add_entry(self.entry(0))
+            time.sleep(0.05)
+            self.assertEqual(self.backend._buckets, {})
+        self.leaderboard.flush()
+        self.assertEqual(len(self.backend.get_entries_by_difficulty_and_mode("EASY", "NUMBERS")), 1)
+    
+    def test_concurrent_reads_during_writes(self):
+        """测试后台写入大量成绩的同时查询，结果始终有序且不出错"""
+        self.release.set()
+        for i in range(500):
+            self.leaderboard.add_entry(self.entry(i))
+            top = self.backend.get_entries_by_difficulty_and_mode("EASY", "NUMBERS")
+            self.assertEqual(top, sorted(top, key=LeaderboardEntry.rank_key))
+            self.assertLessEqual(len(self.backend.entries), MAX_LEADERBOARD_ENTRIES)
+        self.leaderboard.flush()
+        self.assertEqual(len(self.backend.entries), min(500, MAX_LEADERBOARD_ENTRIES))
+
+
 class TestUtils(unittest.TestCase):
     """工具函数测试"""
     
@@ -198,7 +1444,28 @@ def run_tests():
     
     # 添加测试用例
     test_suite.addTests(loader.loadTestsFromTestCase(TestGameState))
+    test_suite.addTests(loader.loadTestsFromTestCase(TestSolvability))
+    test_suite.addTests(loader.loadTestsFromTestCase(TestBatchGenerator))
+    test_suite.addTests(loader.loadTestsFromTestCase(TestBoard))
+    test_suite.addTests(loader.loadTestsFromTestCase(TestSolver))
+    test_suite.addTests(loader.loadTestsFromTestCase(TestPatternDatabase))
+    test_suite.addTests(loader.loadTestsFromTestCase(TestDistanceTable))
+    test_suite.addTests(loader.loadTestsFromTestCase(TestPuzzlePool))
+    test_suite.addTests(loader.loadTestsFromTestCase(TestBatchSolver))
+    test_suite.addTests(loader.loadTestsFromTestCase(TestHeadlessController))
+    test_suite.addTests(loader.loadTestsFromTestCase(TestDirtyRendering))
+    test_suite.addTests(loader.loadTestsFromTestCase(TestAnimation))
+    test_suite.addTests(loader.loadTestsFromTestCase(TestFrameProfiler))
+    test_suite.addTests(loader.loadTestsFromTestCase(TestLogging))
+    test_suite.addTests(loader.loadTestsFromTestCase(TestTileAtlas))
+    test_suite.addTests(loader.loadTestsFromTestCase(TestImageRegistry))
+    test_suite.addTests(loader.loadTestsFromTestCase(TestTileSprites))
+    test_suite.addTests(loader.loadTestsFromTestCase(TestFonts))
+    test_suite.addTests(loader.loadTestsFromTestCase(TestTextCache))
     test_suite.addTests(loader.loadTestsFromTestCase(TestLeaderboard))
+    test_suite.addTests(loader.loadTestsFromTestCase(TestLeaderboardStore))
+    test_suite.addTests(loader.loadTestsFromTestCase(TestSQLiteLeaderboard))
+    test_suite.addTests(loader.loadTestsFromTestCase(TestAsyncLeaderboard))
     test_suite.addTests(loader.loadTestsFromTestCase(TestUtils))
     
     # 运行测试